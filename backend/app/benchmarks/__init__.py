@@ -0,0 +1,76 @@
+"""
+    benchmark helpers, shared by the benchmark scripts
+    run a benchmark from the backend folder with:
+        python3 -m app.benchmarks.<benchName> --help
+"""
+import time
+from typing import Any, Callable, Dict, List
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    nearest-rank percentile of a list of samples
+    """
+    if len(samples) == 0:
+        return 0.0
+    ordered: List[float] = sorted(samples)
+    index: int = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summary(name: str, samples_ms: List[float]) -> Dict[str, Any]:
+    """
+    creates a summary (count, mean, p50, p90, p99, max) of latency samples in ms
+    """
+    return {
+        "name": name,
+        "count": len(samples_ms),
+        "mean": sum(samples_ms) / len(samples_ms) if len(samples_ms) > 0 else 0.0,
+        "p50": percentile(samples_ms, 50),
+        "p90": percentile(samples_ms, 90),
+        "p99": percentile(samples_ms, 99),
+        "max": max(samples_ms) if len(samples_ms) > 0 else 0.0,
+    }
+
+
+def timeit(func: Callable[[], Any], number: int) -> float:
+    """
+    runs 'func' 'number' times and returns the mean time per call in µs
+    """
+    start: float = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start) / number * 1_000_000
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+def printSummary(results: List[Dict[str, Any]]) -> None:
+    """
+    prints latency summaries as table
+    """
+    print(f"{'name':<32} {'count':>8} {'mean':>10} {'p50':>10} {'p90':>10} {'p99':>10} {'max':>10}")
+    for result in results:
+        print(
+            f"{result['name']:<32} {result['count']:>8} {result['mean']:>10.3f} {result['p50']:>10.3f} "
+            f"{result['p90']:>10.3f} {result['p99']:>10.3f} {result['max']:>10.3f}"
+        )
+    print("(times in ms)")
+
+
+def printTimings(results: List[Dict[str, Any]]) -> None:
+    """
+    prints per call timings as table
+    """
+    print(f"{'name':<48} {'per call (µs)':>14} {'calls/s':>12}")
+    for result in results:
+        per_call: float = result["us"]
+        print(f"{result['name']:<48} {per_call:>14.2f} {1_000_000 / per_call if per_call > 0 else 0:>12.0f}")
@@ -0,0 +1,102 @@
+"""
+    benchmark: per request cost of the token extraction on a protected route
+    three 'Security' dependencies (query, header, cookie, the old 'getTokenFromRequest')
+    vs. 'TokenMiddleware' (one pass over the ASGI scope) and one dependency.
+    the ASGI apps are called directly, without server and client,
+    the token is in the cookie (the last place looked at). no database needed
+        python3 -m app.benchmarks.benchAuth --number 5000
+"""
+import argparse
+import asyncio
+from typing import Any, Dict, List, MutableMapping, Union
+
+from fastapi import Depends, FastAPI, Security
+from fastapi.security import APIKeyCookie, APIKeyHeader, APIKeyQuery
+
+from app.benchmarks import printTimings
+from app.middleware.auth import middlewareAuth
+from app.middleware.token import TokenMiddleware
+from app.utils.api.securityHelper import TokenDataObject, create_access_token
+from app.utils.api.tokenCache import validateTokenCached
+from app.utils.config import settings
+
+
+async def getTokenFromRequest(
+    api_key_query: Union[str, None] = Security(APIKeyQuery(name=settings.TOKEN_API_NAME, auto_error=False)),
+    api_key_header: Union[str, None] = Security(APIKeyHeader(name=settings.TOKEN_API_NAME, auto_error=False)),
+    api_key_cookie: Union[str, None] = Security(APIKeyCookie(name=settings.TOKEN_API_NAME, auto_error=False)),
+) -> Union[str, None]:
+    if api_key_header is not None:
+        return api_key_header
+    elif api_key_query is not None:
+        return api_key_query
+    elif api_key_cookie is not None:
+        return api_key_cookie
+    return None
+
+
+async def legacyAuth(token: Union[str, None] = Depends(getTokenFromRequest)) -> Union[TokenDataObject, None]:
+    return validateTokenCached(token)
+
+
+def createApp(auth: Any, with_middleware: bool) -> FastAPI:
+    app: FastAPI = FastAPI()
+
+    @app.get("/protected")
+    async def protected(user: TokenDataObject = Depends(auth)) -> Dict[str, Any]:
+        return {"username": user.username if user is not None else None}
+
+    if with_middleware:
+        app.add_middleware(TokenMiddleware)
+    return app
+
+
+async def run(app: FastAPI, token: str, number: int) -> float:
+    scope: Dict[str, Any] = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/protected",
+        "raw_path": b"/protected",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"localhost"), (b"cookie", f"{settings.TOKEN_API_NAME}={token}".encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: MutableMapping[str, Any]) -> None:
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"unexpected status {message['status']}")
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    start: float = loop.time()
+    for _ in range(number):
+        await app(dict(scope, headers=list(scope["headers"])), receive, send)
+    return (loop.time() - start) / number * 1_000_000
+
+
+async def main(number: int) -> None:
+    created = create_access_token(data=TokenDataObject(id="61a0f3f5c2b1a2d3e4f5a6b7", username="john_doo"))
+    token: str = created.access_token if created is not None else ""
+    apps: Dict[str, FastAPI] = {
+        "three Security dependencies": createApp(legacyAuth, False),
+        "TokenMiddleware + one dependency": createApp(middlewareAuth, True),
+    }
+    results: List[Dict[str, Any]] = []
+    for name, app in apps.items():
+        await run(app, token, min(number, 500))  # warm up
+        results.append({"name": name, "us": await run(app, token, number)})
+    printTimings(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="token extraction per request, dependencies vs. middleware")
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.number))
@@ -0,0 +1,55 @@
+"""
+    benchmark: cpu cost to decode a 'UserEntity' document
+    validated ('entity(**doc)') vs. trusted ('entity.construct(**doc)'),
+    with the full document and with the login projection.
+    no database needed
+        python3 -m app.benchmarks.benchDecode --number 20000
+"""
+import argparse
+from datetime import datetime
+from typing import Any, Dict, List
+
+from bson.objectid import ObjectId
+
+from app.benchmarks import printTimings, timeit
+from app.db.mongoDb import decode_entity
+from app.persist.account.models.user import UserEntity
+from app.persist.account.services.account import USER_LOGIN_PROJECTION
+
+# a document like it is stored after the first login
+DOCUMENT: Dict[str, Any] = {
+    "_id": ObjectId(),
+    "name": "john",
+    "surname": "doo",
+    "username": "john_doo",
+    "password": "$2b$12$KbQiP1oZOAjEXNBcVzj4S.Mc9eY7Zd6LiDMEtpSrTZPjC7t3mXY.G",
+    "email": "john@example.gg",
+    "token": "eyJhbGciOiJIUzUxMiIsInR5cCI6IkpXVCJ9." + "x" * 180 + ".signature-signature-signature",
+    "totpToken": "JBSWY3DPEHPK3PXPJBSWY3DPEHPK3PXP",
+    "accountExpireDate": None,
+    "status": "ACTIVE",
+    "created": datetime.utcnow(),
+    "lastLogin": datetime.utcnow(),
+    "isAdmin": False,
+}
+PROJECTED: Dict[str, Any] = {
+    key: value for key, value in DOCUMENT.items() if key == "_id" or key in USER_LOGIN_PROJECTION
+}
+
+
+def main(number: int) -> None:
+    results: List[Dict[str, Any]] = [
+        {"name": "validated, full document", "us": timeit(lambda: decode_entity(UserEntity, DOCUMENT), number)},
+        {"name": "validated, login projection", "us": timeit(lambda: decode_entity(UserEntity, PROJECTED), number)},
+        {"name": "trusted, full document", "us": timeit(lambda: decode_entity(UserEntity, DOCUMENT, True), number)},
+        {"name": "trusted, login projection", "us": timeit(lambda: decode_entity(UserEntity, PROJECTED, True), number)},
+    ]
+    printTimings(results)
+    print(f"saved per login read: {results[0]['us'] - results[3]['us']:.2f} µs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="UserEntity decode cost, validated vs. trusted")
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.number)
@@ -0,0 +1,93 @@
+"""
+    benchmark: serialization cost of the login and registration responses
+    per response class ('JSONResponse', 'OrjsonResponse', 'MsgspecResponse'):
+        - render: only the encoding of the already encoded content
+        - full: 'response_model' validation + 'jsonable_encoder' + render,
+          what FastAPI does for a route returning the schema
+    the registration payload holds the QR-code of 'qrService'.
+    no database needed
+        python3 -m app.benchmarks.benchJson --number 20000
+"""
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Type
+
+import pyotp
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from app.benchmarks import printTimings, timeit
+from app.persist.account.schemas.response import ResponseLoginSchema, ResponseRegistrationSchema
+from app.utils.api.jsonResponse import RESPONSE_CLASSES, RESPONSE_MODULES
+from app.utils.api.qrService import qrService
+from app.utils.api.securityHelper import TokenDataObject, create_access_token
+from app.utils.config import settings
+
+
+def payloads() -> Dict[str, Dict[str, Any]]:
+    created = create_access_token(data=TokenDataObject(id="61a0f3f5c2b1a2d3e4f5a6b7", username="john_doo"))
+    secret: str = pyotp.random_base32()
+    qrCode: str = qrService.render(
+        pyotp.TOTP(secret).provisioning_uri(name="john_doo", issuer_name=settings.PROJECT_NAME)
+    )
+    return {
+        "login": {
+            "schema": ResponseLoginSchema,
+            "data": {
+                "RESULT": {
+                    "username": "john_doo",
+                    "firstName": "john",
+                    "lastName": "doo",
+                    "email": "john.doo@example.com",
+                    "token": created.access_token if created is not None else "",
+                    "refreshToken": pyotp.random_base32(64),
+                },
+                "STATE": "SUCCESS",
+            },
+        },
+        "registration": {
+            "schema": ResponseRegistrationSchema,
+            "data": {
+                "RESULT": {
+                    "qrCode": qrCode,
+                    "secret": secret,
+                    "expireTime": f"{settings.ACCESS_TOKEN_EXPIRE_MINUTES}m",
+                    "expireDate": datetime.utcnow() + timedelta(days=1),
+                },
+                "STATE": "SUCCESS",
+            },
+        },
+    }
+
+
+def main(number: int) -> None:
+    results: List[Dict[str, Any]] = []
+    for payload_name, payload in payloads().items():
+        schema: Type[Any] = payload["schema"]
+        data: Dict[str, Any] = payload["data"]
+        encoded: Any = jsonable_encoder(schema(**data))
+        print(f"{payload_name}: {len(JSONResponse(encoded).body)} bytes")
+        for class_name, response_class in RESPONSE_CLASSES.items():
+            if RESPONSE_MODULES[class_name] is None:
+                print(f"{class_name} is not installed, skipped")
+                continue
+            results.append(
+                {
+                    "name": f"{payload_name} render {class_name}",
+                    "us": timeit(lambda: response_class(encoded), number),
+                }
+            )
+            results.append(
+                {
+                    "name": f"{payload_name} full {class_name}",
+                    "us": timeit(lambda: response_class(jsonable_encoder(schema(**data))), number),
+                }
+            )
+    printTimings(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="serialization of login and registration responses")
+    parser.add_argument("--number", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.number)
@@ -0,0 +1,108 @@
+"""
+    benchmark: login latency under concurrent load
+    compares the database path of 'account.login' (find user + stamp lastLogin)
+    on the blocking 'DBConnection' (before) and on the
+    non-blocking 'AsyncDBConnection' (after).
+
+    requests arrive at a fixed rate (open loop), latency is measured from
+    the planned arrival, so time spend waiting on a blocked event loop is counted.
+    password hashing is not part of the path, it would hide the db difference.
+
+    needs a running mongoDB, configured by '.env'
+        python3 -m app.benchmarks.benchLogin --requests 2000 --rate 500
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Union
+
+from pydantic import EmailStr
+
+from app.benchmarks import printSummary, summary
+from app.db.mongoDb import DBConnection
+from app.db.mongoDbAsync import AsyncDBConnection
+from app.persist.account.models.user import UserEntity, UserStatusEnum
+
+BENCH_TABLE: str = "bench_account"
+BENCH_USER: str = "bench_user"
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+async def loginSync() -> None:
+    user: Union[UserEntity, None] = DBConnection.find_one(
+        filter={"username": BENCH_USER}, entity=UserEntity, table_name=BENCH_TABLE
+    )
+    if user is None:
+        return
+    DBConnection.find_and_modify(
+        id=user.id, update={"lastLogin": datetime.utcnow()}, entity=UserEntity, table_name=BENCH_TABLE
+    )
+
+
+async def loginAsync() -> None:
+    user: Union[UserEntity, None] = await AsyncDBConnection.find_one(
+        filter={"username": BENCH_USER}, entity=UserEntity, table_name=BENCH_TABLE
+    )
+    if user is None:
+        return
+    await AsyncDBConnection.find_and_modify(
+        id=user.id, update={"lastLogin": datetime.utcnow()}, entity=UserEntity, table_name=BENCH_TABLE
+    )
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+async def run(name: str, func: Callable[[], Awaitable[Any]], requests: int, rate: float) -> Dict[str, Any]:
+    samples: List[float] = []
+    start: float = time.perf_counter()
+
+    async def one(index: int) -> None:
+        arrival: float = start + index / rate
+        delay: float = arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        await func()
+        samples.append((time.perf_counter() - arrival) * 1000)
+
+    await asyncio.gather(*[one(i) for i in range(requests)])
+    return summary(name, samples)
+
+
+async def main(requests: int, rate: float) -> None:
+    DBConnection.get_connection()[BENCH_TABLE].drop()
+    DBConnection.insert_one(
+        UserEntity(
+            name="bench",
+            surname="bench",
+            username=BENCH_USER,
+            password="$2b$12$benchbenchbenchbenchbenchbenchbenchbenchbenchbenchben",
+            email=EmailStr("bench@example.gg"),
+            totpToken=None,
+            accountExpireDate=None,
+            status=UserStatusEnum.ACTIVE,
+        ),
+        BENCH_TABLE,
+    )
+    await AsyncDBConnection.get_connection()
+    results = [
+        await run("login (sync DBConnection)", loginSync, requests, rate),
+        await run("login (AsyncDBConnection)", loginAsync, requests, rate),
+    ]
+    DBConnection.get_connection()[BENCH_TABLE].drop()
+    printSummary(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="login latency, sync vs. async db access")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=500, help="requests per second")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.rate))
@@ -0,0 +1,97 @@
+"""
+    benchmark: QR-code rendering per factory and size
+    render time and output size of every 'QR_FACTORIES' renderer,
+    for the TOTP url of a registration and for longer data (higher QR versions),
+    with '--concurrent', also the time of n parallel registrations on the
+    event loop, rendered inline vs. in the thread pool of 'QrService'.
+    no database needed
+        python3 -m app.benchmarks.benchQr --number 200 --concurrent 50
+"""
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List
+
+import pyotp
+
+from app.benchmarks import printTimings, timeit
+from app.utils.api.qrService import QR_FACTORIES, QrService
+from app.utils.config import settings
+
+BOX_SIZES: List[int] = [4, 10]
+
+
+def sizes() -> Dict[str, str]:
+    url: str = pyotp.TOTP(pyotp.random_base32()).provisioning_uri(name="john_doo", issuer_name=settings.PROJECT_NAME)
+    return {"totp": url, "256 chars": url.ljust(256, "x"), "1024 chars": url.ljust(1024, "x")}
+
+
+def createService(factory: str, box_size: int) -> QrService:
+    return QrService(
+        factory=factory,
+        filled=settings.QR_FILLED,
+        version=settings.QR_VERSION,
+        box_size=box_size,
+        border=settings.QR_BORDER,
+        fit=True,
+        workers=settings.QR_WORKERS,
+    )
+
+
+async def concurrent(service: QrService, data: str, number: int, inline: bool) -> float:
+    """
+    time in ms until all renders are done, a ticker measures how long the loop is blocked
+    """
+    blocked: List[float] = [0.0]
+    done: List[bool] = [False]
+
+    async def ticker() -> None:
+        while not done[0]:
+            started: float = time.perf_counter()
+            await asyncio.sleep(0.001)
+            blocked[0] = max(blocked[0], (time.perf_counter() - started) * 1000)
+
+    async def inlineRender() -> Any:
+        await asyncio.sleep(0)
+        return service.render(data)
+
+    ticking: "asyncio.Task[None]" = asyncio.create_task(ticker())
+    started: float = time.perf_counter()
+    await asyncio.gather(*[inlineRender() if inline else service.create(data) for _ in range(number)])
+    elapsed: float = (time.perf_counter() - started) * 1000
+    done[0] = True
+    await ticking
+    mode: str = "inline" if inline else "thread pool"
+    print(f"{mode:<12} {number} renders: {elapsed:10.2f} ms, loop blocked up to {blocked[0]:8.2f} ms")
+    return elapsed
+
+
+def main(number: int, parallel: int) -> None:
+    results: List[Dict[str, Any]] = []
+    for size_name, data in sizes().items():
+        for factory in QR_FACTORIES:
+            for box_size in BOX_SIZES:
+                service: QrService = createService(factory, box_size)
+                output: str = service.render(data)
+                results.append(
+                    {
+                        "name": f"{size_name} {factory} box {box_size} ({len(output)} chars)",
+                        "us": timeit(lambda: service.render(data), number),
+                    }
+                )
+    printTimings(results)
+
+    if parallel > 0:
+        service = createService(settings.QR_FACTORY or "path", settings.QR_BOX_SIZE)
+        data = sizes()["totp"]
+        asyncio.run(concurrent(service, data, parallel, True))
+        asyncio.run(concurrent(service, data, parallel, False))
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="QR-code rendering per factory and size")
+    parser.add_argument("--number", type=int, default=200)
+    parser.add_argument("--concurrent", type=int, default=0, help="parallel renders on the event loop")
+    args = parser.parse_args()
+    main(args.number, args.concurrent)
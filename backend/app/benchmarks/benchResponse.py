@@ -0,0 +1,119 @@
+"""
+    benchmark: per request cost of a static error response (401 on login)
+    'responseHandler' on every call + 'response_model' validation + 'JSONResponse'
+    vs. a constant of 'responseCatalog' whose body was serialized on import.
+    the ASGI apps are called directly, without server and client. no database needed
+        python3 -m app.benchmarks.benchResponse --number 5000
+"""
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, List, MutableMapping
+
+from fastapi import FastAPI, Response, status
+
+from app.benchmarks import printTimings
+from app.persist.account.schemas.request import RequestLoginSchema
+from app.persist.account.schemas.response import ResponseLoginSchema
+from app.utils.api.requestHelper import routeHandler
+from app.utils.api.responseCatalog import ACCESS_FAILED_401, LOGIN_MISSING_400
+from app.utils.api.responseHelper import (
+    ErrorTypeEnum,
+    MsgTypeEnum,
+    ResponseHandlerObject,
+    ResponseHolderObject,
+    responseHandler,
+)
+
+BODY: bytes = json.dumps({"username": "john_doo", "password": "wrong-Password-1234"}).encode()
+
+
+async def legacyAccessFailed(items: RequestLoginSchema) -> ResponseHolderObject:
+    return responseHandler(
+        [
+            ResponseHandlerObject(msgType=MsgTypeEnum.ERROR, errorType=ErrorTypeEnum.ACCESS_FAILED),
+            ResponseHandlerObject(msgType=MsgTypeEnum.STATE, errorType=ErrorTypeEnum.ACCESS_DECLINE),
+        ],
+        status.HTTP_401_UNAUTHORIZED,
+    )
+
+
+async def legacyLoginMissing(items: RequestLoginSchema) -> ResponseHolderObject:
+    return responseHandler(
+        [ResponseHandlerObject(msgType=MsgTypeEnum.ERROR, msg="please fill authCode, username and password")],
+        status.HTTP_400_BAD_REQUEST,
+    )
+
+
+async def catalogAccessFailed(items: RequestLoginSchema) -> ResponseHolderObject:
+    return ACCESS_FAILED_401
+
+
+async def catalogLoginMissing(items: RequestLoginSchema) -> ResponseHolderObject:
+    return LOGIN_MISSING_400
+
+
+def createApp(func: Any) -> FastAPI:
+    app: FastAPI = FastAPI()
+    loginHandler = routeHandler(func, keysNeeded=RequestLoginSchema, funcCallerName="login")
+
+    @app.post("/login", response_model=ResponseLoginSchema)
+    async def login(items: RequestLoginSchema, response: Response) -> Any:
+        return await loginHandler(response, items)
+
+    return app
+
+
+async def run(app: FastAPI, expected: int, number: int) -> float:
+    scope: Dict[str, Any] = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": "/login",
+        "raw_path": b"/login",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"localhost"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(BODY)).encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("localhost", 80),
+    }
+
+    async def receive() -> Dict[str, Any]:
+        return {"type": "http.request", "body": BODY, "more_body": False}
+
+    async def send(message: MutableMapping[str, Any]) -> None:
+        if message["type"] == "http.response.start" and message["status"] != expected:
+            raise RuntimeError(f"unexpected status {message['status']}")
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    start: float = loop.time()
+    for _ in range(number):
+        await app(dict(scope), receive, send)
+    return (loop.time() - start) / number * 1_000_000
+
+
+async def main(number: int) -> None:
+    apps: Dict[str, Any] = {
+        "401 responseHandler + response_model": (createApp(legacyAccessFailed), 401),
+        "401 responseCatalog": (createApp(catalogAccessFailed), 401),
+        "400 responseHandler + response_model": (createApp(legacyLoginMissing), 400),
+        "400 responseCatalog": (createApp(catalogLoginMissing), 400),
+    }
+    results: List[Dict[str, Any]] = []
+    for name, (app, expected) in apps.items():
+        await run(app, expected, min(number, 500))  # warm up
+        results.append({"name": name, "us": await run(app, expected, number)})
+    printTimings(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="static error responses, built per call vs. pre-serialized")
+    parser.add_argument("--number", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.number))
@@ -0,0 +1,68 @@
+"""
+    benchmark: JWT encode/decode throughput
+    python-jose vs. PyJWT (key passed as string on every call)
+    vs. 'TokenCodec' (PyJWT with prepared keys and 'kid'),
+    with HMAC and, with '--asymmetric', with RS256 and ES256.
+    no database needed
+        python3 -m app.benchmarks.benchToken --number 20000 --asymmetric
+"""
+import argparse
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Tuple
+
+import jose.jwt
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+
+from app.benchmarks import printTimings, timeit
+from app.utils.api.tokenCodec import TokenCodec
+
+SECRET: str = "0123456789abcdef" * 8
+CLAIMS: Dict[str, Any] = {
+    "id": "61a0f3f5c2b1a2d3e4f5a6b7",
+    "username": "john_doo",
+    "isAdmin": False,
+    "exp": datetime.utcnow() + timedelta(days=1),
+}
+
+
+def pem(private_key: Any) -> Tuple[str, str]:
+    private: bytes = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public: bytes = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private.decode(), public.decode()
+
+
+def cases(algorithm: str, private_key: str, public_key: str) -> List[Tuple[str, Callable[[], Any]]]:
+    codec: TokenCodec = TokenCodec(algorithm=algorithm, kid="bench", signing_key=private_key, verify_keys={})
+    jose_token: str = jose.jwt.encode(CLAIMS, private_key, algorithm=algorithm)
+    pyjwt_token: str = jwt.encode(CLAIMS, private_key, algorithm=algorithm)
+    codec_token: str = codec.encode(CLAIMS)
+    return [
+        (f"{algorithm} encode python-jose", lambda: jose.jwt.encode(CLAIMS, private_key, algorithm=algorithm)),
+        (f"{algorithm} encode PyJWT", lambda: jwt.encode(CLAIMS, private_key, algorithm=algorithm)),
+        (f"{algorithm} encode TokenCodec", lambda: codec.encode(CLAIMS)),
+        (f"{algorithm} decode python-jose", lambda: jose.jwt.decode(jose_token, public_key, algorithms=[algorithm])),
+        (f"{algorithm} decode PyJWT", lambda: jwt.decode(pyjwt_token, public_key, algorithms=[algorithm])),
+        (f"{algorithm} decode TokenCodec", lambda: codec.decode(codec_token)),
+    ]
+
+
+def main(number: int, asymmetric: bool) -> None:
+    all_cases: List[Tuple[str, Callable[[], Any]]] = cases("HS512", SECRET, SECRET)
+    if asymmetric:
+        all_cases += cases("RS256", *pem(rsa.generate_private_key(public_exponent=65537, key_size=2048)))
+        all_cases += cases("ES256", *pem(ec.generate_private_key(ec.SECP256R1())))
+    printTimings([{"name": name, "us": timeit(func, number)} for name, func in all_cases])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JWT encode/decode, python-jose vs. PyJWT vs. TokenCodec")
+    parser.add_argument("--number", type=int, default=20000)
+    parser.add_argument("--asymmetric", action="store_true", help="also RS256 and ES256 (slower)")
+    args = parser.parse_args()
+    main(args.number, args.asymmetric)
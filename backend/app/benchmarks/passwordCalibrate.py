@@ -0,0 +1,97 @@
+"""
+    calibrates the password hash cost for this host
+    measures the hash time and picks the highest cost which stays
+    below the target time, prints the settings to put into '.env'
+        python3 -m app.benchmarks.passwordCalibrate --target-ms 250
+        python3 -m app.benchmarks.passwordCalibrate --scheme argon2 --target-ms 250 --memory-cost 65536
+    keep in mind, the hashing runs in 'PASSWORD_WORKERS' processes,
+    so the target is per login and per worker
+"""
+import argparse
+import statistics
+import time
+from typing import List, Tuple, Type
+
+from passlib.hash import argon2, bcrypt
+from passlib.ifc import PasswordHash
+
+PASSWORD: str = "calibrate-Password-1234"
+# below that bcrypt is too weak, whatever the target is
+BCRYPT_MIN_ROUNDS: int = 10
+BCRYPT_MAX_ROUNDS: int = 18
+ARGON2_MAX_TIME_COST: int = 20
+
+
+def measure(hasher: Type[PasswordHash], samples: int) -> float:
+    """
+    median hash time in ms
+    """
+    timings: List[float] = []
+    for _ in range(samples):
+        started: float = time.perf_counter()
+        hasher.hash(PASSWORD)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def calibrateBcrypt(target_ms: float, samples: int) -> Tuple[int, List[Tuple[int, float]]]:
+    results: List[Tuple[int, float]] = []
+    picked: int = BCRYPT_MIN_ROUNDS
+    for rounds in range(BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS + 1):
+        ms: float = measure(bcrypt.using(rounds=rounds), samples)
+        results.append((rounds, ms))
+        if ms > target_ms:
+            break
+        picked = rounds
+    return picked, results
+
+
+def calibrateArgon2(
+    target_ms: float, samples: int, memory_cost: int, parallelism: int
+) -> Tuple[int, List[Tuple[int, float]]]:
+    results: List[Tuple[int, float]] = []
+    picked: int = 1
+    for time_cost in range(1, ARGON2_MAX_TIME_COST + 1):
+        ms: float = measure(
+            argon2.using(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism), samples
+        )
+        results.append((time_cost, ms))
+        if ms > target_ms:
+            break
+        picked = time_cost
+    return picked, results
+
+
+def main(scheme: str, target_ms: float, samples: int, memory_cost: int, parallelism: int) -> None:
+    if scheme == "argon2":
+        if not argon2.has_backend():
+            print("argon2 is not available, install 'argon2-cffi'")
+            return
+        picked, results = calibrateArgon2(target_ms, samples, memory_cost, parallelism)
+        for time_cost, ms in results:
+            print(f"time_cost {time_cost:>3}: {ms:10.2f} ms")
+        print()
+        print("PASSWORD_SCHEME=argon2")
+        print(f"PASSWORD_ARGON2_TIME_COST={picked}")
+        print(f"PASSWORD_ARGON2_MEMORY_COST={memory_cost}")
+        print(f"PASSWORD_ARGON2_PARALLELISM={parallelism}")
+    else:
+        picked, results = calibrateBcrypt(target_ms, samples)
+        for rounds, ms in results:
+            print(f"rounds {rounds:>3}: {ms:10.2f} ms")
+        if results[0][1] > target_ms:
+            print(f"even the minimum of {BCRYPT_MIN_ROUNDS} rounds is above the target")
+        print()
+        print("PASSWORD_SCHEME=bcrypt")
+        print(f"PASSWORD_BCRYPT_ROUNDS={picked}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="calibrate the password hash cost for a target time")
+    parser.add_argument("--scheme", choices=["bcrypt", "argon2"], default="bcrypt")
+    parser.add_argument("--target-ms", type=float, default=250)
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument("--memory-cost", type=int, default=65536, help="argon2 memory in KiB")
+    parser.add_argument("--parallelism", type=int, default=4, help="argon2 lanes")
+    args = parser.parse_args()
+    main(args.scheme, args.target_ms, args.samples, args.memory_cost, args.parallelism)
@@ -0,0 +1,55 @@
+"""
+    interface of a storage backend for 'AsyncDBConnection'
+    a backend connects and returns a database object, which gives
+    collections by name ('database[table_name]') with the (async) motor
+    collection api as far as used by 'AsyncDBConnection' and 'indexRegistry'
+    implementations:
+        - 'mongo' => 'MongoBackend' in 'app.db.mongoDbAsync'
+        - 'memory' => 'MemoryBackend' in 'app.db.memoryDb'
+    select it with 'DB_BACKEND' in settings
+    bulk updates are passed as 'BulkUpdate' to the backend, which builds
+    its own operations from them (pymongo's 'UpdateOne' for mongoDB)
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, NamedTuple
+
+from pymongo.results import BulkWriteResult
+
+
+class BulkUpdate(NamedTuple):
+    """
+    one update of a bulk write, of the first document matching 'filter'
+    """
+    filter: Dict[str, Any]
+    update: Dict[str, Any]
+    upsert: bool = False
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class DBBackend(ABC):
+    """
+    base class of a storage backend
+    """
+    name: str = ""
+
+    @abstractmethod
+    async def connect(self) -> Any:
+        """
+        connects and returns the database object
+        """
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        closes the connection of the backend
+        """
+
+    @abstractmethod
+    async def bulk_update(self, collection: Any, updates: List[BulkUpdate], ordered: bool) -> BulkWriteResult:
+        """
+        runs the updates on a collection of the backend in one round trip
+        """
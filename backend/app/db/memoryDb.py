@@ -0,0 +1,605 @@
+"""
+    in memory storage backend, a stand-in for mongoDB
+    implements the part of the motor collection api used by
+    'AsyncDBConnection' and 'indexRegistry':
+        - filters: equality, $eq $ne $gt $gte $lt $lte $in $nin $exists, $and $or $nor
+        - updates: $set $unset $inc $min $max $setOnInsert, upsert
+        - indexes: unique, compound, partial and TTL
+        - projection, sort, limit and bulk updates ('BulkUpdate')
+    documents are stored like mongoDB would return them (BSON round trip),
+    data lives in the process and is lost on restart.
+    Use: for tests and benchmarks ('DB_BACKEND=memory'), not in production
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+import bson
+from bson.objectid import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from pymongo.results import BulkWriteResult, DeleteResult, InsertOneResult
+
+from app.db.backend import BulkUpdate, DBBackend
+
+MISSING: Any = object()
+# how often expired documents of TTL indexes are removed (mongoDB: every 60 seconds)
+TTL_INTERVAL_SECONDS: float = 1
+
+
+# ------------------------------------------------------------------------------
+#
+# document helpers
+#
+# ------------------------------------------------------------------------------
+def normalize(value: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    BSON round trip, to get the same types as from mongoDB
+    (enums as str, datetime as naive UTC in ms, ...)
+    """
+    return bson.decode(bson.encode(value))
+
+
+def copyDocument(document: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: (bson.decode(bson.encode({"v": value}))["v"] if isinstance(value, (dict, list)) else value)
+        for key, value in document.items()
+    }
+
+
+def getValue(document: Dict[str, Any], path: str) -> Any:
+    value: Any = document
+    for part in path.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return MISSING
+    return value
+
+
+def setValue(document: Dict[str, Any], path: str, value: Any) -> None:
+    parts: List[str] = path.split(".")
+    for part in parts[:-1]:
+        document = document.setdefault(part, {})
+    document[parts[-1]] = value
+
+
+def unsetValue(document: Dict[str, Any], path: str) -> None:
+    parts: List[str] = path.split(".")
+    for part in parts[:-1]:
+        value: Any = document.get(part)
+        if not isinstance(value, dict):
+            return
+        document = value
+    document.pop(parts[-1], None)
+
+
+def project(document: Dict[str, Any], projection: Optional[Any]) -> Dict[str, Any]:
+    if projection is None:
+        return copyDocument(document)
+    if not isinstance(projection, dict):
+        projection = {key: 1 for key in projection}
+    result: Dict[str, Any] = {}
+    # like mongoDB, any included field (also only '_id') is an inclusion projection
+    if any(projection.values()):
+        for key, value in projection.items():
+            if value and key != "_id" and key in document:
+                result[key] = document[key]
+        if projection.get("_id", 1):
+            result["_id"] = document["_id"]
+    else:
+        result = {key: value for key, value in document.items() if projection.get(key, 1)}
+    return copyDocument(result)
+
+
+# ------------------------------------------------------------------------------
+#
+# filter
+#
+# ------------------------------------------------------------------------------
+def equals(value: Any, operand: Any) -> bool:
+    if value is MISSING:
+        return operand is None
+    if isinstance(value, list) and not isinstance(operand, list):
+        return operand in value
+    return bool(value == operand)
+
+
+def compare(value: Any, operand: Any, func: Callable[[Any, Any], bool]) -> bool:
+    if value is MISSING or value is None:
+        return False
+    try:
+        return func(value, operand)
+    except TypeError:
+        # different types are never in order, like the type bracketing of mongoDB
+        return False
+
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "$eq": lambda value, operand: equals(value, operand),
+    "$ne": lambda value, operand: not equals(value, operand),
+    "$gt": lambda value, operand: compare(value, operand, lambda a, b: a > b),
+    "$gte": lambda value, operand: compare(value, operand, lambda a, b: a >= b),
+    "$lt": lambda value, operand: compare(value, operand, lambda a, b: a < b),
+    "$lte": lambda value, operand: compare(value, operand, lambda a, b: a <= b),
+    "$in": lambda value, operand: any(equals(value, item) for item in operand),
+    "$nin": lambda value, operand: not any(equals(value, item) for item in operand),
+    "$exists": lambda value, operand: (value is not MISSING) == bool(operand),
+}
+
+
+def matchesCondition(value: Any, condition: Any) -> bool:
+    if isinstance(condition, dict) and len(condition) > 0 and all(key.startswith("$") for key in condition):
+        for operator, operand in condition.items():
+            func: Union[Callable[[Any, Any], bool], None] = OPERATORS.get(operator)
+            if func is None:
+                raise OperationFailure(f"unknown operator: {operator}")
+            if not func(value, operand):
+                return False
+        return True
+    return equals(value, condition)
+
+
+def matches(document: Dict[str, Any], filter: Dict[str, Any]) -> bool:
+    for key, condition in filter.items():
+        if key == "$and":
+            if not all(matches(document, part) for part in condition):
+                return False
+        elif key == "$or":
+            if not any(matches(document, part) for part in condition):
+                return False
+        elif key == "$nor":
+            if any(matches(document, part) for part in condition):
+                return False
+        elif key.startswith("$"):
+            raise OperationFailure(f"unknown operator: {key}")
+        elif not matchesCondition(getValue(document, key), condition):
+            return False
+    return True
+
+
+# ------------------------------------------------------------------------------
+#
+# update
+#
+# ------------------------------------------------------------------------------
+def isUnset(value: Any) -> bool:
+    return value is MISSING or value is None
+
+
+def updateSet(document: Dict[str, Any], path: str, value: Any, current: Any, is_insert: bool) -> None:
+    setValue(document, path, value)
+
+
+def updateUnset(document: Dict[str, Any], path: str, value: Any, current: Any, is_insert: bool) -> None:
+    unsetValue(document, path)
+
+
+def updateInc(document: Dict[str, Any], path: str, value: Any, current: Any, is_insert: bool) -> None:
+    setValue(document, path, (0 if isUnset(current) else current) + value)
+
+
+def updateMax(document: Dict[str, Any], path: str, value: Any, current: Any, is_insert: bool) -> None:
+    if isUnset(current) or compare(value, current, lambda a, b: a > b):
+        setValue(document, path, value)
+
+
+def updateMin(document: Dict[str, Any], path: str, value: Any, current: Any, is_insert: bool) -> None:
+    if isUnset(current) or compare(value, current, lambda a, b: a < b):
+        setValue(document, path, value)
+
+
+def updateSetOnInsert(document: Dict[str, Any], path: str, value: Any, current: Any, is_insert: bool) -> None:
+    if is_insert:
+        setValue(document, path, value)
+
+
+UpdateOperator = Callable[[Dict[str, Any], str, Any, Any, bool], None]
+UPDATE_OPERATORS: Dict[str, UpdateOperator] = {
+    "$set": updateSet,
+    "$unset": updateUnset,
+    "$inc": updateInc,
+    "$max": updateMax,
+    "$min": updateMin,
+    "$setOnInsert": updateSetOnInsert,
+}
+
+
+def applyUpdate(document: Dict[str, Any], update: Dict[str, Any], is_insert: bool) -> None:
+    if len(update) == 0 or not all(key.startswith("$") for key in update):
+        raise ValueError("update only works with $ operators")
+    for operator, fields in update.items():
+        apply: Union[UpdateOperator, None] = UPDATE_OPERATORS.get(operator)
+        if apply is None:
+            raise OperationFailure(f"unknown update operator: {operator}")
+        for path, value in fields.items():
+            apply(document, path, value, getValue(document, path), is_insert)
+
+
+def upsertDocument(filter: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    creates the document for an upsert, from the equality fields of the filter
+    """
+    document: Dict[str, Any] = {}
+    for key, condition in filter.items():
+        if key.startswith("$"):
+            continue
+        if isinstance(condition, dict) and len(condition) > 0 and all(k.startswith("$") for k in condition):
+            if "$eq" in condition:
+                setValue(document, key, condition["$eq"])
+        else:
+            setValue(document, key, condition)
+    applyUpdate(document, update, is_insert=True)
+    if "_id" not in document:
+        document["_id"] = ObjectId()
+    return document
+
+
+def sortDocuments(documents: List[Dict[str, Any]], sort: Optional[List[Tuple[str, int]]]) -> List[Dict[str, Any]]:
+    def sortKey(field: str) -> Callable[[Dict[str, Any]], Any]:
+        def key(document: Dict[str, Any]) -> Any:
+            value: Any = getValue(document, field)
+            # missing and null first, like mongoDB
+            return (0, 0) if value is MISSING or value is None else (1, value)
+        return key
+
+    for field, direction in reversed(sort or []):
+        documents = sorted(documents, key=sortKey(field), reverse=direction < 0)
+    return documents
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class MemoryIndex:
+    """
+    index of a 'MemoryCollection', unique indexes hold a map to find
+    documents by key and to check for duplicates
+    """
+
+    def __init__(self, name: str, keys: List[Tuple[str, Any]], options: Dict[str, Any]) -> None:
+        self.name: str = name
+        self.keys: List[Tuple[str, Any]] = keys
+        self.unique: bool = bool(options.get("unique", False))
+        self.expire_after_seconds: Optional[int] = options.get("expireAfterSeconds")
+        self.partial_filter: Optional[Dict[str, Any]] = options.get("partialFilterExpression")
+        self.entries: Dict[Tuple[Any, ...], Any] = {}
+
+    def covers(self, document: Dict[str, Any]) -> bool:
+        return self.partial_filter is None or matches(document, self.partial_filter)
+
+    def key(self, document: Dict[str, Any]) -> Tuple[Any, ...]:
+        return tuple(
+            None if value is MISSING else value for value in (getValue(document, field) for field, _ in self.keys)
+        )
+
+    def info(self) -> Dict[str, Any]:
+        info: Dict[str, Any] = {"v": 2, "key": list(self.keys)}
+        if self.unique:
+            info["unique"] = True
+        if self.expire_after_seconds is not None:
+            info["expireAfterSeconds"] = self.expire_after_seconds
+        if self.partial_filter is not None:
+            info["partialFilterExpression"] = self.partial_filter
+        return info
+
+
+class MemoryCursor:
+    """
+    async cursor over the result of 'MemoryCollection.find'
+    """
+
+    def __init__(self, documents: List[Dict[str, Any]], projection: Optional[Any]) -> None:
+        self.documents: List[Dict[str, Any]] = documents
+        self.projection: Optional[Any] = projection
+        self.index: int = 0
+
+    def limit(self, limit: int) -> "MemoryCursor":
+        if limit > 0:
+            self.documents = self.documents[:limit]
+        return self
+
+    async def to_list(self, length: Optional[int]) -> List[Dict[str, Any]]:
+        documents: List[Dict[str, Any]] = self.documents[self.index:]
+        if length is not None:
+            documents = documents[:length]
+        self.index += len(documents)
+        return [project(document, self.projection) for document in documents]
+
+    def __aiter__(self) -> "MemoryCursor":
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        if self.index >= len(self.documents):
+            raise StopAsyncIteration
+        document: Dict[str, Any] = self.documents[self.index]
+        self.index += 1
+        return project(document, self.projection)
+
+    async def close(self) -> None:
+        self.documents = []
+
+
+class MemoryCollection:
+    """
+    a collection, documents by '_id' (in insert order)
+    each call yields once to the event loop, like a round trip to mongoDB,
+    and then runs without await points, so each of them is atomic
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.documents: Dict[Any, Dict[str, Any]] = {}
+        self.indexes: Dict[str, MemoryIndex] = {}
+        self.expired_at: float = 0.0
+
+    # --------------------------------------------------------------------------
+    #
+    # internal
+    #
+    # --------------------------------------------------------------------------
+    def _expire(self) -> None:
+        """
+        removes expired documents of TTL indexes
+        """
+        now: float = time.monotonic()
+        if now - self.expired_at < TTL_INTERVAL_SECONDS:
+            return
+        self.expired_at = now
+        utc_now: datetime = datetime.utcnow()
+        for index in self.indexes.values():
+            if index.expire_after_seconds is None:
+                continue
+            field: str = index.keys[0][0]
+            for document in list(self.documents.values()):
+                value: Any = getValue(document, field)
+                if (
+                    isinstance(value, datetime) and
+                    value + timedelta(seconds=index.expire_after_seconds) <= utc_now and
+                    index.covers(document)
+                ):
+                    self._remove(document)
+
+    def _candidates(self, filter: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        the documents to check against the filter,
+        by '_id' or an unique index if possible, else all
+        """
+        self._expire()
+        id: Any = filter.get("_id", MISSING)
+        if id is not MISSING and not isinstance(id, dict):
+            document: Union[Dict[str, Any], None] = self.documents.get(id)
+            return [document] if document is not None else []
+        for index in self.indexes.values():
+            if index.unique and index.partial_filter is None and len(index.keys) == 1:
+                value: Any = filter.get(index.keys[0][0], MISSING)
+                if value is not MISSING and not isinstance(value, dict):
+                    id = index.entries.get((value,))
+                    return [self.documents[id]] if id is not None else []
+        return list(self.documents.values())
+
+    def _find(self, filter: Mapping[str, Any]) -> List[Dict[str, Any]]:
+        normalized: Dict[str, Any] = normalize(filter)
+        return [document for document in self._candidates(normalized) if matches(document, normalized)]
+
+    def _check(self, document: Dict[str, Any]) -> None:
+        for index in self.indexes.values():
+            if index.unique and index.covers(document):
+                other: Any = index.entries.get(index.key(document))
+                if other is not None and other != document["_id"]:
+                    raise DuplicateKeyError(
+                        f"E11000 duplicate key error collection: {self.name} "
+                        f"index: {index.name} dup key: {index.key(document)}",
+                        11000,
+                    )
+
+    def _add(self, document: Dict[str, Any]) -> None:
+        if document["_id"] in self.documents:
+            raise DuplicateKeyError(
+                f"E11000 duplicate key error collection: {self.name} index: _id_ dup key: {document['_id']}", 11000
+            )
+        self._check(document)
+        self.documents[document["_id"]] = document
+        for index in self.indexes.values():
+            if index.unique and index.covers(document):
+                index.entries[index.key(document)] = document["_id"]
+
+    def _remove(self, document: Dict[str, Any]) -> None:
+        self.documents.pop(document["_id"], None)
+        for index in self.indexes.values():
+            if index.unique and index.entries.get(index.key(document)) == document["_id"]:
+                del index.entries[index.key(document)]
+
+    def _update(self, document: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+        updated: Dict[str, Any] = copyDocument(document)
+        applyUpdate(updated, update, is_insert=False)
+        updated = normalize(updated)
+        self._remove(document)
+        try:
+            self._add(updated)
+        except DuplicateKeyError:
+            self._add(document)
+            raise
+        return updated
+
+    def _insert(self, document: Dict[str, Any]) -> Any:
+        document = normalize(document)
+        if "_id" not in document:
+            document["_id"] = ObjectId()
+        self._expire()
+        self._add(document)
+        return document["_id"]
+
+    def _upsert(self, filter: Mapping[str, Any], update: Dict[str, Any]) -> Dict[str, Any]:
+        document: Dict[str, Any] = normalize(upsertDocument(normalize(filter), normalize(update)))
+        self._add(document)
+        return document
+
+    # --------------------------------------------------------------------------
+    #
+    # collection api
+    #
+    # --------------------------------------------------------------------------
+    async def insert_one(self, document: Dict[str, Any]) -> InsertOneResult:
+        await asyncio.sleep(0)
+        return InsertOneResult(self._insert(document), True)
+
+    async def find_one(self, filter: Optional[Dict[str, Any]] = None, projection: Optional[Any] = None) -> Any:
+        await asyncio.sleep(0)
+        for document in self._find(filter or {}):
+            return project(document, projection)
+        return None
+
+    def find(
+        self,
+        filter: Optional[Dict[str, Any]] = None,
+        projection: Optional[Any] = None,
+        sort: Optional[List[Tuple[str, int]]] = None,
+        limit: int = 0,
+        batch_size: int = 0,
+    ) -> MemoryCursor:
+        return MemoryCursor(sortDocuments(self._find(filter or {}), sort), projection).limit(limit)
+
+    async def find_one_and_update(
+        self,
+        filter: Dict[str, Any],
+        update: Dict[str, Any],
+        projection: Optional[Any] = None,
+        upsert: bool = False,
+        return_document: bool = False,
+    ) -> Any:
+        await asyncio.sleep(0)
+        update = normalize(update)
+        for document in self._find(filter):
+            updated: Dict[str, Any] = self._update(document, update)
+            return project(updated if return_document else document, projection)
+        if upsert:
+            inserted: Dict[str, Any] = self._upsert(filter, update)
+            return project(inserted, projection) if return_document else None
+        return None
+
+    async def find_one_and_delete(self, filter: Dict[str, Any], projection: Optional[Any] = None) -> Any:
+        await asyncio.sleep(0)
+        for document in self._find(filter):
+            self._remove(document)
+            return project(document, projection)
+        return None
+
+    async def delete_one(self, filter: Dict[str, Any]) -> DeleteResult:
+        await asyncio.sleep(0)
+        for document in self._find(filter):
+            self._remove(document)
+            return DeleteResult({"n": 1}, True)
+        return DeleteResult({"n": 0}, True)
+
+    async def delete_many(self, filter: Dict[str, Any]) -> DeleteResult:
+        await asyncio.sleep(0)
+        documents: List[Dict[str, Any]] = self._find(filter)
+        for document in documents:
+            self._remove(document)
+        return DeleteResult({"n": len(documents)}, True)
+
+    async def bulk_update(self, updates: List[BulkUpdate], ordered: bool = True) -> BulkWriteResult:
+        """
+        like mongoDB, duplicate keys are collected as write errors and raised as
+        'BulkWriteError', ordered stops at the first, unordered runs all updates
+        """
+        await asyncio.sleep(0)
+        result: Dict[str, Any] = {
+            "writeErrors": [], "writeConcernErrors": [],
+            "nInserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "nUpserted": 0, "upserted": [],
+        }
+        for index, request in enumerate(updates):
+            try:
+                update: Dict[str, Any] = normalize(request.update)
+                documents: List[Dict[str, Any]] = self._find(request.filter)[:1]
+                for document in documents:
+                    self._update(document, update)
+                result["nMatched"] += len(documents)
+                result["nModified"] += len(documents)
+                if len(documents) == 0 and request.upsert:
+                    inserted: Dict[str, Any] = self._upsert(request.filter, update)
+                    result["nUpserted"] += 1
+                    result["upserted"].append({"index": index, "_id": inserted["_id"]})
+            except DuplicateKeyError as e:
+                result["writeErrors"].append(
+                    {"index": index, "code": 11000, "errmsg": str(e), "op": request._asdict()}
+                )
+                if ordered:
+                    break
+        if len(result["writeErrors"]) > 0:
+            raise BulkWriteError(result)
+        return BulkWriteResult(result, True)
+
+    # --------------------------------------------------------------------------
+    #
+    # index api
+    #
+    # --------------------------------------------------------------------------
+    async def create_index(self, keys: List[Tuple[str, Any]], **options: Any) -> str:
+        await asyncio.sleep(0)
+        keys = list(keys)
+        name: str = options.get("name") or "_".join(f"{field}_{direction}" for field, direction in keys)
+        if name in self.indexes:
+            return name
+        index: MemoryIndex = MemoryIndex(name, keys, normalize(options))
+        if index.unique:
+            for document in self.documents.values():
+                if index.covers(document):
+                    if index.key(document) in index.entries:
+                        raise OperationFailure(f"E11000 duplicate key error, can not create index: {name}", 11000)
+                    index.entries[index.key(document)] = document["_id"]
+        self.indexes[name] = index
+        return name
+
+    async def drop_index(self, name: str) -> None:
+        await asyncio.sleep(0)
+        if self.indexes.pop(name, None) is None:
+            raise OperationFailure(f"index not found with name [{name}]", 27)
+
+    async def index_information(self) -> Dict[str, Dict[str, Any]]:
+        await asyncio.sleep(0)
+        information: Dict[str, Dict[str, Any]] = {"_id_": {"v": 2, "key": [("_id", 1)]}}
+        for name, index in self.indexes.items():
+            information[name] = index.info()
+        return information
+
+
+class MemoryDatabase:
+    """
+    a database, collections are created on first access
+    """
+
+    def __init__(self) -> None:
+        self.collections: Dict[str, MemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> MemoryCollection:
+        collection: Union[MemoryCollection, None] = self.collections.get(name)
+        if collection is None:
+            collection = MemoryCollection(name)
+            self.collections[name] = collection
+        return collection
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class MemoryBackend(DBBackend):
+    """
+    backend with an empty 'MemoryDatabase' on every connect
+    """
+    name: str = "memory"
+
+    async def connect(self) -> MemoryDatabase:
+        return MemoryDatabase()
+
+    def close(self) -> None:
+        pass
+
+    async def bulk_update(self, collection: Any, updates: List[BulkUpdate], ordered: bool) -> BulkWriteResult:
+        result: BulkWriteResult = await collection.bulk_update(updates, ordered=ordered)
+        return result
@@ -0,0 +1,144 @@
+"""
+    in process read-through cache for 'find_one'
+    only for entity types enabled with 'entityCache.enable'.
+    entries are bounded by size (LRU) and TTL, and are invalidated
+    by writes of the same process on the same table.
+    other workers only see a change after the TTL, so keep it short,
+    an entity can have its own TTL ('enable(entity, ttl_seconds)').
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Set, Tuple, Type, Union
+
+from app.utils.config import settings
+from app.utils.metricsHelper import metricsRegistry
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class EntityCache:
+    """
+    LRU + TTL cache of decoded model-tables,
+    keyed by table, entity and filter
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size: int = max_size
+        self.ttl_seconds: float = ttl_seconds
+        # entity => TTL of its entries
+        self.entities: Dict[Type[Any], float] = {}
+        # key => (expires at, table name, id, entity)
+        self.entries: "OrderedDict[Hashable, Tuple[float, str, Any, Any]]" = OrderedDict()
+        # (table name, id) => keys, to invalidate all entries of one document
+        self.keys_by_id: Dict[Tuple[str, Any], Set[Hashable]] = {}
+        # increased on every invalidation of a table, to not store results of reads
+        # which were running while a write happened
+        self.generations: Dict[str, int] = {}
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidations": 0}
+
+    def enable(self, entity: Type[Any], ttl_seconds: Union[float, None] = None) -> None:
+        """
+        caches 'entity', with the default TTL if 'ttl_seconds' is None,
+        a TTL of 0 or less disables it
+        """
+        ttl: float = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl > 0:
+            self.entities[entity] = ttl
+        else:
+            self.entities.pop(entity, None)
+
+    def is_enabled(self, entity: Type[Any]) -> bool:
+        return self.max_size > 0 and entity in self.entities
+
+    def key(self, table_name: str, filter: Dict[str, Any], entity: Type[Any], *extra: Any) -> Hashable:
+        return (table_name, entity, repr(filter), *extra)
+
+    def generation(self, table_name: str) -> int:
+        return self.generations.get(table_name, 0)
+
+    # --------------------------------------------------------------------------
+    #
+    #
+    #
+    # --------------------------------------------------------------------------
+    def get(self, key: Hashable) -> Union[Any, None]:
+        entry: Union[Tuple[float, str, Any, Any], None] = self.entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        if entry[0] < time.monotonic():
+            self._drop(key)
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+        self.entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[3].copy()
+
+    def put(self, key: Hashable, table_name: str, id: Any, value: Any, generation: int) -> None:
+        if generation != self.generation(table_name):
+            return
+        if key in self.entries:
+            self._drop(key)
+        ttl: float = self.entities.get(type(value), self.ttl_seconds)
+        self.entries[key] = (time.monotonic() + ttl, table_name, id, value.copy())
+        self.keys_by_id.setdefault((table_name, id), set()).add(key)
+        while len(self.entries) > self.max_size:
+            self._drop(next(iter(self.entries)))
+            self.stats["evictions"] += 1
+
+    def _drop(self, key: Hashable) -> None:
+        entry: Union[Tuple[float, str, Any, Any], None] = self.entries.pop(key, None)
+        if entry is not None:
+            keys: Union[Set[Hashable], None] = self.keys_by_id.get((entry[1], entry[2]))
+            if keys is not None:
+                keys.discard(key)
+                if len(keys) == 0:
+                    del self.keys_by_id[(entry[1], entry[2])]
+
+    # --------------------------------------------------------------------------
+    #
+    #
+    #
+    # --------------------------------------------------------------------------
+    def invalidate_id(self, table_name: str, id: Any) -> None:
+        """
+        removes all entries of one document
+        """
+        self.generations[table_name] = self.generation(table_name) + 1
+        for key in list(self.keys_by_id.get((table_name, id), ())):
+            self._drop(key)
+            self.stats["invalidations"] += 1
+
+    def invalidate_table(self, table_name: str) -> None:
+        """
+        removes all entries of one table,
+        used when the changed documents are not known
+        """
+        self.generations[table_name] = self.generation(table_name) + 1
+        for key in [key for key, entry in self.entries.items() if entry[1] == table_name]:
+            self._drop(key)
+            self.stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        """
+        removes all entries, e.g. when the database was replaced
+        """
+        for table_name in {entry[1] for entry in self.entries.values()}:
+            self.invalidate_table(table_name)
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups: int = self.stats["hits"] + self.stats["misses"]
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups > 0 else 0.0,
+            **self.stats,
+        }
+
+
+entityCache: EntityCache = EntityCache(max_size=settings.DB_CACHE_SIZE, ttl_seconds=settings.DB_CACHE_TTL_SECONDS)
+metricsRegistry.register("db_cache", entityCache.snapshot)
@@ -8,17 +8,19 @@
 import logging
 import sys
 from time import sleep
-from typing import Any, Dict, Type, Union
+from typing import Any, ClassVar, Dict, List, Optional, Type, Union
 
 import pymongo
 import verboselogs
 from bson.objectid import ObjectId
 from pydantic.fields import Field
-from pydantic.main import BaseConfig, BaseModel
+from pydantic import BaseConfig, BaseModel
 from pymongo import MongoClient
 from pymongo.database import Database
 from pymongo.results import DeleteResult, InsertOneResult
 
+from app.db.mongoIndex import MongoIndex
+from app.db.mongoMonitor import commandMetrics, poolMetrics
 from app.utils.config import settings
 
 
@@ -57,6 +59,8 @@ class MongoModel(BaseModel):
     entities
     """
     id: PyObjectId = Field(default_factory=PyObjectId, alias="_id")
+    # indexes of the model-table, see 'app.db.mongoIndex'
+    indexes: ClassVar[List[MongoIndex]] = []
 
     class Config(BaseConfig):
         arbitrary_types_allowed = True
@@ -69,11 +73,63 @@ class MongoModel(BaseModel):
 
 
 
+def decode_entity(entity: Type[Any], document: Dict[str, Any], trusted: bool = False) -> Any:
+    """
+    transforms a document into the class provided by 'entity'-Type
+    'trusted' skips the validation ('construct'), only use it for
+    documents written by this app, values keep their BSON types
+    and fields not in a projection are missing or default
+    """
+    if trusted:
+        # documents are stored with 'obj.dict()', so they also hold a stale 'id' field,
+        # 'construct' would let it win over the '_id' alias, validation uses '_id'
+        if "_id" in document and "id" in document:
+            document = {key: value for key, value in document.items() if key != "id"}
+        return entity.construct(**document)
+    return entity(**document)
+
+
 # ------------------------------------------------------------------------------
 #
 #
 #
 # ------------------------------------------------------------------------------
+DB_MAX_SEV_SEL_DELAY: int = 1
+DB_CONNECT_RETRY: int = 5
+MongoDatabase = Database[Dict[str, Any]]
+
+
+def create_db_url() -> str:
+    """
+    creates the database url from settings,
+    used by the sync and the async connector
+    """
+    if settings.DB_URL is None:
+        settings.DB_URL = f"{settings.DB_PROTOCOL}://{settings.DB_HOST}:{settings.DB_PORT}/"
+    if settings.DB_USER is not None and settings.DB_PASSWORD is not None:
+        settings.DB_URL = f"{settings.DB_PROTOCOL}://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/"
+    return settings.DB_URL
+
+
+def create_client_options() -> Dict[str, Any]:
+    """
+    creates the client options (timeouts, pool sizing and monitoring)
+    from settings, used by the sync and the async connector
+    """
+    options: Dict[str, Any] = {
+        "serverSelectionTimeoutMS": DB_MAX_SEV_SEL_DELAY,
+        "connectTimeoutMS": settings.DB_CONNECT_TIMEOUT_MS,
+        "maxPoolSize": settings.DB_MAX_POOL_SIZE,
+        "minPoolSize": settings.DB_MIN_POOL_SIZE,
+        "event_listeners": [poolMetrics, commandMetrics],
+    }
+    if settings.DB_MAX_IDLE_TIME_MS is not None:
+        options["maxIdleTimeMS"] = settings.DB_MAX_IDLE_TIME_MS
+    if settings.DB_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options["waitQueueTimeoutMS"] = settings.DB_WAIT_QUEUE_TIMEOUT_MS
+    return options
+
+
 class DBConnector:
     """
     a "singelton" to connect with database
@@ -87,7 +143,7 @@ class DBConnector:
 
 
     # creates new connection
-    def create_connection(self) -> Database:
+    def create_connection(self) -> Union[MongoDatabase, None]:
         """
         creates a connection to database
         if connection can not created
@@ -95,21 +151,15 @@ class DBConnector:
         """
         try:
             # create a connection using MongoClient
-            if settings.DB_URL is None:
-                settings.DB_URL = f"{settings.DB_PROTOCOL}://{settings.DB_HOST}:{settings.DB_PORT}/"
-            if settings.DB_USER is not None and settings.DB_PASSWORD is not None:
-                settings.DB_URL = f"{settings.DB_PROTOCOL}://{settings.DB_USER}:{settings.DB_PASSWORD}@{settings.DB_HOST}:{settings.DB_PORT}/"
+            db_url: str = create_db_url()
             logging.log(
                 verboselogs.NOTICE,
-                f"start connecting to database... to => {settings.DB_URL}",
-            )
-            max_sev_sel_delay = 1
-            client: MongoClient = MongoClient(
-                settings.DB_URL, serverSelectionTimeoutMS=max_sev_sel_delay
+                f"start connecting to database... to => {db_url}",
             )
+            client: MongoClient[Dict[str, Any]] = MongoClient(db_url, **create_client_options())
             # dirty check if connection exist, if not error will throw
             is_connected: bool = False
-            is_connected_retry: int = 5
+            is_connected_retry: int = DB_CONNECT_RETRY
             while not is_connected and is_connected_retry > 0:
                 try:
                     client.server_info()
@@ -117,7 +167,7 @@ class DBConnector:
                 except pymongo.errors.ServerSelectionTimeoutError as e:
                     logging.log(
                         logging.WARNING,
-                        f"Connect to database failed, retry {is_connected_retry}/5",
+                        f"Connect to database failed, retry {is_connected_retry}/{DB_CONNECT_RETRY}",
                     )
                     is_connected_retry -= 1
                     sleep(1)
@@ -129,7 +179,7 @@ class DBConnector:
                 verboselogs.NOTICE, f"access schema ... => {settings.DB_SCHEMA}"
             )
             # create the database access
-            schema: Database = client[settings.DB_SCHEMA]
+            schema: MongoDatabase = client[settings.DB_SCHEMA]
             logging.log(verboselogs.NOTICE, "... access create, you can use db")
             return schema
 
@@ -138,15 +188,19 @@ class DBConnector:
             sys.exit(4)
         except Exception as e:
             logging.log(logging.CRITICAL, f"2:: {e}", exc_info=True)
+        return None
 
 
     # for explicitly opening database connection
-    def __enter__(self) -> Database:
-        self.dbconn = self.create_connection()
-        return self.dbconn
+    def __enter__(self) -> MongoDatabase:
+        dbconn: Union[MongoDatabase, None] = self.create_connection()
+        if dbconn is None:
+            raise ConnectionError("no database connection")
+        self.dbconn: MongoDatabase = dbconn
+        return dbconn
 
     def __exit__(self, a, b, c):
-        self.dbconn.close()
+        self.dbconn.client.close()
 
 
 
@@ -165,15 +219,18 @@ class DBConnection:
     contains some base functions
     to call with database
     """
-    connection: Union[Database, None] = None
+    connection: Union[MongoDatabase, None] = None
 
     @classmethod
-    def get_connection(cls, new: bool = False) -> Union[Database, None]:
+    def get_connection(cls, new: bool = False) -> MongoDatabase:
         """
         creates return new Singleton database connection
+        raises 'ConnectionError' if it can not be created
         """
         if new or cls.connection is None:
             cls.connection = DBConnector().create_connection()
+        if cls.connection is None:
+            raise ConnectionError("no database connection")
         return cls.connection
 
 
@@ -187,40 +244,52 @@ class DBConnection:
         """
         insert a model-table
         """
-        connection: Database = cls.get_connection()
+        connection: MongoDatabase = cls.get_connection()
         result: InsertOneResult = connection[table_name].insert_one(obj.dict())
         return PyObjectId(result.inserted_id) if result is not None else None
 
     @classmethod
     def find_one(
-        cls, filter: Dict[str, Any], entity: Type[Any], table_name: str
+        cls,
+        filter: Dict[str, Any],
+        entity: Type[Any],
+        table_name: str,
+        projection: Optional[Dict[str, Any]] = None,
+        trusted: bool = False,
     ) -> Union[Any, None]:
         """
         finds a model-table by filter
         and transforms it into the class
         provided by 'entity'-Type
+        'projection' to only fetch some fields, 'trusted' see 'decode_entity'
         """
-        connection: Database = cls.get_connection()
-        result: Union[Any, None] = connection[table_name].find_one(filter)
+        connection: MongoDatabase = cls.get_connection()
+        result: Union[Any, None] = connection[table_name].find_one(filter, projection)
         if result is not None:
-            result = entity(**result)
+            result = decode_entity(entity, result, trusted)
         return result
 
     @classmethod
     def find_and_modify(
-        cls, id: PyObjectId, update: Dict[str, Any], entity: Type[Any], table_name: str
+        cls,
+        id: PyObjectId,
+        update: Dict[str, Any],
+        entity: Type[Any],
+        table_name: str,
+        projection: Optional[Dict[str, Any]] = None,
+        trusted: bool = False,
     ) -> Union[Any, None]:
         """
         finds and modify a model-table by id
         and transforms it into the class
         provided by 'entity'-Type
         """
-        connection: Database = cls.get_connection()
+        connection: MongoDatabase = cls.get_connection()
         result: Union[Any, None] = connection[table_name].find_one_and_update(
-            {"_id": id}, {"$set": update}, upsert=False, new=True
+            {"_id": id}, {"$set": update}, projection=projection, return_document=pymongo.ReturnDocument.AFTER
         )
         if result is not None:
-            result = entity(**result)
+            result = decode_entity(entity, result, trusted)
         return result
 
     @classmethod
@@ -229,7 +298,6 @@ class DBConnection:
         removes an entity from model-table
         by id
         """
-        connection: Database = cls.get_connection()
-        # connection[table_name].remove(id)
+        connection: MongoDatabase = cls.get_connection()
         result: DeleteResult = connection[table_name].delete_one({"_id": id})
         return result is not None and result.deleted_count > 0
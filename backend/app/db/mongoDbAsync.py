@@ -0,0 +1,396 @@
+"""
+    async database connection handler for mongoDB
+    the non blocking variant of 'mongoDb', build on motor,
+    so database calls do not stall the event loop.
+    Use: 'AsyncDBConnection' in async code (services, routes)
+    for handling connection
+    the storage is selected with 'DB_BACKEND' ('mongo', 'memory'), see 'app.db.backend'
+"""
+import asyncio
+import logging
+import sys
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional, Tuple, Type, Union
+
+import pymongo
+import verboselogs
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCursor, AsyncIOMotorDatabase
+from pymongo.results import BulkWriteResult, DeleteResult, InsertOneResult
+
+from app.db.backend import BulkUpdate, DBBackend
+from app.db.memoryDb import MemoryBackend
+from app.db.mongoCache import entityCache
+from app.db.mongoDb import (
+    DB_CONNECT_RETRY,
+    MongoModel,
+    PyObjectId,
+    create_client_options,
+    create_db_url,
+    decode_entity,
+)
+from app.db.singleflight import keyName, singleflight
+from app.utils.config import settings
+
+MotorDatabase = AsyncIOMotorDatabase[Dict[str, Any]]
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class AsyncDBConnector:
+    """
+    a "singelton" to connect with database
+    do not use it in project
+    it will called in next class 'AsyncDBConnection'
+    which should be used instead
+    """
+
+    def __init__(self):
+        pass
+
+    # creates new connection
+    async def create_connection(self) -> Union[MotorDatabase, None]:
+        """
+        creates a connection to database
+        if connection can not created
+        program will exit
+        """
+        try:
+            # create a connection using AsyncIOMotorClient
+            db_url: str = create_db_url()
+            logging.log(
+                verboselogs.NOTICE,
+                f"start connecting to database (async)... to => {db_url}",
+            )
+            client: AsyncIOMotorClient[Dict[str, Any]] = AsyncIOMotorClient(db_url, **create_client_options())
+            # dirty check if connection exist, if not error will throw
+            is_connected: bool = False
+            is_connected_retry: int = DB_CONNECT_RETRY
+            while not is_connected and is_connected_retry > 0:
+                try:
+                    await client.server_info()
+                    is_connected = True
+                except pymongo.errors.ServerSelectionTimeoutError:
+                    logging.log(
+                        logging.WARNING,
+                        f"Connect to database failed, retry {is_connected_retry}/{DB_CONNECT_RETRY}",
+                    )
+                    is_connected_retry -= 1
+                    await asyncio.sleep(1)
+            if not is_connected:
+                raise pymongo.errors.ServerSelectionTimeoutError("Failed to connect")
+
+            logging.log(verboselogs.NOTICE, "... connected with database (async)")
+            logging.log(
+                verboselogs.NOTICE, f"access schema ... => {settings.DB_SCHEMA}"
+            )
+            # create the database access
+            schema: MotorDatabase = client[settings.DB_SCHEMA]
+            logging.log(verboselogs.NOTICE, "... access create, you can use db")
+            return schema
+
+        except pymongo.errors.ServerSelectionTimeoutError as e:
+            logging.log(logging.CRITICAL, f"1:: {e}")
+            sys.exit(4)
+        except Exception as e:
+            logging.log(logging.CRITICAL, f"2:: {e}", exc_info=True)
+        return None
+
+
+class MongoBackend(DBBackend):
+    """
+    backend with mongoDB, connects with 'AsyncDBConnector'
+    """
+    name: str = "mongo"
+
+    def __init__(self) -> None:
+        self.connection: Union[MotorDatabase, None] = None
+
+    async def connect(self) -> Union[MotorDatabase, None]:
+        self.close()
+        self.connection = await AsyncDBConnector().create_connection()
+        return self.connection
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.client.close()
+            self.connection = None
+
+    async def bulk_update(self, collection: Any, updates: List[BulkUpdate], ordered: bool) -> BulkWriteResult:
+        result: BulkWriteResult = await collection.bulk_write(
+            [pymongo.UpdateOne(update.filter, update.update, upsert=update.upsert) for update in updates],
+            ordered=ordered,
+        )
+        return result
+
+
+DB_BACKENDS: Dict[str, Type[DBBackend]] = {
+    MongoBackend.name: MongoBackend,
+    MemoryBackend.name: MemoryBackend,
+}
+
+
+def create_backend(name: str = settings.DB_BACKEND) -> DBBackend:
+    """
+    creates the storage backend by name
+    """
+    backend: Union[Type[DBBackend], None] = DB_BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"unknown DB_BACKEND '{name}', use one of {list(DB_BACKENDS.keys())}")
+    return backend()
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class AsyncDBConnection:
+    """
+    class to use in project to handle
+    database interactions without blocking the event loop
+    use: in main (startup) to first call and check
+         if database is reachable
+    contains the same base functions as 'DBConnection',
+    but all of them need to be awaited
+    """
+    connection: Any = None
+    backend: DBBackend = create_backend()
+
+    @classmethod
+    async def get_connection(cls, new: bool = False) -> Any:
+        """
+        creates return new Singleton database connection
+        the database object of the backend, 'MotorDatabase' or 'MemoryDatabase'
+        """
+        if new or cls.connection is None:
+            cls.connection = await cls.backend.connect()
+        return cls.connection
+
+    @classmethod
+    def close(cls) -> None:
+        """
+        closes the backend behind the Singleton database connection
+        """
+        if cls.connection is not None:
+            cls.backend.close()
+            cls.connection = None
+
+    # --------------------------------------------------------------------------
+    #
+    #
+    #
+    # --------------------------------------------------------------------------
+    @classmethod
+    async def insert_one(cls, obj: MongoModel, table_name: str) -> Union[PyObjectId, None]:
+        """
+        insert a model-table
+        """
+        connection: MotorDatabase = await cls.get_connection()
+        result: InsertOneResult = await connection[table_name].insert_one(obj.dict())
+        if result is not None:
+            entityCache.invalidate_id(table_name, result.inserted_id)
+        return PyObjectId(result.inserted_id) if result is not None else None
+
+    @classmethod
+    async def find_one(
+        cls,
+        filter: Dict[str, Any],
+        entity: Type[Any],
+        table_name: str,
+        projection: Optional[Dict[str, Any]] = None,
+        trusted: bool = False,
+        coalesce: bool = False,
+    ) -> Union[Any, None]:
+        """
+        finds a model-table by filter
+        and transforms it into the class
+        provided by 'entity'-Type
+        'projection' to only fetch some fields, 'trusted' see 'decode_entity'
+        is read through 'entityCache', if enabled for the 'entity'-Type
+        'coalesce' shares one query between concurrent identical calls, see 'singleflight'
+        """
+        key: Hashable = entityCache.key(table_name, filter, entity, repr(projection), trusted)
+        is_cached: bool = entityCache.is_enabled(entity)
+        if is_cached:
+            cached: Union[Any, None] = entityCache.get(key)
+            if cached is not None:
+                return cached
+            generation: int = entityCache.generation(table_name)
+
+        async def query() -> Union[Any, None]:
+            connection: MotorDatabase = await cls.get_connection()
+            result: Union[Any, None] = await connection[table_name].find_one(filter, projection)
+            if result is not None:
+                result = decode_entity(entity, result, trusted)
+                if is_cached:
+                    entityCache.put(key, table_name, result.id, result, generation)
+            return result
+
+        if coalesce:
+            return await singleflight.do(key, keyName(table_name, filter), query)
+        return await query()
+
+    @classmethod
+    async def find_iter(
+        cls,
+        filter: Dict[str, Any],
+        entity: Type[Any],
+        table_name: str,
+        batch_size: int = settings.DB_BATCH_SIZE,
+        projection: Optional[Dict[str, Any]] = None,
+        sort: Optional[List[Tuple[str, int]]] = None,
+        limit: int = 0,
+        trusted: bool = False,
+    ) -> AsyncIterator[Any]:
+        """
+        finds all model-tables by filter, and yields them
+        one by one transformed into the class provided by 'entity'-Type
+        only one batch of 'batch_size' documents is hold in memory
+        'projection' to only fetch some fields, 'trusted' see 'decode_entity'
+        """
+        connection: MotorDatabase = await cls.get_connection()
+        cursor: AsyncIOMotorCursor[Dict[str, Any]] = connection[table_name].find(
+            filter, projection, sort=sort, limit=limit, batch_size=batch_size
+        )
+        try:
+            async for document in cursor:
+                yield decode_entity(entity, document, trusted)
+        finally:
+            await cursor.close()
+
+    @classmethod
+    async def find_one_and_update(
+        cls,
+        filter: Dict[str, Any],
+        update: Dict[str, Any],
+        entity: Type[Any],
+        table_name: str,
+        upsert: bool = False,
+        projection: Optional[Dict[str, Any]] = None,
+        trusted: bool = False,
+    ) -> Union[Any, None]:
+        """
+        finds and modify a model-table by filter,
+        with any update operators ('$set', '$unset', '$max', ...)
+        and transforms the modified one into the class
+        provided by 'entity'-Type
+        'projection' to only fetch some fields, 'trusted' see 'decode_entity'
+        """
+        connection: MotorDatabase = await cls.get_connection()
+        result: Union[Any, None] = await connection[table_name].find_one_and_update(
+            filter, update, projection=projection, upsert=upsert, return_document=pymongo.ReturnDocument.AFTER
+        )
+        if result is not None:
+            entityCache.invalidate_id(table_name, result["_id"])
+            result = decode_entity(entity, result, trusted)
+        return result
+
+    @classmethod
+    async def find_and_modify(
+        cls,
+        id: PyObjectId,
+        update: Dict[str, Any],
+        entity: Type[Any],
+        table_name: str,
+        projection: Optional[Dict[str, Any]] = None,
+        trusted: bool = False,
+    ) -> Union[Any, None]:
+        """
+        finds and modify a model-table by id
+        and transforms it into the class
+        provided by 'entity'-Type
+        """
+        return await cls.find_one_and_update(
+            filter={"_id": id},
+            update={"$set": update},
+            entity=entity,
+            table_name=table_name,
+            projection=projection,
+            trusted=trusted,
+        )
+
+    @classmethod
+    async def bulk_update(
+        cls, updates: List[BulkUpdate], table_name: str, ordered: bool = False, ids: Optional[List[Any]] = None
+    ) -> Union[BulkWriteResult, None]:
+        """
+        runs many updates ('BulkUpdate') on a model-table in one round trip
+        'ids' of the changed documents, if known, invalidates only their
+        cache entries, else the whole table is invalidated
+        """
+        if len(updates) == 0:
+            return None
+        connection: MotorDatabase = await cls.get_connection()
+        result: BulkWriteResult = await cls.backend.bulk_update(connection[table_name], updates, ordered)
+        if ids is not None:
+            for id in ids:
+                entityCache.invalidate_id(table_name, id)
+        else:
+            entityCache.invalidate_table(table_name)
+        return result
+
+    @classmethod
+    async def find_one_and_delete(
+        cls,
+        filter: Dict[str, Any],
+        entity: Type[Any],
+        table_name: str,
+        projection: Optional[Dict[str, Any]] = None,
+        trusted: bool = False,
+    ) -> Union[Any, None]:
+        """
+        finds and removes a model-table by filter, in one atomic step
+        and transforms the removed one into the class
+        provided by 'entity'-Type
+        """
+        connection: MotorDatabase = await cls.get_connection()
+        result: Union[Any, None] = await connection[table_name].find_one_and_delete(filter, projection=projection)
+        if result is not None:
+            entityCache.invalidate_id(table_name, result["_id"])
+            result = decode_entity(entity, result, trusted)
+        return result
+
+    @classmethod
+    async def delete_one(cls, filter: Dict[str, Any], table_name: str) -> bool:
+        """
+        removes an entity from model-table
+        by filter
+        """
+        connection: MotorDatabase = await cls.get_connection()
+        result: DeleteResult = await connection[table_name].delete_one(filter)
+        if "_id" in filter and not isinstance(filter["_id"], dict):
+            entityCache.invalidate_id(table_name, filter["_id"])
+        else:
+            entityCache.invalidate_table(table_name)
+        return result is not None and result.deleted_count > 0
+
+    @classmethod
+    async def delete_many(cls, filter: Dict[str, Any], table_name: str, limit: Optional[int] = None) -> int:
+        """
+        removes all entities from model-table
+        by filter, with 'limit' only the first 'limit' (a batch)
+        returns the count of removed entities
+        """
+        connection: MotorDatabase = await cls.get_connection()
+        delete_filter: Dict[str, Any] = filter
+        if limit is not None:
+            ids: List[Any] = [
+                document["_id"]
+                for document in await connection[table_name].find(filter, {"_id": 1}).limit(limit).to_list(limit)
+            ]
+            if len(ids) == 0:
+                return 0
+            delete_filter = {"$and": [filter, {"_id": {"$in": ids}}]}
+        result: DeleteResult = await connection[table_name].delete_many(delete_filter)
+        entityCache.invalidate_table(table_name)
+        return result.deleted_count if result is not None else 0
+
+    @classmethod
+    async def remove(cls, id: PyObjectId, table_name: str) -> bool:
+        """
+        removes an entity from model-table
+        by id
+        """
+        return await cls.delete_one(filter={"_id": id}, table_name=table_name)
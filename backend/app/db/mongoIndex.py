@@ -0,0 +1,142 @@
+"""
+    declarative indexes for model-tables
+    a 'MongoModel' declares its indexes in 'indexes'
+    (or by 'Field(unique=True)'), the model-table is registered
+    with 'indexRegistry.register' and on startup
+    'indexRegistry.sync' creates them, indexes which are different
+    from their declaration are only dropped and recreated
+    with 'DB_INDEX_RECREATE'
+"""
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import pymongo
+import verboselogs
+from pydantic.fields import Field
+from pydantic.main import BaseModel
+
+from app.utils.config import settings
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class MongoIndex(BaseModel):
+    """
+    declaration of one index
+        - keys: list of (field, direction), more then one is a compound index
+        - unique: unique index
+        - expireAfterSeconds: TTL index (only on a single date field)
+        - partialFilterExpression: partial index, only documents matching are indexed
+    """
+    keys: List[Tuple[str, Any]] = Field()
+    name: Optional[str] = Field(default=None)
+    unique: bool = Field(default=False)
+    expireAfterSeconds: Optional[int] = Field(default=None)
+    partialFilterExpression: Optional[Dict[str, Any]] = Field(default=None)
+
+    def index_name(self) -> str:
+        """
+        the name of the index, same as mongoDB would create by default
+        """
+        if self.name is not None:
+            return self.name
+        return "_".join(f"{field}_{direction}" for field, direction in self.keys)
+
+    def options(self) -> Dict[str, Any]:
+        """
+        options to use with 'create_index'
+        """
+        options: Dict[str, Any] = {"name": self.index_name()}
+        if self.unique:
+            options["unique"] = True
+        if self.expireAfterSeconds is not None:
+            options["expireAfterSeconds"] = self.expireAfterSeconds
+        if self.partialFilterExpression is not None:
+            options["partialFilterExpression"] = self.partialFilterExpression
+        return options
+
+    def matches(self, info: Dict[str, Any]) -> bool:
+        """
+        checks if an existing index (from 'index_information') is the same
+        as the declared one
+        """
+        return (
+            [(field, direction) for field, direction in info.get("key", [])] == list(self.keys) and
+            bool(info.get("unique", False)) == self.unique and
+            info.get("expireAfterSeconds") == self.expireAfterSeconds and
+            info.get("partialFilterExpression") == self.partialFilterExpression
+        )
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+def modelIndexes(entity: Type[Any]) -> List[MongoIndex]:
+    """
+    collects the declared indexes of a model-table,
+    from 'indexes' and from fields defined with 'Field(unique=True)'
+    """
+    indexes: List[MongoIndex] = list(getattr(entity, "indexes", []))
+    for field in entity.__fields__.values():
+        if field.field_info.extra.get("unique", False):
+            keys: List[Tuple[str, Any]] = [(field.alias, pymongo.ASCENDING)]
+            if not any(index.keys == keys for index in indexes):
+                indexes.append(MongoIndex(keys=keys, unique=True))
+    return indexes
+
+
+class IndexRegistry:
+    """
+    holds which model-table is stored in which table,
+    to create their indexes on startup
+    """
+
+    def __init__(self) -> None:
+        self.tables: Dict[str, Type[Any]] = {}
+
+    def register(self, table_name: str, entity: Type[Any]) -> None:
+        self.tables[table_name] = entity
+
+    async def sync(self, database: Any, recreate: bool = settings.DB_INDEX_RECREATE) -> None:
+        """
+        creates missing indexes, can be called multiple times.
+        indexes which are different from their declaration are logged, and with
+        'recreate' dropped and created again (a full index build on large tables),
+        indexes which exists in database, but are not declared, are only logged
+        """
+        for table_name, entity in self.tables.items():
+            collection: Any = database[table_name]
+            try:
+                existing: Dict[str, Dict[str, Any]] = await collection.index_information()
+                declared: List[MongoIndex] = modelIndexes(entity)
+                for index in declared:
+                    name: str = index.index_name()
+                    info: Optional[Dict[str, Any]] = existing.get(name)
+                    if info is None:
+                        logging.log(verboselogs.NOTICE, f"index missing, create:: {table_name}.{name}")
+                        await collection.create_index(index.keys, **index.options())
+                    elif not index.matches(info):
+                        logging.log(
+                            logging.WARNING,
+                            f"index different from declaration, {'recreate' if recreate else 'kept'}:: "
+                            f"{table_name}.{name} ({info}), declared ({index.options()})",
+                        )
+                        if recreate:
+                            await collection.drop_index(name)
+                            await collection.create_index(index.keys, **index.options())
+                declared_names: List[str] = [index.index_name() for index in declared]
+                for name in existing.keys():
+                    if name != "_id_" and name not in declared_names:
+                        logging.log(logging.INFO, f"index not declared:: {table_name}.{name}")
+
+            except pymongo.errors.OperationFailure as e:
+                # e.g. an unique index on a table with duplicates
+                logging.log(logging.CRITICAL, f"index sync failed for '{table_name}':: {e}")
+
+
+indexRegistry: IndexRegistry = IndexRegistry()
@@ -0,0 +1,294 @@
+"""
+    pymongo event listeners, to export metrics
+    about the database clients in 'metricsRegistry'
+    Use: 'poolMetrics' and 'commandMetrics' as 'event_listeners' of a client
+"""
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Mapping, Tuple, Union
+
+from pymongo import monitoring
+
+from app.utils.config import settings
+from app.utils.metricsHelper import LatencyHistogram, metricsRegistry
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """
+    collects connection pool metrics per server address:
+        - open and checked out connections
+        - wait queue depth (check outs started, but not yet completed)
+        - check out latency and check out failures (e.g. wait queue timeout)
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.pools: Dict[str, Dict[str, int]] = {}
+        self.checkout_latency: LatencyHistogram = LatencyHistogram()
+        # check out start times, a check out runs complete in one thread
+        self.local = threading.local()
+
+    def _pool(self, address: Any) -> Dict[str, int]:
+        key: str = f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
+        pool: Union[Dict[str, int], None] = self.pools.get(key)
+        if pool is None:
+            pool = {
+                "open": 0,
+                "checked_out": 0,
+                "wait_queue": 0,
+                "checkout_failed": 0,
+                "cleared": 0,
+            }
+            self.pools[key] = pool
+        return pool
+
+    def _add(self, address: Any, name: str, value: int) -> None:
+        with self.lock:
+            self._pool(address)[name] += value
+
+    # --------------------------------------------------------------------------
+    #
+    # pool events
+    #
+    # --------------------------------------------------------------------------
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        self._add(event.address, "open", 0)
+
+    def pool_ready(self, event: Any) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        self._add(event.address, "cleared", 1)
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        with self.lock:
+            self._pool(event.address)["open"] = 0
+
+    # --------------------------------------------------------------------------
+    #
+    # connection events
+    #
+    # --------------------------------------------------------------------------
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        self._add(event.address, "open", 1)
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        self._add(event.address, "open", -1)
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        started: Union[List[float], None] = getattr(self.local, "started", None)
+        if started is None:
+            started = []
+            self.local.started = started
+        started.append(time.perf_counter())
+        self._add(event.address, "wait_queue", 1)
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        self._checkout_done()
+        with self.lock:
+            pool: Dict[str, int] = self._pool(event.address)
+            pool["wait_queue"] -= 1
+            pool["checkout_failed"] += 1
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        started: float = self._checkout_done()
+        # newer drivers measure the duration them self (in seconds)
+        duration: Any = getattr(event, "duration", None)
+        if duration is not None:
+            self.checkout_latency.observe(duration * 1000)
+        elif started > 0:
+            self.checkout_latency.observe((time.perf_counter() - started) * 1000)
+        with self.lock:
+            pool: Dict[str, int] = self._pool(event.address)
+            pool["wait_queue"] -= 1
+            pool["checked_out"] += 1
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        self._add(event.address, "checked_out", -1)
+
+    def _checkout_done(self) -> float:
+        started: Union[List[float], None] = getattr(self.local, "started", None)
+        return started.pop() if started else 0.0
+
+    # --------------------------------------------------------------------------
+    #
+    #
+    #
+    # --------------------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            pools: Dict[str, Dict[str, int]] = {key: dict(pool) for key, pool in self.pools.items()}
+        return {"pools": pools, "checkout_latency": self.checkout_latency.snapshot()}
+
+
+poolMetrics: PoolMetricsListener = PoolMetricsListener()
+metricsRegistry.register("db_pool", poolMetrics.snapshot)
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+# commands without a collection, or which are only noise for the metrics
+IGNORED_COMMANDS: Tuple[str, ...] = ("hello", "ismaster", "isMaster", "ping", "buildinfo", "buildInfo", "endSessions")
+
+
+def redact(value: Any) -> Any:
+    """
+    shape of a filter, field names and operators are kept,
+    all values are replaced with '?'
+    """
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        if len(value) > 0 and all(isinstance(item, dict) for item in value):
+            return [redact(item) for item in value]
+        return "?"
+    return "?"
+
+
+def command_filter(command_name: str, command: Mapping[str, Any]) -> Any:
+    """
+    the filter of a command, if it has one
+    """
+    if command_name in ("find", "count", "distinct"):
+        return command.get("filter", command.get("query"))
+    if command_name == "findAndModify":
+        return command.get("query")
+    if command_name in ("delete", "update"):
+        statements: List[Dict[str, Any]] = command.get(command_name + "s") or []
+        return statements[0].get("q") if len(statements) > 0 else None
+    if command_name == "aggregate":
+        pipeline: List[Dict[str, Any]] = command.get("pipeline") or []
+        return pipeline[0].get("$match") if len(pipeline) > 0 else None
+    return None
+
+
+def returned_docs(command_name: str, reply: Mapping[str, Any]) -> int:
+    """
+    count of documents returned by a command reply
+    """
+    cursor: Any = reply.get("cursor")
+    if isinstance(cursor, dict):
+        return len(cursor.get("firstBatch") or cursor.get("nextBatch") or [])
+    if command_name == "findAndModify":
+        return 1 if reply.get("value") is not None else 0
+    return 0
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    """
+    collects metrics per command and collection:
+        - latency histogram
+        - documents returned and failures
+    and logs commands slower than 'DB_SLOW_QUERY_MS' with the
+    shape of their filter (values are redacted)
+    """
+
+    def __init__(self, slow_query_ms: float) -> None:
+        self.slow_query_ms: float = slow_query_ms
+        self.lock = threading.Lock()
+        self.commands: Dict[str, Dict[str, Any]] = {}
+        # (connection, request id) => (collection, filter shape) of started commands
+        self.in_flight: Dict[Tuple[Any, int], Tuple[str, Any]] = {}
+
+    def _command(self, command_name: str, collection: str) -> Dict[str, Any]:
+        key: str = f"{command_name}:{collection}"
+        command: Union[Dict[str, Any], None] = self.commands.get(key)
+        if command is None:
+            command = {"latency": LatencyHistogram(), "docs_returned": 0, "failures": 0, "slow": 0}
+            self.commands[key] = command
+        return command
+
+    def _finish(self, event: Any) -> Tuple[str, Any, float]:
+        with self.lock:
+            collection, shape = self.in_flight.pop((event.connection_id, event.request_id), ("", None))
+        return collection, shape, event.duration_micros / 1000
+
+    def _log_slow(self, event: Any, collection: str, shape: Any, duration_ms: float, failed: bool) -> bool:
+        if self.slow_query_ms <= 0 or duration_ms < self.slow_query_ms:
+            return False
+        logging.log(
+            logging.WARNING,
+            f"slow query: {event.command_name} on '{collection}' took {duration_ms:.1f} ms"
+            f"{' (failed)' if failed else ''}, filter => {shape}",
+        )
+        return True
+
+    # --------------------------------------------------------------------------
+    #
+    # command events
+    #
+    # --------------------------------------------------------------------------
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        collection: Any = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            collection = event.command.get("collection")
+        shape: Any = None
+        if self.slow_query_ms > 0:
+            filter: Any = command_filter(event.command_name, event.command)
+            shape = redact(filter) if filter is not None else None
+        with self.lock:
+            self.in_flight[(event.connection_id, event.request_id)] = (
+                collection if isinstance(collection, str) else "", shape
+            )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        collection, shape, duration_ms = self._finish(event)
+        is_slow: bool = self._log_slow(event, collection, shape, duration_ms, False)
+        docs: int = returned_docs(event.command_name, event.reply)
+        with self.lock:
+            command: Dict[str, Any] = self._command(event.command_name, collection)
+            command["docs_returned"] += docs
+            command["slow"] += 1 if is_slow else 0
+        command["latency"].observe(duration_ms)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        collection, shape, duration_ms = self._finish(event)
+        is_slow: bool = self._log_slow(event, collection, shape, duration_ms, True)
+        with self.lock:
+            command: Dict[str, Any] = self._command(event.command_name, collection)
+            command["failures"] += 1
+            command["slow"] += 1 if is_slow else 0
+        command["latency"].observe(duration_ms)
+
+    # --------------------------------------------------------------------------
+    #
+    #
+    #
+    # --------------------------------------------------------------------------
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            commands: List[Tuple[str, Dict[str, Any]]] = list(self.commands.items())
+        return {
+            "slow_query_ms": self.slow_query_ms,
+            "commands": {
+                key: {
+                    "docs_returned": command["docs_returned"],
+                    "failures": command["failures"],
+                    "slow": command["slow"],
+                    "latency": command["latency"].snapshot(),
+                }
+                for key, command in commands
+            },
+        }
+
+
+commandMetrics: CommandMetricsListener = CommandMetricsListener(slow_query_ms=settings.DB_SLOW_QUERY_MS)
+metricsRegistry.register("db_commands", commandMetrics.snapshot)
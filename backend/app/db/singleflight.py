@@ -0,0 +1,103 @@
+"""
+    request coalescing for identical reads
+    concurrent calls with the same key share one in flight query,
+    all waiters get its result (a copy each).
+    the query runs as its own task, a cancelled caller (e.g. a client
+    disconnect) only stops waiting, the others still get the result.
+    nothing is cached, the next call after completion queries again.
+    the stats are kept per query shape (table and filter without values),
+    so no filter value (e.g. an username) is part of the metrics.
+    Use: 'AsyncDBConnection.find_one(..., coalesce=True)'
+"""
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple, Union
+
+from app.db.mongoMonitor import redact
+from app.utils.config import settings
+from app.utils.metricsHelper import metricsRegistry
+
+# keys with the most shared calls in the metrics
+TOP_KEYS: int = 20
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class Singleflight:
+    """
+    one in flight call per key, with waiter stats per name
+    of the key (bounded LRU)
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys: int = max_keys
+        self.in_flight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        # name => {"name", "calls", "shared", "max_waiters"}
+        self.keys: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.waiters: Dict[Hashable, int] = {}
+        self.stats: Dict[str, int] = {"calls": 0, "queries": 0, "shared": 0}
+
+    def _key_stats(self, name: str) -> Dict[str, Any]:
+        stats: Union[Dict[str, Any], None] = self.keys.get(name)
+        if stats is None:
+            stats = {"name": name, "calls": 0, "shared": 0, "max_waiters": 0}
+            self.keys[name] = stats
+            while len(self.keys) > self.max_keys:
+                self.keys.popitem(last=False)
+        self.keys.move_to_end(name)
+        return stats
+
+    async def do(self, key: Hashable, name: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        runs 'func', or waits for the running one of the same key
+        'name' is the name of the key in the stats, without values (see 'keyName')
+        """
+        self.stats["calls"] += 1
+        key_stats: Dict[str, Any] = self._key_stats(name)
+        key_stats["calls"] += 1
+        task: Any = self.in_flight.get(key)
+        if task is not None:
+            self.stats["shared"] += 1
+            key_stats["shared"] += 1
+            self.waiters[key] += 1
+            key_stats["max_waiters"] = max(key_stats["max_waiters"], self.waiters[key])
+            result: Any = await asyncio.shield(task)
+            return result.copy() if result is not None else None
+
+        self.stats["queries"] += 1
+        task = asyncio.ensure_future(func())
+        self.in_flight[key] = task
+        self.waiters[key] = 0
+        task.add_done_callback(lambda done: self._done(key, done))
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        del self.in_flight[key]
+        del self.waiters[key]
+        # mark as retrieved, if there is no caller left
+        if not task.cancelled():
+            task.exception()
+
+    def snapshot(self) -> Dict[str, Any]:
+        top: List[Tuple[str, Dict[str, Any]]] = sorted(
+            self.keys.items(), key=lambda item: item[1]["shared"], reverse=True
+        )[:TOP_KEYS]
+        return {
+            "in_flight": len(self.in_flight),
+            **self.stats,
+            "keys": [dict(stats) for _, stats in top if stats["shared"] > 0],
+        }
+
+
+def keyName(table_name: str, filter: Dict[str, Any]) -> str:
+    """
+    name of a key for the stats: table and filter shape, without the values
+    """
+    return f"{table_name}:{redact(filter)}"
+
+
+singleflight: Singleflight = Singleflight(max_keys=settings.DB_SINGLEFLIGHT_MAX_KEYS)
+metricsRegistry.register("db_singleflight", singleflight.snapshot)
@@ -0,0 +1,99 @@
+"""
+    write-behind buffer for frequent and not critical field stamps
+    (like 'lastLogin'), stamps are coalesced per id and
+    written with one 'bulk_update', by the scheduler every
+    'DB_WRITE_BEHIND_INTERVAL_MS' or when 'DB_WRITE_BEHIND_MAX_ENTRIES' are pending.
+    only used on the event loop, the state is changed between awaits, so
+    it needs no lock.
+    Use: 'flushWriteBehind' to flush all buffers (scheduler, shutdown)
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Union
+
+from app.db.backend import BulkUpdate
+from app.db.mongoDb import PyObjectId
+from app.db.mongoDbAsync import AsyncDBConnection
+from app.utils.config import settings
+from app.utils.metricsHelper import metricsRegistry
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class WriteBehindBuffer:
+    """
+    coalesces stamps of one field per id,
+    the newest value wins, written with '$max'
+    so a late flush never sets an older value
+    """
+
+    def __init__(
+        self, name: str, table_name: str, field: str, max_entries: int = settings.DB_WRITE_BEHIND_MAX_ENTRIES
+    ) -> None:
+        self.name: str = name
+        self.table_name: str = table_name
+        self.field: str = field
+        self.max_entries: int = max_entries
+        self.pending: Dict[PyObjectId, Any] = {}
+        self.flush_task: Union["asyncio.Task[int]", None] = None
+        self.stats: Dict[str, int] = {"stamped": 0, "written": 0, "flushes": 0, "failures": 0}
+        writeBehindBuffers.append(self)
+        metricsRegistry.register(f"write_behind_{name}", self.snapshot)
+
+    def stamp(self, id: PyObjectId, value: Any) -> None:
+        """
+        buffers a stamp for the id, flushes early when the buffer is full
+        """
+        self.merge(id, value)
+        self.stats["stamped"] += 1
+        if len(self.pending) >= self.max_entries and (self.flush_task is None or self.flush_task.done()):
+            self.flush_task = asyncio.get_running_loop().create_task(self.flush())
+
+    def merge(self, id: PyObjectId, value: Any) -> None:
+        current: Any = self.pending.get(id)
+        if current is None or value > current:
+            self.pending[id] = value
+
+    async def flush(self) -> int:
+        """
+        writes all pending stamps in one 'bulk_update'
+        failed stamps are put back, to be written with the next flush
+        """
+        # stamps of the next flush are buffered while this one is written
+        pending: Dict[PyObjectId, Any] = self.pending
+        self.pending = {}
+        if len(pending) == 0:
+            return 0
+        try:
+            await AsyncDBConnection.bulk_update(
+                [BulkUpdate({"_id": id}, {"$max": {self.field: value}}) for id, value in pending.items()],
+                table_name=self.table_name,
+                ids=list(pending.keys()),
+            )
+            self.stats["written"] += len(pending)
+            self.stats["flushes"] += 1
+            return len(pending)
+
+        except Exception as e:
+            logging.log(logging.CRITICAL, e, exc_info=True)
+            self.stats["failures"] += 1
+            for id, value in pending.items():
+                self.merge(id, value)
+        return 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"pending": len(self.pending), **self.stats}
+
+
+writeBehindBuffers: List[WriteBehindBuffer] = []
+
+
+async def flushWriteBehind() -> None:
+    """
+    flushes all write-behind buffers
+    """
+    for buffer in writeBehindBuffers:
+        await buffer.flush()
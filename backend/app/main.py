@@ -14,10 +14,22 @@ import uvicorn
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI
 
-from app.db.mongoDb import DBConnection
+import app.persist.account.services.account as account
+import app.persist.account.services.revocation as revocation
+from app.db.mongoDbAsync import AsyncDBConnection
+from app.db.mongoIndex import indexRegistry
+from app.db.writeBehind import flushWriteBehind
+from app.middleware.auth import documentTokenSecurity
 from app.middleware.corse import middlewareCorse
+from app.middleware.token import middlewareToken
 from app.routes.account import router as accountApi
+from app.routes.jwks import router as jwksApi
+from app.routes.metrics import router as metricsApi
 from app.utils.api.exceptionHandler import InitExceptionHandler
+from app.utils.api.jsonResponse import responseClass
+from app.utils.api.passwordService import passwordService
+from app.utils.api.qrService import qrService
+from app.utils.api.tokenCodec import tokenCodec
 from app.utils.config import settings
 from app.utils.logHelper import LogHelper
 
@@ -55,14 +67,16 @@ def main() -> Union[FastAPI, None]:
     """
     try:
         application.start_up()
-        application.connect_db()
         app = application.application()
+        # handlers and middleware can only be added before the app is started
+        application.handler(app)
+        application.middleware(app)
 
         @app.on_event("startup")
         async def startup():
             logging.log(logging.DEBUG, "STARTUP...")
-            application.handler(app)
-            application.middleware(app)
+            await application.connect_db()
+            application.workers()
             application.api(app)
             application.scheduler()
             logging.log(logging.DEBUG, "...READY")
@@ -70,7 +84,9 @@ def main() -> Union[FastAPI, None]:
         @app.on_event("shutdown")
         async def shutdown():
             logging.log(logging.DEBUG, "SHUTDOWN...")
-            application.scheduler_stop()
+            await application.scheduler_stop()
+            application.disconnect_db()
+            application.workers_stop()
             logging.log(logging.DEBUG, "...BYE")
 
         return app
@@ -102,12 +118,42 @@ class Application:
         logging.log(logging.DEBUG, "init start_up...")
         settings.print()
 
-    def connect_db(self) -> None:
+    async def connect_db(self) -> None:
         """
-            inti database connection
+            inti database connection,
+            async, so it runs on the loop the app is using
+            and create/reconcile the declared indexes
         """
         logging.log(logging.DEBUG, "init connect_db...")
-        DBConnection().get_connection()
+        connection = await AsyncDBConnection.get_connection()
+        logging.log(logging.DEBUG, "init indexes...")
+        await indexRegistry.sync(connection)
+        logging.log(logging.DEBUG, "init token revocations...")
+        await revocation.refreshRevocations()
+
+    def disconnect_db(self) -> None:
+        """
+            close database connection
+        """
+        logging.log(logging.DEBUG, "closing connect_db...")
+        AsyncDBConnection.close()
+
+    def workers(self) -> None:
+        """
+            start worker processes (password hashing)
+            and threads (QR-code rendering)
+        """
+        logging.log(logging.DEBUG, "init workers...")
+        passwordService.start()
+        qrService.start()
+
+    def workers_stop(self) -> None:
+        """
+            stop worker processes
+        """
+        logging.log(logging.DEBUG, "stopping workers...")
+        passwordService.shutdown()
+        qrService.shutdown()
 
 
     # ------------------------------------------------------------------------------
@@ -126,6 +172,8 @@ class Application:
             debug=settings.DEBUG,
             docs_url=f"{settings.API_PREFIX}/docs",
             openapi_url=f"{settings.API_PREFIX}/openapi.json",
+            # faster json encoder, see 'JSON_RESPONSE'
+            default_response_class=responseClass,
         )
 
 
@@ -153,6 +201,8 @@ class Application:
         """
         logging.log(logging.DEBUG, "init middleware...")
         middlewareCorse(app)
+        # extracts and validates the token once per request
+        middlewareToken(app)
 
     def api(self, app: FastAPI) -> None:
         """
@@ -161,6 +211,13 @@ class Application:
         logging.log(logging.DEBUG, "init api...")
         # ACCOUNT: for login and registration
         app.include_router(accountApi, prefix=settings.API_PREFIX, dependencies=[])
+        documentTokenSecurity(app)
+        # JWKS: public keys to verify tokens, only with asymmetric algorithms
+        if not tokenCodec.is_hmac:
+            app.include_router(jwksApi, prefix=settings.API_PREFIX, dependencies=[])
+        # METRICS: internal runtime metrics (db pool, ...)
+        if settings.METRICS_ACTIVE:
+            app.include_router(metricsApi, prefix=settings.API_PREFIX, dependencies=[])
 
 
     # ...: for ... logic
@@ -178,12 +235,33 @@ class Application:
         logging.log(logging.DEBUG, "init scheduler...")
         self.schedule = AsyncIOScheduler()
         # self.schedule.add_job(func=add_here, trigger="interval", seconds=self.scheduleSeconds)
+        self.schedule.add_job(
+            func=flushWriteBehind,
+            trigger="interval",
+            seconds=settings.DB_WRITE_BEHIND_INTERVAL_MS / 1000,
+            id="flushWriteBehind",
+        )
+        self.schedule.add_job(
+            func=revocation.refreshRevocations,
+            trigger="interval",
+            seconds=settings.TOKEN_REVOCATION_REFRESH_SECONDS,
+            id="refreshRevocations",
+        )
+        if settings.ACCOUNT_EXPIRE_SWEEP_SECONDS > 0:
+            self.schedule.add_job(
+                func=account.removeExpiredRegistrations,
+                trigger="interval",
+                seconds=settings.ACCOUNT_EXPIRE_SWEEP_SECONDS,
+                id="removeExpiredRegistrations",
+            )
         self.schedule.start()
 
-    def scheduler_stop(self) -> None:
+    async def scheduler_stop(self) -> None:
         if self.schedule is not None:
             logging.log(logging.DEBUG, "shuting down scheduler...")
             self.schedule.shutdown()
+        # write what is left in the write-behind buffers
+        await flushWriteBehind()
 
 
 application = Application()
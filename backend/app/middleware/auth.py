@@ -2,69 +2,115 @@
     authentication middleware
     checks if a token is present and if the token is valid
     will the forward token user info to next handlers
+    (the token is extracted by 'TokenMiddleware')
 """
 
-from typing import Union
+from typing import Any, Callable, Dict, List, Union
 
-from fastapi import Depends, status
-from fastapi.openapi.models import APIKey
+from fastapi import Depends, FastAPI, Request
+from fastapi.openapi.models import APIKey, APIKeyIn
+from fastapi.security.api_key import APIKeyBase
 
+from app.middleware.token import extractToken, identify
 from app.utils.api.exceptionHandler import UnicornException
-from app.utils.api.responseHelper import ErrorTypeEnum, MsgTypeEnum, ResponseHandlerObject, responseHandler
-from app.utils.api.securityHelper import TokenDataObject, getTokenFromRequest, validateToken
+from app.utils.api.responseCatalog import ACCESS_FAILED_401, TOKEN_EMPTY_401, TOKEN_WRONG_401
+from app.utils.api.securityHelper import TokenDataObject
 from app.utils.config import settings
 
+
 # ------------------------------------------------------------------------------
 #
 #
 #
 # ------------------------------------------------------------------------------
-# security = HTTPBearer()   # :HTTPBasicCredentials
-security = getTokenFromRequest  # :APIKey
+class StateAPIKey(APIKeyBase):
+    """
+    one security dependency for header, query and cookie,
+    reads the token 'TokenMiddleware' has set in 'request.state'
+    OpenAPI shows it as header, 'documentTokenSecurity' adds query and cookie
+    """
+
+    def __init__(self, name: str) -> None:
+        self.model: APIKey = APIKey.parse_obj({"in": APIKeyIn.header, "name": name})
+        self.scheme_name: str = "APIKeyHeader"
+
+    async def __call__(self, request: Request) -> Union[str, None]:
+        state: Dict[str, Any] = request.scope.setdefault("state", {})
+        if "token" not in state:
+            # without 'TokenMiddleware'
+            state["token"] = extractToken(request.scope)
+        token: Union[str, None] = state["token"]
+        return token
+
+
+def documentTokenSecurity(app: FastAPI) -> None:
+    """
+    adds query and cookie as alternatives to the header
+    api key in OpenAPI, like three separate dependencies would
+    """
+    openapi: Callable[[], Dict[str, Any]] = app.openapi
+
+    def openapiWithTokenSecurity() -> Dict[str, Any]:
+        if app.openapi_schema is not None:
+            return app.openapi_schema
+        schema: Dict[str, Any] = openapi()
+        schemes: Dict[str, Any] = schema.setdefault("components", {}).setdefault("securitySchemes", {})
+        if "APIKeyHeader" in schemes:
+            schemes["APIKeyQuery"] = {"type": "apiKey", "in": "query", "name": settings.TOKEN_API_NAME}
+            schemes["APIKeyCookie"] = {"type": "apiKey", "in": "cookie", "name": settings.TOKEN_API_NAME}
+            for path in schema.get("paths", {}).values():
+                for operation in path.values():
+                    security: List[Dict[str, Any]] = operation.get("security", [])
+                    if {"APIKeyHeader": []} in security:
+                        security.extend([{"APIKeyQuery": []}, {"APIKeyCookie": []}])
+        app.openapi_schema = schema
+        return schema
+
+    app.openapi = openapiWithTokenSecurity  # type: ignore
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+security = StateAPIKey(name=settings.TOKEN_API_NAME)  # :APIKey
 
 
-# security = oauth2_scheme    # :...
 async def middlewareAuth(
-    token: Union[APIKey, None] = Depends(security)
+    request: Request, token: Union[str, None] = Depends(security)
 ) -> TokenDataObject:
     if token is None:
-        resp = responseHandler(
-            [
-                ResponseHandlerObject(
-                    msgType=MsgTypeEnum.ERROR,
-                    errorType=ErrorTypeEnum.TOKEN_ACCESS_DENIED_EMPTY,
-                ),
-                ResponseHandlerObject(
-                    msgType=MsgTypeEnum.STATE, errorType=ErrorTypeEnum.ACCESS_DECLINE
-                ),
-            ],
-            status.HTTP_401_UNAUTHORIZED,
-        )
         raise UnicornException(
-            status_code=resp.httpCode,
-            detail=resp.msg,
+            status_code=TOKEN_EMPTY_401.httpCode,
+            detail=TOKEN_EMPTY_401.msg,
             headers={settings.TOKEN_API_NAME: "***"},
+            body=TOKEN_EMPTY_401.body,
         )
 
-    # validate token
-    user = validateToken(token.name)
+    # validated and not revoked (token or user)
+    user: Union[TokenDataObject, None] = identify(token)
+    request.state.user = user
     if user is None:
-        resp = responseHandler(
-            [
-                ResponseHandlerObject(
-                    msgType=MsgTypeEnum.ERROR,
-                    errorType=ErrorTypeEnum.TOKEN_ACCESS_DENIED_WRONG,
-                ),
-                ResponseHandlerObject(
-                    msgType=MsgTypeEnum.STATE, errorType=ErrorTypeEnum.ACCESS_DECLINE
-                ),
-            ],
-            status.HTTP_401_UNAUTHORIZED,
-        )
         raise UnicornException(
-            status_code=resp.httpCode,
-            detail=resp.msg,
+            status_code=TOKEN_WRONG_401.httpCode,
+            detail=TOKEN_WRONG_401.msg,
             headers={settings.TOKEN_API_NAME: "***"},
+            body=TOKEN_WRONG_401.body,
         )
 
     return user
+
+
+async def middlewareAdmin(user: TokenDataObject = Depends(middlewareAuth)) -> TokenDataObject:
+    """
+    only for tokens of admins, for internal api's
+    """
+    if not user.isAdmin:
+        raise UnicornException(
+            status_code=ACCESS_FAILED_401.httpCode,
+            detail=ACCESS_FAILED_401.msg,
+            headers={},
+            body=ACCESS_FAILED_401.body,
+        )
+    return user
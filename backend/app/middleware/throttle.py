@@ -0,0 +1,86 @@
+"""
+    login throttling
+    limits login attempts per username and per client ip,
+    throttled requests are answered with 429 before the
+    database lookup and the password verification.
+    every attempt takes a token, also a successful login
+    (the password is verified either way), so the burst
+    has to allow some logins of an user in a row
+"""
+
+import ipaddress
+import math
+from typing import List, Union
+
+from fastapi import Request
+
+from app.persist.account.schemas.request import RequestLoginSchema
+from app.utils.api.exceptionHandler import UnicornException
+from app.utils.api.rateLimiter import TokenBucketLimiter
+from app.utils.api.responseCatalog import TOO_MANY_REQUESTS_429
+from app.utils.config import settings
+from app.utils.metricsHelper import metricsRegistry
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+loginUserLimiter: TokenBucketLimiter = TokenBucketLimiter(
+    name="login_user",
+    rate_per_minute=settings.LOGIN_THROTTLE_USER_PER_MINUTE,
+    burst=settings.LOGIN_THROTTLE_USER_BURST,
+    max_keys=settings.LOGIN_THROTTLE_MAX_KEYS,
+)
+loginIpLimiter: TokenBucketLimiter = TokenBucketLimiter(
+    name="login_ip",
+    rate_per_minute=settings.LOGIN_THROTTLE_IP_PER_MINUTE,
+    burst=settings.LOGIN_THROTTLE_IP_BURST,
+    max_keys=settings.LOGIN_THROTTLE_MAX_KEYS,
+)
+metricsRegistry.register(loginUserLimiter.name, loginUserLimiter.snapshot)
+metricsRegistry.register(loginIpLimiter.name, loginIpLimiter.snapshot)
+
+
+TRUSTED_PROXIES: List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]] = [
+    ipaddress.ip_network(proxy, strict=False) for proxy in settings.TRUSTED_PROXIES
+]
+
+
+def isTrustedProxy(host: Union[str, None]) -> bool:
+    if host is None or len(TRUSTED_PROXIES) == 0:
+        return False
+    try:
+        address: Union[ipaddress.IPv4Address, ipaddress.IPv6Address] = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in TRUSTED_PROXIES)
+
+
+def clientIp(request: Request) -> str:
+    """
+    the client ip, 'X-Real-IP' (set by nginx) is only used
+    when the request comes from one of 'TRUSTED_PROXIES'
+    """
+    host: Union[str, None] = request.client.host if request.client is not None else None
+    if isTrustedProxy(host):
+        ip: Union[str, None] = request.headers.get("x-real-ip")
+        if ip is not None:
+            return ip
+    return host or "unknown"
+
+
+async def middlewareLoginThrottle(request: Request, items: RequestLoginSchema) -> None:
+    if not settings.LOGIN_THROTTLE_ACTIVE:
+        return
+    retry_after: float = max(
+        loginIpLimiter.acquire(clientIp(request)),
+        loginUserLimiter.acquire(items.username.lower()),
+    )
+    if retry_after > 0:
+        raise UnicornException(
+            status_code=TOO_MANY_REQUESTS_429.httpCode,
+            detail=TOO_MANY_REQUESTS_429.msg,
+            headers={"Retry-After": str(math.ceil(retry_after))},
+            body=TOO_MANY_REQUESTS_429.body,
+        )
@@ -0,0 +1,78 @@
+"""
+    token middleware (ASGI)
+    extracts the token from header, query or cookie (named 'TOKEN_API_NAME')
+    in one pass over the raw scope and sets for the handlers:
+        - 'request.state.token': the token or None
+    the token is only validated by 'middlewareAuth' ('identify'), so only on
+    protected routes, it sets 'request.state.user'
+"""
+
+from typing import Any, Awaitable, Callable, Iterable, MutableMapping, Tuple, Union
+from urllib.parse import parse_qsl
+
+from fastapi import FastAPI
+
+import app.persist.account.services.revocation as revocation
+from app.utils.api.securityHelper import TokenDataObject
+from app.utils.api.tokenCache import validateTokenCached
+from app.utils.config import settings
+
+TOKEN_NAME: str = settings.TOKEN_API_NAME
+TOKEN_HEADER: bytes = TOKEN_NAME.lower().encode("latin-1")
+TOKEN_NAME_BYTES: bytes = TOKEN_NAME.encode("latin-1")
+
+
+def extractToken(scope: MutableMapping[str, Any]) -> Union[str, None]:
+    """
+    the token from header, query or cookie (in this order)
+    """
+    cookie: Union[bytes, None] = None
+    headers: Iterable[Tuple[bytes, bytes]] = scope.get("headers", ())
+    for name, header in headers:
+        if name == TOKEN_HEADER:
+            return header.decode("latin-1")
+        if name == b"cookie":
+            cookie = header
+    query: bytes = scope.get("query_string", b"")
+    if TOKEN_NAME_BYTES in query:
+        for key, value in parse_qsl(query.decode("latin-1")):
+            if key == TOKEN_NAME:
+                return value
+    if cookie is not None and TOKEN_NAME_BYTES in cookie:
+        for item in cookie.decode("latin-1").split(";"):
+            key, _, value = item.strip().partition("=")
+            if key == TOKEN_NAME:
+                return value
+    return None
+
+
+def identify(token: Union[str, None]) -> Union[TokenDataObject, None]:
+    """
+    the user of a valid and not revoked token
+    """
+    if token is None:
+        return None
+    user: Union[TokenDataObject, None] = validateTokenCached(token)
+    if user is None or revocation.isRevoked(user):
+        return None
+    return user
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class TokenMiddleware:
+
+    def __init__(self, app: Callable[..., Awaitable[None]]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: MutableMapping[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["token"] = extractToken(scope)
+        await self.app(scope, receive, send)
+
+
+def middlewareToken(app: FastAPI) -> None:
+    app.add_middleware(TokenMiddleware)
@@ -0,0 +1,30 @@
+from datetime import datetime
+from typing import ClassVar, List
+
+import pymongo
+from pydantic.fields import Field
+
+from app.db.mongoDb import MongoModel
+from app.db.mongoIndex import MongoIndex
+from app.utils.config import settings
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class RefreshTokenEntity(MongoModel):
+    # a refresh is one lookup on 'digest', expired refresh tokens are removed by mongoDB at 'expireAt' (UTC)
+    indexes: ClassVar[List[MongoIndex]] = [
+        MongoIndex(keys=[("userId", pymongo.ASCENDING)]),
+    ] + ([
+        MongoIndex(keys=[("expireAt", pymongo.ASCENDING)], expireAfterSeconds=0),
+    ] if settings.DB_TTL_INDEXES else [])
+
+    # SHA-256 of the refresh token, the token itself is not stored
+    digest: str = Field(unique=True)
+    userId: str = Field()
+    username: str = Field()
+    expireAt: datetime = Field()  # in UTC
+    created: datetime = Field()  # in UTC
@@ -0,0 +1,40 @@
+from datetime import datetime
+from enum import Enum
+from typing import ClassVar, List
+
+import pymongo
+from pydantic.fields import Field
+
+from app.db.mongoDb import MongoModel
+from app.db.mongoIndex import MongoIndex
+from app.utils.config import settings
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class RevocationKindEnum(str, Enum):
+    TOKEN = "TOKEN"  # value is the 'jti' of one token
+    USER = "USER"  # value is the user id, all tokens of the user
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class RevocationEntity(MongoModel):
+    # 'created' to load new revocations incremental, revocations are removed
+    # by mongoDB at 'expireAt' (UTC), when all revoked tokens are expired anyway
+    indexes: ClassVar[List[MongoIndex]] = [
+        MongoIndex(keys=[("created", pymongo.ASCENDING)]),
+    ] + ([
+        MongoIndex(keys=[("expireAt", pymongo.ASCENDING)], expireAfterSeconds=0),
+    ] if settings.DB_TTL_INDEXES else [])
+
+    kind: RevocationKindEnum = Field()
+    value: str = Field()
+    expireAt: datetime = Field()  # in UTC
+    created: datetime = Field()  # in UTC
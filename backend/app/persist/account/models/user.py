@@ -1,11 +1,14 @@
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import ClassVar, List, Optional
 
+import pymongo
 from pydantic.fields import Field
 from pydantic.networks import EmailStr
 
 from app.db.mongoDb import MongoModel
+from app.db.mongoIndex import MongoIndex
+from app.utils.config import settings
 
 
 # ------------------------------------------------------------------------------
@@ -26,15 +29,25 @@ class UserStatusEnum(str, Enum):
 #
 # ------------------------------------------------------------------------------
 class UserEntity(MongoModel):
+    # registrations which are not activated until 'accountExpireDate' (UTC) are removed by mongoDB
+    indexes: ClassVar[List[MongoIndex]] = [
+        MongoIndex(
+            keys=[("accountExpireDate", pymongo.ASCENDING)],
+            expireAfterSeconds=0,
+            partialFilterExpression={"status": UserStatusEnum.NEW.value},
+        )
+    ] if settings.DB_TTL_INDEXES else []
+
     name: str = Field()
     surname: str = Field()
+    # unique index, created on startup by 'indexRegistry'
     username: str = Field(unique=True)
     password: str = Field()
     email: EmailStr = Field()
     token: Optional[str] = Field(default=None)
     totpToken: Optional[str] = Field()
-    accountExpireDate: Optional[datetime] = Field()
+    accountExpireDate: Optional[datetime] = Field()  # in UTC
     status: UserStatusEnum = Field()
-    created: datetime = Field(default=datetime.now())
-    lastLogin: datetime = Field(default=datetime.now())
+    created: datetime = Field(default_factory=datetime.utcnow)  # in UTC
+    lastLogin: datetime = Field(default_factory=datetime.utcnow)  # in UTC
     isAdmin: bool = Field(default=False)
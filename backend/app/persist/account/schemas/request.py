@@ -49,3 +49,15 @@ class RequestLoginSchema(BaseModel):
                 "username": "john_doo", "password": "mySecretPw", "authCode": "******"
             }
         }
+
+
+class RequestRefreshSchema(BaseModel):
+    """
+    handles attributes to send on request
+    """
+    refreshToken: str
+
+    class Config:
+        schema_extra = {
+            "example": {"refreshToken": "******"}
+        }
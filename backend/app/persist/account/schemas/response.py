@@ -24,6 +24,7 @@ class ResponseLoginResultSchema(BaseModel):
     lastName: Optional[str]
     email: Optional[str]
     token: Optional[str]
+    refreshToken: Optional[str]
 
 
 class ResponseLoginSchema(ResponseSchema):
@@ -33,6 +34,26 @@ class ResponseLoginSchema(ResponseSchema):
     RESULT: Optional[ResponseLoginResultSchema] = None
 
 
+# ------------------------------------------------------------------------------
+#
+# REFRESH schema
+#
+# ------------------------------------------------------------------------------
+class ResponseRefreshResultSchema(BaseModel):
+    """
+    handles response attributes on refresh
+    """
+    token: Optional[str]
+    refreshToken: Optional[str]
+
+
+class ResponseRefreshSchema(ResponseSchema):
+    """
+    extends the base response schema for refresh attributes
+    """
+    RESULT: Optional[ResponseRefreshResultSchema] = None
+
+
 
 
 # ------------------------------------------------------------------------------
@@ -1,16 +1,50 @@
+import asyncio
+import hashlib
 import logging
+import secrets
 from datetime import datetime, timedelta
-from typing import Union
+from typing import Any, Dict, Set, Tuple, Union
 
+import pyotp
 import verboselogs
 from bson.objectid import ObjectId
 from pydantic.networks import EmailStr
+from pymongo.errors import DuplicateKeyError
 
-from app.db.mongoDb import DBConnection
+import app.persist.account.services.revocation as revocation
+from app.db.mongoCache import entityCache
+from app.db.mongoDb import PyObjectId
+from app.db.mongoDbAsync import AsyncDBConnection
+from app.db.mongoIndex import indexRegistry
+from app.db.writeBehind import WriteBehindBuffer
+from app.persist.account.models.refreshToken import RefreshTokenEntity
 from app.persist.account.models.user import UserEntity, UserStatusEnum
-from app.persist.account.schemas.request import RequestLoginSchema, RequestRegistrationSchema
-from app.persist.account.schemas.response import ResponseLoginResultSchema, ResponseRegistrationResultSchema
-from app.utils.api.helper import createQrCode, validateEmail
+from app.persist.account.schemas.request import RequestLoginSchema, RequestRefreshSchema, RequestRegistrationSchema
+from app.persist.account.schemas.response import (
+    ResponseLoginResultSchema,
+    ResponseRefreshResultSchema,
+    ResponseRegistrationResultSchema,
+)
+from app.utils.api.helper import validateEmail
+from app.utils.api.passwordService import PasswordServiceBusy, passwordService
+from app.utils.api.qrService import qrService
+from app.utils.api.responseCatalog import (
+    ACCESS_FAILED_401,
+    ACCOUNT_NOT_ACTIVE_401,
+    EMAIL_INVALID_400,
+    LOGIN_MISSING_400,
+    REFRESH_MISSING_400,
+    REGISTRATION_MISSING_400,
+    SERVICE_BUSY_503,
+    TOKEN_CREATE_FAILED_400,
+    TOKEN_MISSING_ATTRIBUTES_400,
+    TOKEN_SAVING_FAILED_400,
+    TOTP_DECLINE_401,
+    USERNAME_TAKEN_400,
+    USER_LOGGED_OUT_200,
+    USER_REMOVED_200,
+    USER_SAVING_FAILED_400,
+)
 from app.utils.api.responseHelper import (
     ErrorTypeEnum,
     MsgTypeEnum,
@@ -22,10 +56,9 @@ from app.utils.api.securityHelper import (
     TokenDataObject,
     TokenObject,
     create_access_token,
-    get_password_hash,
+    password_needs_update,
     totpCreate,
     totpVerify,
-    verify_password,
 )
 from app.utils.config import settings
 
@@ -35,7 +68,30 @@ from app.utils.config import settings
 #
 # ------------------------------------------------------------------------------
 DB_TABLE: str = "account"
-conn: DBConnection = DBConnection()
+conn: AsyncDBConnection = AsyncDBConnection()
+indexRegistry.register(DB_TABLE, UserEntity)
+DB_TABLE_REFRESH: str = "refresh_token"
+indexRegistry.register(DB_TABLE_REFRESH, RefreshTokenEntity)
+entityCache.enable(UserEntity, ttl_seconds=settings.DB_CACHE_USER_TTL_SECONDS)
+# only fetch what is needed, the documents are written by this app,
+# so they are decoded 'trusted' (without validation)
+USER_ID_PROJECTION: Dict[str, Any] = {"_id": 1}
+USER_STATUS_PROJECTION: Dict[str, Any] = {"_id": 1, "username": 1, "status": 1, "isAdmin": 1}
+USER_LOGIN_PROJECTION: Dict[str, Any] = {
+    "name": 1,
+    "surname": 1,
+    "username": 1,
+    "password": 1,
+    "email": 1,
+    "token": 1,
+    "totpToken": 1,
+    "accountExpireDate": 1,
+    "status": 1,
+    "isAdmin": 1,
+}
+lastLoginBuffer: WriteBehindBuffer = WriteBehindBuffer(name="last_login", table_name=DB_TABLE, field="lastLogin")
+# running rehash tasks, hold to not be garbage collected
+rehashTasks: Set["asyncio.Task[None]"] = set()
 
 
 # ------------------------------------------------------------------------------
@@ -60,154 +116,123 @@ async def registration(
             email is not None
         ):
             if validateEmail(email):
-                # search for user by existing username, if exist the user should try with other username
-                user: Union[UserEntity, None] = conn.find_one(
-                    filter={"username": username},
-                    entity=UserEntity,
-                    table_name=DB_TABLE,
-                )
-                # if the username is free start creating the user
-                if user is None:
-                    # create the 2FA credentials
-                    secret = totpCreate() if settings.TOTP_ACTIVE else None
-                    expireDate = (
-                        datetime.now() +
-                        timedelta(
-                            minutes=settings.ACCOUNT_REGISTER_EXPIRE_MINUTES
-                        )  # here defined in minutes
-                    ).timestamp(
-                    )
+                # known usernames are rejected by the indexed lookup, before the costly hashing,
+                # concurrent registrations of the same username share one query
+                if await isUsernameTaken(username):
+                    return usernameTaken(username)
 
-                    password_hast_tmp = get_password_hash(password)
-
-                    if password_hast_tmp is not None:
-                        # create and save the user
-                        user = UserEntity(
-                            name=name,
-                            surname=surname,
-                            username=username,
-                            password=password_hast_tmp,
-                            totpToken=secret.secret if secret is not None and
-                            settings.TOTP_ACTIVE else None,
-                            accountExpireDate=datetime.fromtimestamp(expireDate),
-                            email=email,
-                            status=UserStatusEnum.NEW,
-                        )
-                        conn.insert_one(obj=user, table_name=DB_TABLE)
-                    # if user is created/saved, create the qrcode for the user
-                    # for the 2FA
-                    if user is not None:
-                        try:
-                            created_token: Union[
-                                TokenObject, None
-                            ] = create_access_token(
-                                data=TokenDataObject(
-                                    id=str(user.id),
-                                    username=user.username,
-                                    isAdmin=False,
-                                )
-                            )
-                            if created_token is not None:
-                                user.token = created_token.access_token
-                        except Exception as e:
-                            logging.log(logging.CRITICAL, e, exc_info=True)
-                        if user.token is not None:
-                            otp_auth_url: Union[str, None] = (
-                                secret.provisioning_uri(
-                                    name=username, issuer_name=settings.PROJECT_NAME
-                                ) if secret is not None else None
-                            )
-                            qrCodeSVG: Union[str, None] = createQrCode(
-                                otp_auth_url
-                            ) if otp_auth_url is not None else None
-                            # ==> Here will response the best result, the other are warnings and errors
-                            return responseHandler(
-                                [
-                                    ResponseHandlerObject(
-                                        msgType=MsgTypeEnum.RESULT,
-                                        msg=ResponseRegistrationResultSchema(
-                                            qrCode=qrCodeSVG if qrCodeSVG is not None else None,
-                                            secret=secret.secret if secret is not None else None,
-                                            expireTime=f"{settings.ACCESS_TOKEN_EXPIRE_MINUTES}m",
-                                            expireDate=user.accountExpireDate,
-                                        ),
-                                    )
-                                ],
-                                200,
-                            )
-
-                        else:
-                            await remove(
-                                TokenDataObject(id=str(user.id), username=user.username)
-                            )
-                            return responseHandler(
-                                [
-                                    ResponseHandlerObject(
-                                        msgType=MsgTypeEnum.ERROR,
-                                        msg="user saving failed!",
-                                    ),
-                                    ResponseHandlerObject(
-                                        msgType=MsgTypeEnum.STATE, msg="TOKEN_FAILED"
-                                    ),
-                                ],
-                                400,
-                            )
-
-                    else:
-                        return responseHandler(
-                            [
-                                ResponseHandlerObject(
-                                    msgType=MsgTypeEnum.ERROR, msg="user saving failed!"
-                                ),
-                                ResponseHandlerObject(
-                                    msgType=MsgTypeEnum.STATE, msg="USER_FAILED"
-                                ),
-                            ],
-                            400,
-                        )
+                password_hast_tmp = await passwordService.hash(password)
+                if password_hast_tmp is None:
+                    return USER_SAVING_FAILED_400
 
-                else:
-                    logging.log(
-                        verboselogs.NOTICE,
-                        f"tried to create account where username already exist:: {username}",
-                    )
-                    return responseHandler(
-                        [
-                            ResponseHandlerObject(
-                                msgType=MsgTypeEnum.ERROR,
-                                msg="you can not use this username, choose any other :P",
-                            )
-                        ],
-                        400,
+                # create the 2FA credentials
+                secret: Union[pyotp.TOTP, None] = totpCreate() if settings.TOTP_ACTIVE else None
+                user: UserEntity = UserEntity(
+                    name=name,
+                    surname=surname,
+                    username=username,
+                    password=password_hast_tmp,
+                    totpToken=secret.secret if secret is not None else None,
+                    # in UTC, as the TTL index of mongoDB compares it with UTC
+                    accountExpireDate=datetime.utcnow() + timedelta(
+                        minutes=settings.ACCOUNT_REGISTER_EXPIRE_MINUTES
+                    ),
+                    email=email,
+                    status=UserStatusEnum.NEW,
+                )
+                failed: Union[ResponseHolderObject, None] = await insertUser(user)
+                if failed is not None:
+                    return failed
+
+                user.token = createUserToken(user)
+                if user.token is None:
+                    await remove(
+                        TokenDataObject(id=str(user.id), username=user.username)
                     )
+                    return TOKEN_SAVING_FAILED_400
+
+                # if user is created/saved, create the qrcode for the user for the 2FA
+                return await registrationResult(user, secret)
 
             else:
-                return responseHandler(
-                    [
-                        ResponseHandlerObject(
-                            msgType=MsgTypeEnum.ERROR,
-                            msg="the E-Mail address is not valid",
-                        )
-                    ],
-                    400,
-                )
+                return EMAIL_INVALID_400
 
         else:
-            return responseHandler(
-                [
-                    ResponseHandlerObject(
-                        msgType=MsgTypeEnum.ERROR,
-                        msg="please fill name, surname, username, password and email",
-                    )
-                ],
-                400,
-            )
+            return REGISTRATION_MISSING_400
 
+    except PasswordServiceBusy as e:
+        logging.log(logging.WARNING, e)
+        return SERVICE_BUSY_503
     except Exception as e:
         logging.log(logging.CRITICAL, e, exc_info=True)
     return None
 
 
+async def isUsernameTaken(username: str) -> bool:
+    user: Union[UserEntity, None] = await conn.find_one(
+        filter={"username": username},
+        entity=UserEntity,
+        table_name=DB_TABLE,
+        projection=USER_ID_PROJECTION,
+        trusted=True,
+        coalesce=True,
+    )
+    return user is not None
+
+
+def usernameTaken(username: str) -> ResponseHolderObject:
+    logging.log(
+        verboselogs.NOTICE,
+        f"tried to create account where username already exist:: {username}",
+    )
+    return USERNAME_TAKEN_400
+
+
+async def insertUser(user: UserEntity) -> Union[ResponseHolderObject, None]:
+    """
+    saves the user in one atomic insert and sets its id, None on success
+    the unique index on username rejects it, if the username was taken meanwhile
+    """
+    try:
+        inserted_id: Union[PyObjectId, None] = await conn.insert_one(obj=user, table_name=DB_TABLE)
+    except DuplicateKeyError:
+        return usernameTaken(user.username)
+    if inserted_id is None:
+        return USER_SAVING_FAILED_400
+    user.id = inserted_id
+    return None
+
+
+async def registrationResult(user: UserEntity, secret: Union[pyotp.TOTP, None]) -> ResponseHolderObject:
+    """
+    the response of a registration, with the qrcode and the secret for the 2FA
+    """
+    otp_auth_url: Union[str, None] = (
+        secret.provisioning_uri(
+            name=user.username, issuer_name=settings.PROJECT_NAME
+        ) if secret is not None else None
+    )
+    # rendered in the thread pool of the qr service
+    qrCodeSVG: Union[str, None] = await qrService.create(
+        otp_auth_url
+    ) if otp_auth_url is not None else None
+    # ==> Here will response the best result, the other are warnings and errors
+    return responseHandler(
+        [
+            ResponseHandlerObject(
+                msgType=MsgTypeEnum.RESULT,
+                msg=ResponseRegistrationResultSchema(
+                    qrCode=qrCodeSVG,
+                    secret=secret.secret if secret is not None else None,
+                    expireTime=f"{settings.ACCESS_TOKEN_EXPIRE_MINUTES}m",
+                    expireDate=user.accountExpireDate,
+                ),
+            )
+        ],
+        200,
+    )
+
+
 # ------------------------------------------------------------------------------
 #
 #
@@ -222,217 +247,279 @@ async def login(params: RequestLoginSchema) -> Union[ResponseHolderObject, None]
         if (
             authCode is not None or settings.TOTP_ACTIVE is False
         ) and username is not None and password is not None:
-            # get user by username and check next if valid passwd
-            user: Union[UserEntity, None] = conn.find_one(
-                filter={"username": username}, entity=UserEntity, table_name=DB_TABLE
-            )
+            user: Union[UserEntity, None]
+            failed: Union[ResponseHolderObject, None]
+            user, failed = await checkCredentials(username, password, authCode)
+            if user is None:
+                return failed
+
+            # check if it is first login after creating account, to set the user active,
+            # expired registrations are removed by the TTL index or 'removeExpiredRegistrations'
+            is_activated: bool = False
+            if (
+                user.status == UserStatusEnum.NEW and
+                user.accountExpireDate is not None and
+                user.accountExpireDate >= datetime.utcnow()
+            ):
+                token: Union[str, None] = createUserToken(user)
+                if token is None:
+                    return TOKEN_CREATE_FAILED_400
+                activated_user: Union[UserEntity, None] = await activateUser(user.id, token)
+                is_activated = activated_user is not None
+                # else the state changed meanwhile (parallel first login or just expired)
+                user = activated_user if activated_user is not None else await findLoginUser({"_id": user.id})
+
+            # if user is valid and has an account, go on and verify basic login
             if user is not None:
-                # check if for username, the password is correct
-                if verify_password(password, user.password):
-                    # check totp
-                    is_totp_verify: bool = False
-                    if settings.TOTP_ACTIVE:
-                        is_totp_verify = (
-                            totpVerify(
-                                user.totpToken, authCode
-                            ) if user.totpToken is not None and
-                            authCode is not None else False
-                        )
-                    # => first check, if the user is a new one and if the expire date is not outdated
-                    if user is not None and (
-                        is_totp_verify or not settings.TOTP_ACTIVE
-                    ):
-                        # check if it is first login after creating account, to set the user active or remove after expire time
-                        if (
-                            user.status == UserStatusEnum.NEW and
-                            user.accountExpireDate is not None and
-                            user.accountExpireDate >= datetime.now()
-                        ):
-                            created_token: Union[
-                                TokenObject, None
-                            ] = create_access_token(
-                                data=TokenDataObject(
-                                    id=str(user.id),
-                                    username=user.username,
-                                    isAdmin=False,
-                                )
-                            )
-                            token: Union[
-                                str, None
-                            ] = created_token.access_token if created_token is not None else None
-                            if token is not None:
-                                user = conn.find_and_modify(
-                                    id=user.id,
-                                    update={
-                                        "accountExpireDate": None,
-                                        "status": UserStatusEnum.ACTIVE,
-                                        "lastLogin": datetime.now(),
-                                        "token": token,
-                                    },
-                                    entity=UserEntity,
-                                    table_name=DB_TABLE,
-                                )
-                            else:
-                                return responseHandler(
-                                    [
-                                        ResponseHandlerObject(
-                                            msgType=MsgTypeEnum.ERROR,
-                                            msg="failed to create token",
-                                        )
-                                    ],
-                                    400,
-                                )
-
-                        # if expired, remove the user and return with that info
-                        elif (
-                            user.status == UserStatusEnum.NEW and
-                            user.accountExpireDate is not None and
-                            user.accountExpireDate < datetime.now()
-                        ):
-                            conn.remove(user.id, DB_TABLE)
-                            return responseHandler(
-                                [
-                                    ResponseHandlerObject(
-                                        msgType=MsgTypeEnum.ERROR,
-                                        msg="your registration is expired",
-                                    )
-                                ],
-                                400,
-                            )
-
-                        # if user is valid and has an account, go on and verify basic login
-                        if user is not None:
-                            # check if user is active and 2FA is valid, if yes return user info and TOKEN
-                            if user.status == UserStatusEnum.ACTIVE:
-                                conn.find_and_modify(
-                                    id=user.id,
-                                    update={"lastLogin": datetime.now()},
-                                    entity=UserEntity,
-                                    table_name=DB_TABLE,
-                                )
-                                return responseHandler(
-                                    [
-                                        ResponseHandlerObject(
-                                            msgType=MsgTypeEnum.RESULT,
-                                            msg=ResponseLoginResultSchema(
-                                                username=user.username,
-                                                firstName=user.name,
-                                                lastName=user.surname,
-                                                email=user.email,
-                                                token=user.token,
-                                            ),
-                                        ),
-                                        ResponseHandlerObject(
-                                            msgType=MsgTypeEnum.STATE,
-                                            errorType=ErrorTypeEnum.ACCESS_GRANT,
-                                        ),
-                                    ],
-                                    200,
-                                )
-
-                            else:
-                                logging.log(
-                                    logging.WARNING,
-                                    f"user tried loggin to account which is not active: '{username}'",
-                                )
-                                return responseHandler(
-                                    [
-                                        ResponseHandlerObject(
-                                            msgType=MsgTypeEnum.ERROR,
-                                            msg="account is not active",
-                                        ),
-                                        ResponseHandlerObject(
-                                            msgType=MsgTypeEnum.STATE,
-                                            errorType=ErrorTypeEnum.ACCESS_DECLINE,
-                                        ),
-                                    ],
-                                    401,
-                                )
-
-                        else:
-                            logging.log(
-                                logging.WARNING,
-                                f"user entity was null (maybe after first registration): '{username}'",
-                            )
-                            return responseHandler(
-                                [
-                                    ResponseHandlerObject(
-                                        msgType=MsgTypeEnum.ERROR,
-                                        errorType=ErrorTypeEnum.ACCESS_FAILED,
-                                    ),
-                                    ResponseHandlerObject(
-                                        msgType=MsgTypeEnum.STATE,
-                                        errorType=ErrorTypeEnum.ACCESS_DECLINE,
-                                    ),
-                                ],
-                                401,
-                            )
-
-                    else:
-                        logging.log(
-                            logging.WARNING, f"totp verification failed: '{username}'"
-                        )
-                        return responseHandler(
-                            [
-                                ResponseHandlerObject(
-                                    msgType=MsgTypeEnum.ERROR,
-                                    errorType=ErrorTypeEnum.TOTP_DECLINE,
-                                ),
-                                ResponseHandlerObject(
-                                    msgType=MsgTypeEnum.STATE,
-                                    errorType=ErrorTypeEnum.ACCESS_DECLINE,
-                                ),
-                            ],
-                            401,
-                        )
+                # check if user is active, if yes return user info and TOKEN
+                if user.status == UserStatusEnum.ACTIVE:
+                    return await loginResult(user, is_activated)
 
                 else:
                     logging.log(
                         logging.WARNING,
-                        f"verify_password failed, has no more access or user has no totp: '{username}'",
+                        f"user tried loggin to account which is not active: '{username}'",
                     )
+                    return ACCOUNT_NOT_ACTIVE_401
+
+            else:
+                logging.log(
+                    logging.WARNING,
+                    f"user entity was null (maybe after first registration): '{username}'",
+                )
+                return ACCESS_FAILED_401
+
+        else:
+            return LOGIN_MISSING_400
+
+    except PasswordServiceBusy as e:
+        logging.log(logging.WARNING, e)
+        return SERVICE_BUSY_503
+    except Exception as e:
+        logging.log(logging.CRITICAL, e, exc_info=True)
+    return None
+
+
+async def findLoginUser(filter: Dict[str, Any], coalesce: bool = False) -> Union[UserEntity, None]:
+    return await conn.find_one(
+        filter=filter,
+        entity=UserEntity,
+        table_name=DB_TABLE,
+        projection=USER_LOGIN_PROJECTION,
+        trusted=True,
+        coalesce=coalesce,
+    )
+
+
+async def checkCredentials(
+    username: str, password: str, authCode: Union[str, None]
+) -> Tuple[Union[UserEntity, None], Union[ResponseHolderObject, None]]:
+    """
+    the user, if the password and the 2FA code are correct,
+    else the response to answer with
+    """
+    # get user by username and check next if valid passwd,
+    # concurrent logins of the same user share one query
+    user: Union[UserEntity, None] = await findLoginUser({"username": username}, coalesce=True)
+    if user is None:
+        logging.log(logging.WARNING, f"requested user did not exists: '{username}'")
+        return None, ACCESS_FAILED_401
+
+    if not await passwordService.verify(password, user.password):
+        logging.log(
+            logging.WARNING,
+            f"verify_password failed, has no more access or user has no totp: '{username}'",
+        )
+        return None, ACCESS_FAILED_401
+
+    # migrate hashes with an other scheme or cost, off the request path
+    if password_needs_update(user.password):
+        rehashPassword(user.id, password, user.password)
+    if settings.TOTP_ACTIVE and (
+        user.totpToken is None or authCode is None or not totpVerify(user.totpToken, authCode)
+    ):
+        logging.log(logging.WARNING, f"totp verification failed: '{username}'")
+        return None, TOTP_DECLINE_401
+
+    return user, None
+
+
+async def activateUser(id: PyObjectId, token: str) -> Union[UserEntity, None]:
+    """
+    activates, stores the token and stamps lastLogin in one round trip,
+    the filter only matches while the account is still new and not expired
+    """
+    now: datetime = datetime.utcnow()
+    return await conn.find_one_and_update(
+        filter={
+            "_id": id,
+            "status": UserStatusEnum.NEW,
+            "accountExpireDate": {"$gte": now},
+        },
+        update={
+            "$set": {
+                "accountExpireDate": None,
+                "status": UserStatusEnum.ACTIVE,
+                "lastLogin": now,
+                "token": token,
+            }
+        },
+        entity=UserEntity,
+        table_name=DB_TABLE,
+        projection=USER_LOGIN_PROJECTION,
+        trusted=True,
+    )
+
+
+async def loginResult(user: UserEntity, is_activated: bool) -> ResponseHolderObject:
+    """
+    the response of a login, with the access and the refresh token
+    """
+    # on first login lastLogin is already stamped with the activation
+    # and the token is the stored one, else a new token is issued
+    access_token: Union[str, None] = user.token
+    if not is_activated:
+        lastLoginBuffer.stamp(user.id, datetime.utcnow())
+        access_token = createUserToken(user)
+    if access_token is None:
+        return TOKEN_CREATE_FAILED_400
+    # if it could not be stored, the login is answered without refresh token
+    refresh_token: Union[str, None] = await createRefreshToken(str(user.id), user.username)
+    return responseHandler(
+        [
+            ResponseHandlerObject(
+                msgType=MsgTypeEnum.RESULT,
+                msg=ResponseLoginResultSchema(
+                    username=user.username,
+                    firstName=user.name,
+                    lastName=user.surname,
+                    email=user.email,
+                    token=access_token,
+                    refreshToken=refresh_token,
+                ),
+            ),
+            ResponseHandlerObject(
+                msgType=MsgTypeEnum.STATE,
+                errorType=ErrorTypeEnum.ACCESS_GRANT,
+            ),
+        ],
+        200,
+    )
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+def refreshTokenDigest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def createRefreshToken(id: str, username: str) -> Union[str, None]:
+    """
+    creates and stores a new refresh token, only its digest is stored
+    None if it could not be stored
+    """
+    token: str = secrets.token_urlsafe(32)
+    now: datetime = datetime.utcnow()
+    inserted_id: Union[PyObjectId, None] = await conn.insert_one(
+        obj=RefreshTokenEntity(
+            digest=refreshTokenDigest(token),
+            userId=id,
+            username=username,
+            expireAt=now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+            created=now,
+        ),
+        table_name=DB_TABLE_REFRESH,
+    )
+    return token if inserted_id is not None else None
+
+
+def createUserToken(user: UserEntity) -> Union[str, None]:
+    """
+    a new access token of the user, with its admin flag
+    """
+    created_token: Union[TokenObject, None] = create_access_token(
+        data=TokenDataObject(
+            id=str(user.id),
+            username=user.username,
+            isAdmin=user.isAdmin,
+        )
+    )
+    return created_token.access_token if created_token is not None else None
+
+
+async def activeUser(id: str, username: str) -> Union[UserEntity, None]:
+    """
+    the user, if it exists, is active and not revoked (read through 'entityCache')
+    """
+    if revocation.isRevoked(TokenDataObject(id=id, username=username)):
+        return None
+    user: Union[UserEntity, None] = await conn.find_one(
+        filter={"_id": ObjectId(id), "username": username},
+        entity=UserEntity,
+        table_name=DB_TABLE,
+        projection=USER_STATUS_PROJECTION,
+        trusted=True,
+    )
+    return user if user is not None and user.status == UserStatusEnum.ACTIVE else None
+
+
+async def refresh(params: RequestRefreshSchema) -> Union[ResponseHolderObject, None]:
+    refreshToken = params.refreshToken
+    try:
+        if refreshToken:
+            # use and remove the refresh token in one lookup, so it can only be used once (rotation)
+            stored: Union[RefreshTokenEntity, None] = await conn.find_one_and_delete(
+                filter={"digest": refreshTokenDigest(refreshToken), "expireAt": {"$gt": datetime.utcnow()}},
+                entity=RefreshTokenEntity,
+                table_name=DB_TABLE_REFRESH,
+                trusted=True,
+            )
+            user: Union[UserEntity, None] = (
+                await activeUser(stored.userId, stored.username) if stored is not None else None
+            )
+            if stored is not None and user is not None:
+                token: Union[str, None] = createUserToken(user)
+                newRefreshToken: Union[str, None] = None
+                if token is not None:
+                    try:
+                        newRefreshToken = await createRefreshToken(stored.userId, stored.username)
+                    except Exception as e:
+                        logging.log(logging.CRITICAL, e, exc_info=True)
+                    if newRefreshToken is None:
+                        # give the used refresh token back, so the client is not logged out
+                        await conn.insert_one(obj=stored, table_name=DB_TABLE_REFRESH)
+                        return TOKEN_SAVING_FAILED_400
+
+                if token is not None and newRefreshToken is not None:
                     return responseHandler(
                         [
                             ResponseHandlerObject(
-                                msgType=MsgTypeEnum.ERROR,
-                                errorType=ErrorTypeEnum.ACCESS_FAILED,
+                                msgType=MsgTypeEnum.RESULT,
+                                msg=ResponseRefreshResultSchema(
+                                    token=token,
+                                    refreshToken=newRefreshToken,
+                                ),
                             ),
                             ResponseHandlerObject(
                                 msgType=MsgTypeEnum.STATE,
-                                errorType=ErrorTypeEnum.ACCESS_DECLINE,
+                                errorType=ErrorTypeEnum.ACCESS_GRANT,
                             ),
                         ],
-                        401,
+                        200,
                     )
 
+                else:
+                    return TOKEN_CREATE_FAILED_400
+
             else:
-                logging.log(
-                    logging.WARNING, f"requested user did not exists: '{username}'"
-                )
-                return responseHandler(
-                    [
-                        ResponseHandlerObject(
-                            msgType=MsgTypeEnum.ERROR,
-                            errorType=ErrorTypeEnum.ACCESS_FAILED,
-                        ),
-                        ResponseHandlerObject(
-                            msgType=MsgTypeEnum.STATE,
-                            errorType=ErrorTypeEnum.ACCESS_DECLINE,
-                        ),
-                    ],
-                    401,
-                )
+                logging.log(logging.WARNING, "refresh with unknown, used or expired refresh token, or of an inactive user")
+                return ACCESS_FAILED_401
 
         else:
-            return responseHandler(
-                [
-                    ResponseHandlerObject(
-                        msgType=MsgTypeEnum.ERROR,
-                        msg="please fill authCode, username and password",
-                    )
-                ],
-                400,
-            )
+            return REFRESH_MISSING_400
 
     except Exception as e:
         logging.log(logging.CRITICAL, e, exc_info=True)
@@ -444,6 +531,25 @@ async def login(params: RequestLoginSchema) -> Union[ResponseHolderObject, None]
 #
 #
 # ------------------------------------------------------------------------------
+async def logout(params: TokenDataObject) -> Union[ResponseHolderObject, None]:
+    """
+    revokes the token and removes the refresh tokens of the user,
+    tokens of other sessions of the user stay valid until they expire
+    """
+    try:
+        if params.id is not None and params.jti is not None and params.exp is not None:
+            await revocation.revokeToken(params)
+            await conn.delete_many(filter={"userId": params.id}, table_name=DB_TABLE_REFRESH)
+            return USER_LOGGED_OUT_200
+
+        else:
+            return TOKEN_MISSING_ATTRIBUTES_400
+
+    except Exception as e:
+        logging.log(logging.CRITICAL, e, exc_info=True)
+    return None
+
+
 async def remove(params: TokenDataObject) -> Union[ResponseHolderObject, None]:
     id = params.id
     username = params.username
@@ -452,51 +558,101 @@ async def remove(params: TokenDataObject) -> Union[ResponseHolderObject, None]:
         # check if all needed value are available
         if id is not None and username is not None:
             # get user by username and check next if valid passwd
-            user: Union[UserEntity, None] = conn.find_one(
+            user: Union[UserEntity, None] = await conn.find_one(
                 filter={"_id": ObjectId(id), "username": username},
                 entity=UserEntity,
                 table_name=DB_TABLE,
+                projection=USER_ID_PROJECTION,
+                trusted=True,
             )
             # check if user is active
             if user is not None:  # and user.status == UserStatusEnum.ACTIVE:
-                conn.remove(id=user.id, table_name=DB_TABLE)
-                return responseHandler(
-                    [
-                        ResponseHandlerObject(
-                            msgType=MsgTypeEnum.RESULT, msg="user removed"
-                        ),
-                        ResponseHandlerObject(
-                            msgType=MsgTypeEnum.STATE, errorType=ErrorTypeEnum.REMOVED
-                        ),
-                    ],
-                    200,
-                )
+                # tokens of the removed user are not valid anymore,
+                # revoked first, if it fails the user is not removed
+                await revocation.revokeUser(str(user.id))
+                await conn.remove(id=user.id, table_name=DB_TABLE)
+                await conn.delete_many(filter={"userId": str(user.id)}, table_name=DB_TABLE_REFRESH)
+                return USER_REMOVED_200
 
             else:
-                return responseHandler(
-                    [
-                        ResponseHandlerObject(
-                            msgType=MsgTypeEnum.ERROR,
-                            errorType=ErrorTypeEnum.ACCESS_FAILED,
-                        ),
-                        ResponseHandlerObject(
-                            msgType=MsgTypeEnum.STATE,
-                            errorType=ErrorTypeEnum.ACCESS_DECLINE,
-                        ),
-                    ],
-                    401,
-                )
+                return ACCESS_FAILED_401
 
         else:
-            return responseHandler(
-                [
-                    ResponseHandlerObject(
-                        msgType=MsgTypeEnum.ERROR, msg="missing attributes from token"
-                    )
-                ],
-                400,
-            )
+            return TOKEN_MISSING_ATTRIBUTES_400
 
     except Exception as e:
         logging.log(logging.CRITICAL, e, exc_info=True)
     return None
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+async def removeExpiredRegistrations() -> int:
+    """
+    removes registrations which are not activated in time, in batches,
+    for backends without TTL index support
+    (with TTL index it only removes what the TTL monitor not has removed yet)
+    """
+    removed: int = 0
+    try:
+        while True:
+            count: int = await conn.delete_many(
+                filter={"status": UserStatusEnum.NEW, "accountExpireDate": {"$lt": datetime.utcnow()}},
+                table_name=DB_TABLE,
+                limit=settings.ACCOUNT_EXPIRE_SWEEP_BATCH,
+            )
+            removed += count
+            if count < settings.ACCOUNT_EXPIRE_SWEEP_BATCH:
+                break
+        if removed > 0:
+            logging.log(verboselogs.NOTICE, f"removed expired registrations:: {removed}")
+
+    except Exception as e:
+        logging.log(logging.CRITICAL, e, exc_info=True)
+    return removed
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+def rehashPassword(id: PyObjectId, password: str, old_hash: str) -> None:
+    """
+    rehashes the password in background, with the configured scheme and cost
+    skipped (done on a later login) when 'PASSWORD_REHASH_MAX' rehashes are running,
+    or the password service queue is half full, so logins are not answered with 503
+    """
+    if (
+        len(rehashTasks) >= settings.PASSWORD_REHASH_MAX or
+        passwordService.pending >= passwordService.queue_size // 2
+    ):
+        return
+    task: "asyncio.Task[None]" = asyncio.get_running_loop().create_task(_rehashPassword(id, password, old_hash))
+    rehashTasks.add(task)
+    task.add_done_callback(rehashTasks.discard)
+
+
+async def _rehashPassword(id: PyObjectId, password: str, old_hash: str) -> None:
+    try:
+        new_hash: Union[str, None] = await passwordService.hash(password)
+        if new_hash is not None:
+            # only if the password was not changed meanwhile
+            await conn.find_one_and_update(
+                filter={"_id": id, "password": old_hash},
+                update={"$set": {"password": new_hash}},
+                entity=UserEntity,
+                table_name=DB_TABLE,
+                projection=USER_ID_PROJECTION,
+                trusted=True,
+            )
+            logging.log(logging.DEBUG, f"password rehashed:: {id}")
+
+    except PasswordServiceBusy:
+        # try again on next login
+        pass
+    except Exception as e:
+        logging.log(logging.CRITICAL, e, exc_info=True)
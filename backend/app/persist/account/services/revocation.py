@@ -0,0 +1,145 @@
+"""
+    token revocation
+    revocations are stored in mongoDB and mirrored into sets in every
+    worker, so the check on each request is a memory lookup.
+    the mirror is loaded on startup and refreshed incremental by the
+    scheduler every 'TOKEN_REVOCATION_REFRESH_SECONDS', revocations
+    of the own worker are in the mirror at once.
+    Use: 'revokeToken', 'revokeUser' and 'isRevoked'
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Union
+
+from app.db.mongoDbAsync import AsyncDBConnection
+from app.db.mongoIndex import indexRegistry
+from app.persist.account.models.revocation import RevocationEntity, RevocationKindEnum
+from app.utils.api.securityHelper import TokenDataObject
+from app.utils.config import settings
+from app.utils.metricsHelper import metricsRegistry
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+DB_TABLE: str = "token_revocation"
+conn: AsyncDBConnection = AsyncDBConnection()
+indexRegistry.register(DB_TABLE, RevocationEntity)
+# revocations of other workers can be written with a little older 'created',
+# so every refresh loads again what is not older than this
+REFRESH_OVERLAP: timedelta = timedelta(seconds=5)
+
+
+class RevocationMirror:
+    """
+    in memory copy of the not expired revocations
+    """
+
+    def __init__(self) -> None:
+        # value => expireAt (UTC)
+        self.tokens: Dict[str, datetime] = {}
+        self.users: Dict[str, datetime] = {}
+        self.loaded_until: Union[datetime, None] = None
+        self.stats: Dict[str, int] = {"checks": 0, "revoked": 0, "refreshes": 0, "refresh_failures": 0}
+
+    def add(self, entity: RevocationEntity) -> None:
+        target: Dict[str, datetime] = self.tokens if entity.kind == RevocationKindEnum.TOKEN else self.users
+        target[entity.value] = max(entity.expireAt, target.get(entity.value, entity.expireAt))
+
+    def prune(self, now: datetime) -> None:
+        for target in (self.tokens, self.users):
+            for value in [value for value, expire_at in target.items() if expire_at <= now]:
+                del target[value]
+
+    def clear(self) -> None:
+        """
+        forgets all revocations, the next refresh loads them again
+        """
+        self.tokens.clear()
+        self.users.clear()
+        self.loaded_until = None
+
+    def snapshot(self) -> Dict[str, int]:
+        return {"tokens": len(self.tokens), "users": len(self.users), **self.stats}
+
+
+revocationMirror: RevocationMirror = RevocationMirror()
+metricsRegistry.register("token_revocation", revocationMirror.snapshot)
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+def isRevoked(user: TokenDataObject) -> bool:
+    """
+    checks the token (by 'jti') and its user (by 'id') against the mirror
+    """
+    revocationMirror.stats["checks"] += 1
+    if (
+        (user.jti is not None and user.jti in revocationMirror.tokens) or
+        (user.id is not None and user.id in revocationMirror.users)
+    ):
+        revocationMirror.stats["revoked"] += 1
+        return True
+    return False
+
+
+async def revoke(kind: RevocationKindEnum, value: str, expireAt: datetime) -> None:
+    """
+    stores a revocation and adds it to the own mirror,
+    only when stored, so all workers see the same revocations
+    """
+    entity: RevocationEntity = RevocationEntity(
+        kind=kind, value=value, expireAt=expireAt, created=datetime.utcnow()
+    )
+    await conn.insert_one(obj=entity, table_name=DB_TABLE)
+    revocationMirror.add(entity)
+
+
+async def revokeToken(user: TokenDataObject) -> None:
+    """
+    revokes one token, until its 'exp'
+    """
+    if user.jti is not None and user.exp is not None:
+        await revoke(RevocationKindEnum.TOKEN, user.jti, user.exp.replace(tzinfo=None))
+
+
+async def revokeUser(id: str) -> None:
+    """
+    revokes all tokens of a user, until the last one can be expired
+    """
+    await revoke(
+        RevocationKindEnum.USER,
+        id,
+        datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+
+
+async def refreshRevocations() -> None:
+    """
+    loads the revocations created since the last refresh into the mirror
+    and removes expired ones from it
+    """
+    try:
+        now: datetime = datetime.utcnow()
+        filter: Dict[str, Dict[str, datetime]] = {"expireAt": {"$gt": now}}
+        if revocationMirror.loaded_until is not None:
+            filter["created"] = {"$gte": revocationMirror.loaded_until - REFRESH_OVERLAP}
+        async for entity in conn.find_iter(
+            filter=filter, entity=RevocationEntity, table_name=DB_TABLE, trusted=True
+        ):
+            revocationMirror.add(entity)
+        revocationMirror.loaded_until = now
+        revocationMirror.prune(now)
+        if not settings.DB_TTL_INDEXES:
+            await conn.delete_many(
+                filter={"expireAt": {"$lte": now}}, table_name=DB_TABLE, limit=settings.DB_BATCH_SIZE
+            )
+        revocationMirror.stats["refreshes"] += 1
+
+    except Exception as e:
+        revocationMirror.stats["refresh_failures"] += 1
+        logging.log(logging.CRITICAL, e, exc_info=True)
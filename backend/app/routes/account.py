@@ -11,10 +11,15 @@ from starlette import status
 
 import app.persist.account.services.account as account
 from app.middleware.auth import middlewareAuth
-from app.persist.account.schemas.request import RequestLoginSchema, RequestRegistrationSchema
-from app.persist.account.schemas.response import ResponseLoginSchema, ResponseRegistrationSchema
+from app.middleware.throttle import middlewareLoginThrottle
+from app.persist.account.schemas.request import RequestLoginSchema, RequestRefreshSchema, RequestRegistrationSchema
+from app.persist.account.schemas.response import (
+    ResponseLoginSchema,
+    ResponseRefreshSchema,
+    ResponseRegistrationSchema,
+)
 from app.schemas.response import ResponseSchema
-from app.utils.api.requestHelper import requestHelper
+from app.utils.api.requestHelper import routeHandler
 from app.utils.api.securityHelper import TokenDataObject
 
 # ------------------------------------------------------------------------------
@@ -24,6 +29,12 @@ from app.utils.api.securityHelper import TokenDataObject
 # ------------------------------------------------------------------------------
 router = APIRouter(prefix="/account", tags=["account"])
 
+loginHandler = routeHandler(account.login, keysNeeded=RequestLoginSchema)
+refreshHandler = routeHandler(account.refresh, keysNeeded=RequestRefreshSchema)
+registerHandler = routeHandler(account.registration, keysNeeded=RequestRegistrationSchema, funcCallerName="register")
+logoutHandler = routeHandler(account.logout, withToken=True)
+removeHandler = routeHandler(account.remove, withToken=True)
+
 
 # TODO: 200,401,400
 # NOTE: need to document what will resulted
@@ -32,21 +43,32 @@ router = APIRouter(prefix="/account", tags=["account"])
 #
 #
 # ------------------------------------------------------------------------------
-@router.post("/login", name="account:login", response_model=ResponseLoginSchema)
+@router.post(
+    "/login",
+    name="account:login",
+    response_model=ResponseLoginSchema,
+    dependencies=[Depends(middlewareLoginThrottle)],
+)
 async def login(items: RequestLoginSchema, response: Response) -> Any:
     """
     login will handle usage for other api's
 
     - by response with a JWT-token
+    - attempts are limited per username and per client ip (429), successful ones count too
     - It will also return user information to display on GUI
     """
-    return await requestHelper(
-        response=response,
-        func=account.login,
-        keys=items,
-        keysNeeded=RequestLoginSchema,
-        funcCallerName="login",
-    )
+    return await loginHandler(response, items)
+
+
+@router.post("/refresh", name="account:refresh", response_model=ResponseRefreshSchema)
+async def refresh(items: RequestRefreshSchema, response: Response) -> Any:
+    """
+    refresh will create a new JWT-token, without a new login
+
+    - by the refresh token returned on login
+    - a refresh token can only be used once, a new one is returned with the new JWT-token
+    """
+    return await refreshHandler(response, items)
 
 
 @router.post(
@@ -61,16 +83,23 @@ async def register(items: RequestRegistrationSchema, response: Response) -> Any:
 
     - all new user will have state = NEW
     - there will be 5min. to login and active the account
-        - if login will called after 5min. the account will be deleted
+        - if not activated after 5min. the account will be deleted
     - if 2FA is activated, it will also return the secret-key and a SVG-QR-CODE
     """
-    return await requestHelper(
-        response=response,
-        func=account.registration,
-        keys=items,
-        keysNeeded=RequestRegistrationSchema,
-        funcCallerName="register",
-    )
+    return await registerHandler(response, items)
+
+
+@router.post("/logout", name="account:logout", response_model=ResponseSchema)
+async def logout(
+    response: Response, jwt: TokenDataObject = Depends(middlewareAuth)
+) -> Any:
+    """
+    logout will revoke the JWT-token
+
+    - all refresh tokens of the user are removed
+    - JWT-tokens of other sessions stay valid until they expire
+    """
+    return await logoutHandler(response, jwt)
 
 
 @router.delete("/remove", name="account:remove", response_model=ResponseSchema)
@@ -80,11 +109,4 @@ async def remove(
     """
     removes a existing user
     """
-    return await requestHelper(
-        token=jwt,
-        response=response,
-        func=account.remove,
-        keys=None,
-        keysNeeded=None,
-        funcCallerName="remove",
-    )
+    return await removeHandler(response, jwt)
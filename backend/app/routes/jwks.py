@@ -0,0 +1,32 @@
+"""
+    api to publish the public keys of the token signing,
+    so other services can verify tokens them self
+    (only mounted for asymmetric algorithms)
+"""
+
+from typing import Any, Dict, List
+
+from fastapi import APIRouter
+
+from app.utils.api.tokenCodec import tokenCodec
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+router = APIRouter(prefix="/.well-known", tags=["account"])
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+@router.get("/jwks.json", name="account:jwks")
+async def jwks() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    returns the public keys as JSON Web Key Set,
+    the current signing key and the keys still used to verify
+    """
+    return tokenCodec.jwks()
@@ -0,0 +1,34 @@
+"""
+    internal api to read runtime metrics
+    (database pool, ...), not part of the public api docs
+    only with the token of an admin and 'METRICS_ACTIVE'
+"""
+
+from typing import Any, Dict
+
+from fastapi import APIRouter, Depends
+
+from app.middleware.auth import middlewareAdmin
+from app.utils.metricsHelper import metricsRegistry
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+router = APIRouter(
+    prefix="/internal", tags=["internal"], include_in_schema=False, dependencies=[Depends(middlewareAdmin)]
+)
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+@router.get("/metrics", name="internal:metrics")
+async def metrics() -> Dict[str, Any]:
+    """
+    returns the snapshots of all registered metrics
+    """
+    return metricsRegistry.snapshot()
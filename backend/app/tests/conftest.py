@@ -0,0 +1,68 @@
+"""
+    settings for the tests, set before 'app.utils.config' is imported
+    the tests run against the in memory storage backend
+    async tests are run by anyio ('@pytest.mark.anyio')
+"""
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+import pytest
+
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["DB_BACKEND"] = "memory"
+os.environ["METRICS_ACTIVE"] = "false"
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture
+async def database() -> AsyncIterator[Any]:
+    """
+    an empty database with the declared indexes, closed after the test
+    """
+    from app.db.mongoCache import entityCache
+    from app.db.mongoDbAsync import AsyncDBConnection
+    from app.db.mongoIndex import indexRegistry
+    from app.persist.account.services.revocation import revocationMirror
+
+    connection: Any = await AsyncDBConnection.get_connection(new=True)
+    await indexRegistry.sync(connection)
+    try:
+        yield connection
+    finally:
+        AsyncDBConnection.close()
+        entityCache.clear()
+        revocationMirror.clear()
+
+
+@pytest.fixture
+def create_user(database: Any) -> Callable[..., Awaitable[Any]]:
+    """
+    stores an active user, fields can be overwritten
+    """
+    import app.persist.account.services.account as account
+    from app.persist.account.models.user import UserEntity, UserStatusEnum
+
+    async def create(username: str = "john_doo", **fields: Any) -> UserEntity:
+        user: UserEntity = UserEntity(
+            **{
+                "name": "john",
+                "surname": "doo",
+                "username": username,
+                "password": "hashed",
+                "email": f"{username}@example.gg",
+                "totpToken": None,
+                "accountExpireDate": None,
+                "status": UserStatusEnum.ACTIVE,
+                **fields,
+            }
+        )
+        inserted_id: Any = await account.conn.insert_one(obj=user, table_name=account.DB_TABLE)
+        assert inserted_id is not None
+        user.id = inserted_id
+        return user
+
+    return create
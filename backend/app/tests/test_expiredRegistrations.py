@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+from typing import Any, List
+
+import pytest
+
+import app.persist.account.services.account as account
+from app.persist.account.models.user import UserStatusEnum
+from app.utils.config import settings
+
+
+@pytest.mark.anyio
+async def test_remove_expired_registrations(database, create_user, monkeypatch):
+    monkeypatch.setattr(settings, "ACCOUNT_EXPIRE_SWEEP_BATCH", 2)
+    expired: datetime = datetime.utcnow() - timedelta(minutes=1)
+    for index in range(5):
+        await create_user(f"expired{index}", status=UserStatusEnum.NEW, accountExpireDate=expired)
+    await create_user("pending", status=UserStatusEnum.NEW, accountExpireDate=datetime.utcnow() + timedelta(minutes=5))
+    await create_user("active", accountExpireDate=expired)
+    batches: List[int] = []
+    delete_many = account.conn.delete_many
+
+    async def counted(*args: Any, **kwargs: Any) -> int:
+        count: int = await delete_many(*args, **kwargs)
+        batches.append(count)
+        return count
+
+    monkeypatch.setattr(account.conn, "delete_many", counted)
+
+    assert await account.removeExpiredRegistrations() == 5
+    assert batches == [2, 2, 1]
+    stored: List[Any] = await database[account.DB_TABLE].find({}).to_list(None)
+    assert sorted(user["username"] for user in stored) == ["active", "pending"]
+    assert await account.removeExpiredRegistrations() == 0
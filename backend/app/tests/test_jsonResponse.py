@@ -0,0 +1,43 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, Type
+
+import pytest
+from bson.objectid import ObjectId
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+import app.utils.api.jsonResponse as jsonResponse
+from app.utils.api.jsonResponse import RESPONSE_CLASSES, createResponseClass, jsonDefault
+
+INSTALLED: Dict[str, Type[JSONResponse]] = {
+    name: responseClass for name, responseClass in RESPONSE_CLASSES.items()
+    if jsonResponse.RESPONSE_MODULES[name] is not None
+}
+CONTENT: Dict[str, Any] = {
+    "data": [{"msg": {"username": "jöhn_doo", "token": None, "qrCode": "<svg/>"}, "count": 1, "rate": 0.5}],
+    "STATE": "ACCESS_GRANT",
+}
+
+
+class Nested(BaseModel):
+    name: str
+
+
+@pytest.mark.parametrize("name", INSTALLED.keys())
+def test_same_bytes_as_json(name):
+    assert INSTALLED[name](CONTENT).body == JSONResponse(CONTENT).body
+
+
+@pytest.mark.parametrize("name", [name for name in INSTALLED.keys() if name != "json"])
+def test_values_json_does_not_know(name):
+    content: Dict[str, Any] = {"id": ObjectId(), "created": datetime(2026, 1, 2, 3, 4, 5), "nested": Nested(name="a")}
+
+    assert json.loads(INSTALLED[name](content).body) == json.loads(json.dumps(content, default=jsonDefault))
+
+
+def test_fallback_to_json(monkeypatch):
+    monkeypatch.setitem(jsonResponse.RESPONSE_MODULES, "orjson", None)
+
+    assert createResponseClass("unknown") is JSONResponse
+    assert createResponseClass("orjson") is JSONResponse
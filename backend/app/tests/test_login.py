@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+
+import app.persist.account.services.account as account
+from app.persist.account.models.user import UserStatusEnum
+from app.persist.account.schemas.request import RequestLoginSchema
+from app.utils.api.passwordService import passwordService
+from app.utils.api.responseCatalog import ACCESS_FAILED_401, ACCOUNT_NOT_ACTIVE_401
+
+
+@pytest.fixture
+def verify(monkeypatch):
+    async def verify(plain_password: str, hashed_password: str) -> bool:
+        return plain_password == "password"
+
+    monkeypatch.setattr(passwordService, "verify", verify)
+    monkeypatch.setattr(account, "password_needs_update", lambda hashed_password: False)
+
+
+async def login(password: str = "password") -> Any:
+    return await account.login(RequestLoginSchema(username="john_doo", password=password, authCode=None))
+
+
+@pytest.mark.anyio
+async def test_first_login_activates(database, create_user, verify):
+    await create_user(status=UserStatusEnum.NEW, accountExpireDate=datetime.utcnow() + timedelta(minutes=5))
+
+    result: Any = await login()
+    stored: Any = await database[account.DB_TABLE].find_one({"username": "john_doo"})
+
+    assert result.httpCode == 200
+    assert stored["status"] == UserStatusEnum.ACTIVE
+    assert stored["accountExpireDate"] is None
+    assert stored["token"] == result.msg.RESULT.token
+
+
+@pytest.mark.anyio
+async def test_expired_registration(create_user, verify):
+    await create_user(status=UserStatusEnum.NEW, accountExpireDate=datetime.utcnow() - timedelta(minutes=1))
+
+    assert await login() is ACCOUNT_NOT_ACTIVE_401
+
+
+@pytest.mark.anyio
+async def test_wrong_password(create_user, verify):
+    await create_user()
+
+    assert await login("wrong") is ACCESS_FAILED_401
+    assert (await login()).httpCode == 200
@@ -0,0 +1,41 @@
+from typing import Union
+
+import pytest
+
+import app.persist.account.services.account as account
+from app.middleware.token import identify
+from app.persist.account.services.revocation import refreshRevocations, revocationMirror
+from app.utils.api.responseCatalog import USER_LOGGED_OUT_200
+from app.utils.api.securityHelper import TokenDataObject
+
+
+@pytest.mark.anyio
+async def test_logout_revokes_token(database, create_user):
+    user = await create_user()
+    token: Union[str, None] = account.createUserToken(user)
+    other: Union[str, None] = account.createUserToken(user)
+    await account.createRefreshToken(str(user.id), user.username)
+    identified: Union[TokenDataObject, None] = identify(token)
+    assert identified is not None
+
+    assert await account.logout(identified) is USER_LOGGED_OUT_200
+    assert identify(token) is None
+    assert identify(other) is not None
+    assert await database[account.DB_TABLE_REFRESH].find({}).to_list(None) == []
+
+
+@pytest.mark.anyio
+async def test_logout_of_other_worker(create_user):
+    user = await create_user()
+    token: Union[str, None] = account.createUserToken(user)
+    await refreshRevocations()
+    identified: Union[TokenDataObject, None] = identify(token)
+    assert identified is not None
+    await account.logout(identified)
+    # the mirror of a worker, which has not seen the logout yet
+    revocationMirror.tokens.clear()
+    assert identify(token) is not None
+
+    await refreshRevocations()
+
+    assert identify(token) is None
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from app.db.backend import BulkUpdate
+from app.db.memoryDb import MemoryDatabase
+
+
+async def bulk_update_duplicate(ordered: bool):
+    collection = MemoryDatabase()["user"]
+    await collection.create_index([("username", 1)], unique=True)
+    updates = [
+        BulkUpdate({"username": "john_doo"}, {"$set": {"lastLogin": 1}}, upsert=True),
+        BulkUpdate({"name": "john"}, {"$set": {"username": "john_doo"}}, upsert=True),
+        BulkUpdate({"username": "jane_doo"}, {"$set": {"lastLogin": 1}}, upsert=True),
+    ]
+    with pytest.raises(BulkWriteError) as error:
+        await collection.bulk_update(updates, ordered=ordered)
+    return error.value.details, len(await collection.find({}).to_list(None))
+
+
+@pytest.mark.parametrize("ordered,upserted", [(True, 1), (False, 2)])
+def test_bulk_update_duplicate_key(ordered, upserted):
+    details, count = asyncio.run(bulk_update_duplicate(ordered))
+
+    assert [error["index"] for error in details["writeErrors"]] == [1]
+    assert details["nUpserted"] == upserted
+    assert count == upserted
+
+
+def test_bulk_update_first_match():
+    async def update():
+        collection = MemoryDatabase()["user"]
+        for username in ["john_doo", "jane_doo"]:
+            await collection.insert_one({"username": username, "status": "NEW", "lastLogin": 1})
+        result = await collection.bulk_update([BulkUpdate({"status": "NEW"}, {"$max": {"lastLogin": 2}})])
+        return result, await collection.find({}, sort=[("username", 1)]).to_list(None)
+
+    result, users = asyncio.run(update())
+
+    assert result.matched_count == 1
+    assert sorted(user["lastLogin"] for user in users) == [1, 2]
+
+
+def test_projection_of_id_only():
+    async def find():
+        collection = MemoryDatabase()["user"]
+        await collection.insert_one({"username": "john_doo", "id": "stale"})
+        return await collection.find_one({"username": "john_doo"}, {"_id": 1})
+
+    assert list(asyncio.run(find()).keys()) == ["_id"]
@@ -0,0 +1,42 @@
+from typing import Any
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import app.persist.account.services.account as account
+from app.middleware.token import middlewareToken
+from app.persist.account.schemas.request import RequestLoginSchema
+from app.routes import metrics
+from app.utils.api.exceptionHandler import InitExceptionHandler
+from app.utils.api.passwordService import passwordService
+from app.utils.config import settings
+
+
+async def login(username: str) -> str:
+    result: Any = await account.login(RequestLoginSchema(username=username, password="password", authCode=None))
+    assert result.httpCode == 200
+    token: str = result.msg.RESULT.token
+    return token
+
+
+@pytest.mark.anyio
+async def test_metrics_only_for_admins(create_user, monkeypatch):
+    async def verify(plain_password: str, hashed_password: str) -> bool:
+        return True
+
+    monkeypatch.setattr(passwordService, "verify", verify)
+    monkeypatch.setattr(account, "password_needs_update", lambda hashed_password: False)
+    await create_user("admin_doo", isAdmin=True)
+    await create_user("john_doo")
+    app: FastAPI = FastAPI()
+    InitExceptionHandler(app)
+    middlewareToken(app)
+    app.include_router(metrics.router)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        admin = await client.get("/internal/metrics", headers={settings.TOKEN_API_NAME: await login("admin_doo")})
+        user = await client.get("/internal/metrics", headers={settings.TOKEN_API_NAME: await login("john_doo")})
+
+    assert admin.status_code == 200
+    assert user.status_code == 401
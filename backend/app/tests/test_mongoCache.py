@@ -0,0 +1,44 @@
+import time
+from typing import Any, Dict
+
+from app.db.mongoCache import EntityCache
+
+
+class Entity(Dict[str, Any]):
+    pass
+
+
+class OtherEntity(Dict[str, Any]):
+    pass
+
+
+def test_entity_ttl(monkeypatch):
+    cache: EntityCache = EntityCache(max_size=10, ttl_seconds=30)
+    cache.enable(Entity, ttl_seconds=1)
+    cache.enable(OtherEntity)
+    now: float = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    cache.put("entity", "table", 1, Entity(id=1), cache.generation("table"))
+    cache.put("other", "table", 2, OtherEntity(id=2), cache.generation("table"))
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 2)
+    assert cache.get("entity") is None
+    assert cache.get("other") == {"id": 2}
+
+
+def test_entity_ttl_zero_disables():
+    cache: EntityCache = EntityCache(max_size=10, ttl_seconds=30)
+    cache.enable(Entity)
+    cache.enable(Entity, ttl_seconds=0)
+
+    assert not cache.is_enabled(Entity)
+
+
+def test_clear():
+    cache: EntityCache = EntityCache(max_size=10, ttl_seconds=30)
+    cache.enable(Entity)
+    cache.put("entity", "table", 1, Entity(id=1), cache.generation("table"))
+    cache.clear()
+
+    assert cache.get("entity") is None
+    assert cache.snapshot()["size"] == 0
@@ -0,0 +1,43 @@
+from typing import List
+
+import pytest
+
+import app.persist.account.services.account as account
+from app.persist.account.models.user import UserEntity
+
+
+@pytest.mark.anyio
+async def test_find_iter(create_user):
+    for username in ["john_doo", "jane_doo", "jack_doo"]:
+        await create_user(username, totpToken="secret")
+
+    users: List[UserEntity] = [
+        user
+        async for user in account.conn.find_iter(
+            filter={"username": {"$ne": "jack_doo"}},
+            entity=UserEntity,
+            table_name=account.DB_TABLE,
+            batch_size=1,
+            projection={"username": 1, "totpToken": 1},
+            sort=[("username", 1)],
+            trusted=True,
+        )
+    ]
+
+    assert [user.username for user in users] == ["jane_doo", "john_doo"]
+    assert all(isinstance(user, UserEntity) and user.totpToken == "secret" for user in users)
+
+
+@pytest.mark.anyio
+async def test_find_iter_limit(create_user):
+    for username in ["john_doo", "jane_doo", "jack_doo"]:
+        await create_user(username)
+
+    users: List[UserEntity] = [
+        user
+        async for user in account.conn.find_iter(
+            filter={}, entity=UserEntity, table_name=account.DB_TABLE, limit=2
+        )
+    ]
+
+    assert len(users) == 2
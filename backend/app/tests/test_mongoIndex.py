@@ -0,0 +1,28 @@
+from typing import Any, Dict
+
+import pytest
+
+from app.db.memoryDb import MemoryDatabase
+from app.db.mongoIndex import IndexRegistry
+from app.persist.account.models.user import UserEntity
+
+
+async def usernameIndex(recreate: bool) -> Dict[str, Any]:
+    database: MemoryDatabase = MemoryDatabase()
+    await database["account"].create_index([("username", 1)], name="username_1")
+    registry: IndexRegistry = IndexRegistry()
+    registry.register("account", UserEntity)
+
+    await registry.sync(database, recreate=recreate)
+    indexes: Dict[str, Dict[str, Any]] = await database["account"].index_information()
+    return indexes["username_1"]
+
+
+@pytest.mark.anyio
+async def test_different_index_is_kept():
+    assert not (await usernameIndex(recreate=False)).get("unique", False)
+
+
+@pytest.mark.anyio
+async def test_different_index_is_recreated():
+    assert (await usernameIndex(recreate=True))["unique"]
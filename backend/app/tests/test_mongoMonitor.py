@@ -0,0 +1,24 @@
+from types import SimpleNamespace
+
+from app.db.mongoMonitor import CommandMetricsListener
+
+
+def event(command_name, request_id, **kwargs):
+    return SimpleNamespace(command_name=command_name, connection_id=("localhost", 27017), request_id=request_id, **kwargs)
+
+
+def test_command_metrics_per_collection():
+    listener = CommandMetricsListener(slow_query_ms=50)
+
+    listener.started(event("find", 1, command={"find": "user", "filter": {"username": "john_doo"}}))
+    listener.succeeded(event("find", 1, duration_micros=80_000, reply={"cursor": {"firstBatch": [{}]}}))
+    listener.started(event("delete", 2, command={"delete": "user", "deletes": [{"q": {"_id": 1}}]}))
+    listener.failed(event("delete", 2, duration_micros=1_000))
+
+    commands = listener.snapshot()["commands"]
+    assert commands["find:user"]["docs_returned"] == 1
+    assert commands["find:user"]["slow"] == 1
+    assert commands["find:user"]["latency"]["count"] == 1
+    assert commands["delete:user"]["failures"] == 1
+    assert commands["delete:user"]["slow"] == 0
+    assert listener.in_flight == {}
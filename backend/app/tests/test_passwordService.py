@@ -0,0 +1,51 @@
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+import pytest
+from pydantic import EmailStr
+
+import app.persist.account.services.account as account
+import app.utils.api.passwordService as passwordServiceModule
+from app.persist.account.schemas.request import RequestLoginSchema, RequestRegistrationSchema
+from app.utils.api.passwordService import PasswordService, passwordService
+from app.utils.api.responseCatalog import SERVICE_BUSY_503
+from app.utils.api.securityHelper import create_pwd_context
+
+
+class BrokenExecutor(Executor):
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> "Future[Any]":
+        raise BrokenProcessPool("a child process terminated abruptly")
+
+
+@pytest.mark.anyio
+async def test_full_queue_answers_busy(create_user, monkeypatch):
+    await create_user()
+    monkeypatch.setattr(passwordService, "pending", passwordService.queue_size)
+
+    login: Any = await account.login(RequestLoginSchema(username="john_doo", password="password", authCode=None))
+    registration: Any = await account.registration(
+        RequestRegistrationSchema(
+            name="jane", surname="doo", username="jane_doo", password="password", email=EmailStr("jane@example.gg")
+        )
+    )
+
+    assert login is SERVICE_BUSY_503
+    assert registration is SERVICE_BUSY_503
+    assert passwordService.stats["rejected"] >= 2
+
+
+@pytest.mark.anyio
+async def test_broken_pool_is_replaced(monkeypatch):
+    monkeypatch.setattr(passwordServiceModule, "ProcessPoolExecutor", lambda **kwargs: ThreadPoolExecutor(1))
+    service: PasswordService = PasswordService(workers=1, queue_size=2)
+    service.executor = BrokenExecutor()
+    hashed: str = create_pwd_context(bcrypt_rounds=4).hash("password")
+
+    try:
+        assert await service.verify("password", hashed)
+        assert isinstance(service.executor, ThreadPoolExecutor)
+        assert service.stats["restarts"] == 1
+        assert service.pending == 0
+    finally:
+        service.shutdown()
@@ -0,0 +1,24 @@
+import asyncio
+
+import pytest
+
+from app.utils.api.qrService import QR_FACTORIES, QrService
+
+DATA: str = "otpauth://totp/vm_api:john_doo?secret=JBSWY3DPEHPK3PXP&issuer=vm_api"
+
+
+@pytest.mark.parametrize("factory", QR_FACTORIES + [None])
+def test_render_every_factory(factory):
+    service = QrService(factory=factory, filled=False, version=1, box_size=4, border=2, fit=True, workers=1)
+    try:
+        result = asyncio.run(service.create(DATA))
+    finally:
+        service.shutdown()
+
+    assert result is not None
+    if factory == "png":
+        assert result.startswith("data:image/png;base64,")
+    else:
+        assert not result.startswith("b'")
+        assert "<" in result and "svg" in result
+    assert service.stats == {"rendered": 1, "failed": 0}
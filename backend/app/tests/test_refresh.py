@@ -0,0 +1,61 @@
+from typing import Any, Union
+
+import pytest
+
+import app.persist.account.services.account as account
+from app.persist.account.schemas.request import RequestRefreshSchema
+from app.utils.api.responseCatalog import ACCESS_FAILED_401
+from app.utils.api.securityHelper import TokenDataObject
+from app.utils.api.tokenCache import validateTokenCached
+from app.utils.config import settings
+
+
+async def refreshToken(user: Any) -> str:
+    token: Union[str, None] = await account.createRefreshToken(str(user.id), user.username)
+    assert token is not None
+    return token
+
+
+async def refresh(token: str) -> Any:
+    return await account.refresh(RequestRefreshSchema(refreshToken=token))
+
+
+@pytest.mark.anyio
+async def test_refresh_rotates(create_user):
+    user = await create_user(isAdmin=True)
+    token: str = await refreshToken(user)
+
+    result: Any = await refresh(token)
+    identified: Union[TokenDataObject, None] = validateTokenCached(result.msg.RESULT.token)
+
+    assert result.httpCode == 200
+    assert result.msg.RESULT.refreshToken != token
+    assert identified is not None and identified.id == str(user.id) and identified.isAdmin
+    assert (await refresh(result.msg.RESULT.refreshToken)).httpCode == 200
+
+
+@pytest.mark.anyio
+async def test_refresh_token_is_used_once(create_user):
+    user = await create_user()
+    token: str = await refreshToken(user)
+
+    assert (await refresh(token)).httpCode == 200
+    assert await refresh(token) is ACCESS_FAILED_401
+
+
+@pytest.mark.anyio
+async def test_expired_refresh_token(create_user, monkeypatch):
+    user = await create_user()
+    monkeypatch.setattr(settings, "REFRESH_TOKEN_EXPIRE_DAYS", -1)
+    token: str = await refreshToken(user)
+
+    assert await refresh(token) is ACCESS_FAILED_401
+
+
+@pytest.mark.anyio
+async def test_refresh_after_remove(create_user):
+    user = await create_user()
+    token: str = await refreshToken(user)
+    await account.remove(TokenDataObject(id=str(user.id), username=user.username))
+
+    assert await refresh(token) is ACCESS_FAILED_401
@@ -0,0 +1,67 @@
+import asyncio
+from typing import Any, List
+
+import pytest
+from fastapi import Response
+from pydantic import EmailStr
+
+import app.persist.account.services.account as account
+from app.persist.account.schemas.request import RequestRegistrationSchema
+from app.routes.account import register
+from app.utils.api.passwordService import passwordService
+from app.utils.api.responseCatalog import USERNAME_TAKEN_400
+
+PARALLEL_REGISTRATIONS: int = 300
+
+
+@pytest.mark.anyio
+async def test_parallel_registration_same_username(database, monkeypatch):
+    # hashing is not under test, keep it fast and without worker processes
+    async def hash(password: str) -> str:
+        return f"hashed:{password}"
+
+    monkeypatch.setattr(passwordService, "hash", hash)
+
+    responses: List[Response] = [Response() for _ in range(PARALLEL_REGISTRATIONS)]
+    await asyncio.gather(
+        *[
+            register(
+                RequestRegistrationSchema(
+                    name="john",
+                    surname="doo",
+                    username="john_doo",
+                    password="mySecretPw",
+                    email=EmailStr("john@example.gg"),
+                ),
+                response,
+            )
+            for response in responses
+        ]
+    )
+    status_codes: List[int] = [response.status_code for response in responses]
+    stored: List[Any] = await database[account.DB_TABLE].find({"username": "john_doo"}).to_list(None)
+
+    assert status_codes.count(200) == 1
+    assert status_codes.count(400) == PARALLEL_REGISTRATIONS - 1
+    assert len(stored) == 1
+
+
+@pytest.mark.anyio
+async def test_taken_username_is_not_hashed(create_user, monkeypatch):
+    hashed: List[str] = []
+
+    async def hash(password: str) -> str:
+        hashed.append(password)
+        return f"hashed:{password}"
+
+    monkeypatch.setattr(passwordService, "hash", hash)
+    await create_user("john_doo")
+
+    result: Any = await account.registration(
+        RequestRegistrationSchema(
+            name="john", surname="doo", username="john_doo", password="mySecretPw", email=EmailStr("john@example.gg")
+        )
+    )
+
+    assert result is USERNAME_TAKEN_400
+    assert hashed == []
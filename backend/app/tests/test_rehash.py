@@ -0,0 +1,66 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+import app.persist.account.services.account as account
+from app.persist.account.schemas.request import RequestLoginSchema
+from app.utils.api.passwordService import passwordService
+from app.utils.api.securityHelper import create_pwd_context, password_needs_update, verify_password
+from app.utils.config import settings
+
+# cheaper than configured, so it is rehashed on login
+OLD_HASH: str = create_pwd_context(bcrypt_rounds=4).hash("password")
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """ the password service without worker processes, new hashes are marked """
+    async def verify(plain_password: str, hashed_password: str) -> bool:
+        return verify_password(plain_password, hashed_password)
+
+    async def hash(password: str) -> str:
+        return f"rehashed:{password}"
+
+    monkeypatch.setattr(passwordService, "verify", verify)
+    monkeypatch.setattr(passwordService, "hash", hash)
+
+
+async def storedPassword(database: Any) -> str:
+    return str((await database[account.DB_TABLE].find_one({"username": "john_doo"}))["password"])
+
+
+def test_cheaper_hash_needs_update():
+    assert settings.PASSWORD_BCRYPT_ROUNDS != 4
+    assert password_needs_update(OLD_HASH)
+
+
+@pytest.mark.anyio
+async def test_login_rehashes_in_background(database, create_user, service):
+    await create_user(password=OLD_HASH)
+
+    result: Any = await account.login(RequestLoginSchema(username="john_doo", password="password", authCode=None))
+    await asyncio.gather(*account.rehashTasks)
+
+    assert result.httpCode == 200
+    assert await storedPassword(database) == "rehashed:password"
+
+
+@pytest.mark.anyio
+async def test_changed_password_is_not_overwritten(database, create_user, service):
+    user = await create_user(password="changed")
+
+    await account._rehashPassword(user.id, "password", OLD_HASH)
+
+    assert await storedPassword(database) == "changed"
+
+
+@pytest.mark.anyio
+async def test_rehash_is_skipped_when_busy(database, create_user, service, monkeypatch):
+    user = await create_user(password=OLD_HASH)
+    monkeypatch.setattr(passwordService, "pending", passwordService.queue_size // 2)
+
+    account.rehashPassword(user.id, "password", OLD_HASH)
+
+    assert len(account.rehashTasks) == 0
+    assert await storedPassword(database) == OLD_HASH
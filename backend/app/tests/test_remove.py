@@ -0,0 +1,19 @@
+from typing import Any, List
+
+import pytest
+
+import app.persist.account.services.account as account
+from app.utils.api.responseCatalog import ACCESS_FAILED_401, USER_REMOVED_200
+from app.utils.api.securityHelper import TokenDataObject
+
+
+@pytest.mark.anyio
+async def test_remove_user(database, create_user):
+    user = await create_user("jane_doo")
+    token = TokenDataObject(id=str(user.id), username=user.username)
+
+    results: List[Any] = [await account.remove(token), await account.remove(token)]
+    stored: List[Any] = await database[account.DB_TABLE].find({"username": "jane_doo"}).to_list(None)
+
+    assert results == [USER_REMOVED_200, ACCESS_FAILED_401]
+    assert len(stored) == 0
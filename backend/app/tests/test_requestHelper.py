@@ -0,0 +1,78 @@
+from typing import Any, Union
+
+import pytest
+from fastapi import Response
+
+from app.persist.account.schemas.request import RequestLoginSchema
+from app.utils.api.requestHelper import routeHandler
+from app.utils.api.responseCatalog import API_FUNCTION_ERROR_500, USER_REMOVED_200
+from app.utils.api.responseHelper import ResponseHolderObject, responseHandler
+from app.utils.api.securityHelper import TokenDataObject
+
+
+async def withTokenAndKeys(token: TokenDataObject, items: RequestLoginSchema) -> Union[ResponseHolderObject, None]:
+    return responseHandler([], 201 if token.username == items.username else 400)
+
+
+async def withToken(token: TokenDataObject) -> Union[ResponseHolderObject, None]:
+    return USER_REMOVED_200
+
+
+async def withStatus(code: int) -> Union[ResponseHolderObject, None]:
+    return responseHandler([], code)
+
+
+async def withNone() -> Union[ResponseHolderObject, None]:
+    return None
+
+
+def test_signature_is_resolved_once():
+    with pytest.raises(TypeError):
+        routeHandler(withToken, keysNeeded=RequestLoginSchema, withToken=True)
+    with pytest.raises(TypeError):
+        routeHandler(withTokenAndKeys, keysNeeded=RequestLoginSchema)
+    with pytest.raises(TypeError):
+        routeHandler(withToken, keysNeeded=RequestLoginSchema)
+
+
+@pytest.mark.anyio
+async def test_token_and_keys():
+    handler = routeHandler(withTokenAndKeys, keysNeeded=RequestLoginSchema, withToken=True)
+    response: Response = Response()
+
+    await handler(
+        response, TokenDataObject(username="john_doo"), RequestLoginSchema(username="john_doo", password="pw", authCode=None)
+    )
+
+    assert response.status_code == 201
+
+
+@pytest.mark.anyio
+async def test_static_response_is_sent_as_is():
+    response: Response = Response()
+
+    result: Any = await routeHandler(withToken, withToken=True)(response, TokenDataObject())
+
+    assert isinstance(result, Response)
+    assert result.body == USER_REMOVED_200.body
+    assert result.status_code == 200
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("code,expected", [(404, 404), (299, 500), (1008, 1008)])
+async def test_status_is_validated(code, expected):
+    response: Response = Response()
+
+    await routeHandler(withStatus, keysNeeded=int)(response, code)
+
+    assert response.status_code == expected
+
+
+@pytest.mark.anyio
+async def test_none_is_an_error():
+    response: Response = Response()
+
+    result: Any = await routeHandler(withNone)(response)
+
+    assert response.status_code == 500
+    assert result.body == API_FUNCTION_ERROR_500.body
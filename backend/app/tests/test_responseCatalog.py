@@ -0,0 +1,45 @@
+import json
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse
+
+import app.utils.api.responseCatalog as responseCatalog
+from app.utils.api.exceptionHandler import InitExceptionHandler, UnicornException
+from app.utils.api.requestHelper import STATUS_CODES
+from app.utils.api.responseHelper import ResponseStaticObject
+
+CATALOG: List[ResponseStaticObject] = [
+    value for value in vars(responseCatalog).values() if isinstance(value, ResponseStaticObject)
+]
+
+
+@pytest.mark.parametrize("response", CATALOG)
+def test_body_is_the_serialized_msg(response):
+    # same json as a response build per call, as 'routeHandler' did before
+    assert json.loads(response.body) == json.loads(JSONResponse(jsonable_encoder(response.msg)).body)
+    assert response.httpCode in STATUS_CODES
+
+
+def test_exception_sends_static_body():
+    app: FastAPI = FastAPI()
+    InitExceptionHandler(app)
+
+    @app.get("/")
+    async def decline() -> None:
+        raise UnicornException(
+            status_code=responseCatalog.ACCESS_FAILED_401.httpCode,
+            detail=responseCatalog.ACCESS_FAILED_401.msg,
+            headers={"x-test": "1"},
+            body=responseCatalog.ACCESS_FAILED_401.body,
+        )
+
+    response = TestClient(app).get("/")
+
+    assert response.status_code == 401
+    assert response.content == responseCatalog.ACCESS_FAILED_401.body
+    assert response.headers["content-type"] == "application/json"
+    assert response.headers["x-test"] == "1"
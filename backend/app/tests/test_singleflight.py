@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, List
+
+import pytest
+
+import app.persist.account.services.account as account
+from app.db.singleflight import Singleflight, keyName
+from app.db.singleflight import singleflight as globalSingleflight
+from app.persist.account.models.user import UserEntity
+
+
+async def cancel_leader():
+    singleflight = Singleflight(max_keys=10)
+    release = asyncio.Event()
+
+    async def query():
+        await release.wait()
+        return {"username": "john_doo"}
+
+    leader = asyncio.ensure_future(singleflight.do("key", "name", query))
+    await asyncio.sleep(0)
+    waiter = asyncio.ensure_future(singleflight.do("key", "name", query))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    result = await waiter
+    await asyncio.sleep(0)
+    return leader.cancelled(), result, singleflight.snapshot()
+
+
+def test_cancelled_leader_does_not_cancel_waiters():
+    leader_cancelled, result, snapshot = asyncio.run(cancel_leader())
+
+    assert leader_cancelled
+    assert result == {"username": "john_doo"}
+    assert snapshot["queries"] == 1
+    assert snapshot["shared"] == 1
+    assert snapshot["in_flight"] == 0
+
+
+@pytest.mark.anyio
+async def test_identical_reads_share_one_query(create_user):
+    await create_user("john_doo")
+    queries: int = globalSingleflight.stats["queries"]
+
+    users: List[Any] = await asyncio.gather(
+        *[
+            account.conn.find_one(
+                filter={"username": "john_doo"},
+                entity=UserEntity,
+                table_name=account.DB_TABLE,
+                projection={"username": 1},
+                trusted=True,
+                coalesce=True,
+            )
+            for _ in range(10)
+        ]
+    )
+
+    assert globalSingleflight.stats["queries"] == queries + 1
+    assert all(user.username == "john_doo" for user in users)
+    # every caller gets its own copy
+    assert len({id(user) for user in users}) == 10
+    assert "john_doo" not in repr(globalSingleflight.snapshot())
+
+
+def test_key_name_has_no_values():
+    name: str = keyName("account", {"username": "john_doo", "status": {"$in": ["NEW", "ACTIVE"]}})
+
+    assert name == "account:{'username': '?', 'status': {'$in': '?'}}"
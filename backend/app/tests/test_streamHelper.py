@@ -0,0 +1,56 @@
+import json
+from typing import AsyncIterator, List
+
+import pytest
+from pydantic import BaseModel
+
+from app.utils.api.streamHelper import ndjsonLines, ndjsonResponse
+
+
+class Item(BaseModel):
+    name: str
+    secret: str
+
+
+async def items(count: int) -> AsyncIterator[Item]:
+    for index in range(count):
+        yield Item(name=f"item{index}", secret="secret")
+
+
+async def broken() -> AsyncIterator[Item]:
+    yield Item(name="item0", secret="secret")
+    raise RuntimeError("connection lost")
+
+
+@pytest.mark.anyio
+async def test_ndjson_lines_chunks():
+    chunks: List[str] = [chunk async for chunk in ndjsonLines(items(5), chunk_size=2)]
+
+    assert [chunk.count("\n") for chunk in chunks] == [2, 2, 1]
+    assert [json.loads(line)["name"] for line in "".join(chunks).splitlines()] == [f"item{i}" for i in range(5)]
+
+
+@pytest.mark.anyio
+async def test_ndjson_lines_exclude():
+    chunks: List[str] = [chunk async for chunk in ndjsonLines(items(2), exclude={"secret"})]
+
+    assert [json.loads(line) for line in "".join(chunks).splitlines()] == [{"name": "item0"}, {"name": "item1"}]
+
+
+@pytest.mark.anyio
+async def test_ndjson_lines_cut_on_error():
+    chunks: List[str] = [chunk async for chunk in ndjsonLines(broken())]
+
+    assert chunks == []
+
+
+@pytest.mark.anyio
+async def test_ndjson_response():
+    response = ndjsonResponse(items(3), include={"name"}, headers={"x-count": "3"})
+    chunks: List[str] = [str(chunk) async for chunk in response.body_iterator]
+
+    assert response.media_type == "application/x-ndjson"
+    assert response.headers["x-count"] == "3"
+    assert [json.loads(line) for line in "".join(chunks).splitlines()] == [
+        {"name": "item0"}, {"name": "item1"}, {"name": "item2"}
+    ]
@@ -0,0 +1,95 @@
+import ipaddress
+import time
+from typing import Any, AsyncIterator, List
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+import app.middleware.throttle as throttle
+from app.persist.account.schemas.request import RequestLoginSchema
+from app.utils.api.exceptionHandler import InitExceptionHandler
+from app.utils.api.rateLimiter import TokenBucketLimiter
+
+
+@pytest.fixture
+async def client() -> AsyncIterator[httpx.AsyncClient]:
+    """ a login route, only with the throttle, called from 10.0.0.1 """
+    app: FastAPI = FastAPI()
+    InitExceptionHandler(app)
+
+    @app.post("/login", dependencies=[Depends(throttle.middlewareLoginThrottle)])
+    async def login(items: RequestLoginSchema) -> Any:
+        return {}
+
+    throttle.loginUserLimiter.buckets.clear()
+    throttle.loginIpLimiter.buckets.clear()
+    transport: httpx.ASGITransport = httpx.ASGITransport(app=app, client=("10.0.0.1", 1234))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+async def login(client: httpx.AsyncClient, username: str, ip: str = "10.0.0.2") -> httpx.Response:
+    return await client.post(
+        "/login", json={"username": username, "password": "password"}, headers={"X-Real-IP": ip}
+    )
+
+
+@pytest.mark.anyio
+async def test_username_bucket(client):
+    responses: List[httpx.Response] = [await login(client, "john_doo") for _ in range(6)]
+
+    assert [response.status_code for response in responses] == [200] * 5 + [429]
+    assert responses[-1].headers["Retry-After"] == "10"
+    assert (await login(client, "jane_doo")).status_code == 200
+
+
+@pytest.mark.anyio
+async def test_username_is_case_insensitive(client):
+    for _ in range(5):
+        assert (await login(client, "John_Doo")).status_code == 200
+
+    assert (await login(client, "john_doo")).status_code == 429
+
+
+@pytest.mark.anyio
+async def test_ip_bucket(client):
+    responses: List[httpx.Response] = [await login(client, f"user{index}") for index in range(21)]
+
+    assert [response.status_code for response in responses] == [200] * 20 + [429]
+    assert responses[-1].headers["Retry-After"] == "1"
+
+
+@pytest.mark.anyio
+async def test_real_ip_of_untrusted_peer_is_ignored(client, monkeypatch):
+    monkeypatch.setattr(throttle, "TRUSTED_PROXIES", [])
+    responses: List[httpx.Response] = [
+        await login(client, f"user{index}", ip=f"10.0.1.{index}") for index in range(21)
+    ]
+
+    assert responses[-1].status_code == 429
+
+
+@pytest.mark.anyio
+async def test_real_ip_of_trusted_proxy(client, monkeypatch):
+    monkeypatch.setattr(throttle, "TRUSTED_PROXIES", [ipaddress.ip_network("10.0.0.0/24")])
+    responses: List[httpx.Response] = [
+        await login(client, f"user{index}", ip=f"10.0.1.{index}") for index in range(21)
+    ]
+
+    assert all(response.status_code == 200 for response in responses)
+
+
+def test_bucket_refill_and_eviction(monkeypatch):
+    limiter: TokenBucketLimiter = TokenBucketLimiter(name="test", rate_per_minute=60, burst=1, max_keys=1)
+    now: float = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("a") == pytest.approx(1)
+    monkeypatch.setattr(time, "monotonic", lambda: now + 1)
+    assert limiter.acquire("a") == 0
+    # 'b' evicts 'a', which starts again with a full bucket
+    assert limiter.acquire("b") == 0
+    assert limiter.acquire("a") == 0
+    assert limiter.snapshot()["evictions"] == 2
@@ -0,0 +1,35 @@
+from typing import Any, Dict, List, Tuple, Union
+
+from app.middleware.token import TOKEN_NAME, extractToken
+
+
+def scope(headers: Union[List[Tuple[bytes, bytes]], None] = None, query: str = "") -> Dict[str, Any]:
+    return {"type": "http", "headers": headers or [], "query_string": query.encode("latin-1")}
+
+
+HEADER: Tuple[bytes, bytes] = (TOKEN_NAME.lower().encode("latin-1"), b"from-header")
+COOKIE: Tuple[bytes, bytes] = (b"cookie", f"other=1; {TOKEN_NAME}=from-cookie".encode("latin-1"))
+
+
+def test_header_before_query_and_cookie():
+    assert extractToken(scope([COOKIE, HEADER], f"{TOKEN_NAME}=from-query")) == "from-header"
+
+
+def test_query_before_cookie():
+    assert extractToken(scope([COOKIE], f"other=1&{TOKEN_NAME}=from-query")) == "from-query"
+
+
+def test_cookie():
+    assert extractToken(scope([COOKIE])) == "from-cookie"
+
+
+def test_missing():
+    assert extractToken(scope([(b"cookie", b"other=1")], "other=1")) is None
+
+
+def test_cookie_value_is_not_unquoted():
+    assert extractToken(scope([(b"cookie", f"{TOKEN_NAME}=a%2Bb".encode("latin-1"))])) == "a%2Bb"
+
+
+def test_query_value_is_unquoted():
+    assert extractToken(scope(query=f"{TOKEN_NAME}=a%2Bb")) == "a+b"
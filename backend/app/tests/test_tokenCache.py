@@ -0,0 +1,57 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Union
+
+from app.utils.api.securityHelper import TokenDataObject, TokenObject, create_access_token
+from app.utils.api.tokenCache import TokenCache, tokenCache, validateTokenCached
+
+
+def user(exp: datetime) -> TokenDataObject:
+    return TokenDataObject(id="1", username="john_doo", isAdmin=False, exp=exp)
+
+
+def test_entry_is_evicted_at_exp(monkeypatch):
+    cache: TokenCache = TokenCache(max_size=10)
+    exp: datetime = datetime.now(timezone.utc) + timedelta(seconds=60)
+    cache.put(b"key", user(exp))
+
+    monkeypatch.setattr(time, "time", lambda: exp.timestamp() - 1)
+    assert cache.get(b"key") is not None
+    monkeypatch.setattr(time, "time", lambda: exp.timestamp())
+    assert cache.get(b"key") is None
+    assert cache.snapshot()["expired"] == 1
+    assert cache.snapshot()["size"] == 0
+
+
+def test_lru_eviction():
+    cache: TokenCache = TokenCache(max_size=2)
+    exp: datetime = datetime.now(timezone.utc) + timedelta(seconds=60)
+    for key in [b"a", b"b"]:
+        cache.put(key, user(exp))
+    cache.get(b"a")
+    cache.put(b"c", user(exp))
+
+    assert cache.get(b"b") is None
+    assert cache.get(b"a") is not None
+    assert cache.snapshot()["evictions"] == 1
+
+
+def test_token_without_exp_is_not_cached():
+    cache: TokenCache = TokenCache(max_size=10)
+    cache.put(b"key", TokenDataObject(id="1", username="john_doo"))
+
+    assert cache.get(b"key") is None
+
+
+def test_cached_copy_is_not_shared():
+    token: Union[TokenObject, None] = create_access_token(data=TokenDataObject(id="1", username="john_doo"))
+    assert token is not None
+    tokenCache.clear()
+
+    first: Union[TokenDataObject, None] = validateTokenCached(token.access_token)
+    assert first is not None
+    first.isAdmin = True
+    second: Union[TokenDataObject, None] = validateTokenCached(token.access_token)
+
+    assert second is not None and not second.isAdmin
+    assert tokenCache.key(token.access_token) in tokenCache.entries
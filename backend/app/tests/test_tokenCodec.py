@@ -0,0 +1,17 @@
+from app.utils.api.tokenCodec import TokenCodec, parseVerifyKeys
+
+
+def test_verify_keys_may_contain_commas():
+    keys = parseVerifyKeys('{"old": "secret,with=commas", "older": "other"}')
+
+    assert keys == {"old": "secret,with=commas", "older": "other"}
+    assert parseVerifyKeys(None) == {}
+
+
+def test_decode_with_rotated_key():
+    old = TokenCodec(algorithm="HS256", kid="old", signing_key="secret,with=commas", verify_keys={})
+    current = TokenCodec(
+        algorithm="HS256", kid="new", signing_key="new-secret", verify_keys={"old": "secret,with=commas"}
+    )
+
+    assert current.decode(old.encode({"username": "john_doo"})) == {"username": "john_doo"}
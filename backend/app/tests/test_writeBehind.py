@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+import pytest
+
+import app.persist.account.services.account as account
+from app.db.mongoDbAsync import AsyncDBConnection
+from app.db.writeBehind import WriteBehindBuffer
+
+NOW: datetime = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def buffer(max_entries: int = 10) -> WriteBehindBuffer:
+    return WriteBehindBuffer(name="test", table_name=account.DB_TABLE, field="lastLogin", max_entries=max_entries)
+
+
+async def lastLogin(database: Any, user: Any) -> Any:
+    return (await database[account.DB_TABLE].find_one({"_id": user.id}))["lastLogin"]
+
+
+@pytest.mark.anyio
+async def test_stamps_are_coalesced_with_max(database, create_user):
+    john = await create_user("john_doo", lastLogin=NOW - timedelta(days=1))
+    jane = await create_user("jane_doo", lastLogin=NOW + timedelta(days=1))
+    stamps: WriteBehindBuffer = buffer()
+    for minutes in [1, 3, 2]:
+        stamps.stamp(john.id, NOW + timedelta(minutes=minutes))
+    # older than the stored value, '$max' keeps the stored one
+    stamps.stamp(jane.id, NOW)
+
+    assert len(stamps.pending) == 2
+    assert await stamps.flush() == 2
+    assert await lastLogin(database, john) == NOW + timedelta(minutes=3)
+    assert await lastLogin(database, jane) == NOW + timedelta(days=1)
+    assert stamps.snapshot()["stamped"] == 4
+    assert stamps.snapshot()["pending"] == 0
+
+
+@pytest.mark.anyio
+async def test_failed_flush_is_put_back(database, create_user, monkeypatch):
+    john = await create_user()
+    stamps: WriteBehindBuffer = buffer()
+    stamps.stamp(john.id, NOW + timedelta(minutes=2))
+
+    async def bulk_update(*args: Any, **kwargs: Any) -> None:
+        # a newer stamp arrives while the flush is written
+        stamps.stamp(john.id, NOW + timedelta(minutes=1))
+        raise ConnectionError("no database connection")
+
+    monkeypatch.setattr(AsyncDBConnection, "bulk_update", bulk_update)
+
+    assert await stamps.flush() == 0
+    assert stamps.pending == {john.id: NOW + timedelta(minutes=2)}
+    assert stamps.stats["failures"] == 1
+
+
+@pytest.mark.anyio
+async def test_full_buffer_flushes_early(database, create_user):
+    users = [await create_user(f"user{index}", lastLogin=NOW - timedelta(days=1)) for index in range(2)]
+    stamps: WriteBehindBuffer = buffer(max_entries=2)
+    for user in users:
+        stamps.stamp(user.id, NOW)
+
+    assert stamps.flush_task is not None
+    assert await asyncio.wait_for(stamps.flush_task, 1) == 2
+    assert [await lastLogin(database, user) for user in users] == [NOW, NOW]
+
+
+@pytest.mark.anyio
+async def test_final_flush_on_shutdown(database, create_user):
+    from app.main import Application
+
+    john = await create_user(lastLogin=NOW - timedelta(days=1))
+    account.lastLoginBuffer.stamp(john.id, NOW)
+
+    await Application().scheduler_stop()
+
+    assert await lastLogin(database, john) == NOW
+    assert account.lastLoginBuffer.pending == {}
@@ -1,10 +1,11 @@
 import logging
-from typing import Dict
+from typing import Dict, Optional
 
 from fastapi import FastAPI, Request
-from starlette.responses import JSONResponse
+from starlette.responses import Response
 
 from app.schemas.response import ResponseSchema
+from app.utils.api.jsonResponse import responseClass
 
 
 # ------------------------------------------------------------------------------
@@ -15,11 +16,17 @@ from app.schemas.response import ResponseSchema
 class UnicornException(Exception):
 
     def __init__(
-        self, status_code: int, detail: ResponseSchema, headers: Dict[str, str]
+        self,
+        status_code: int,
+        detail: ResponseSchema,
+        headers: Dict[str, str],
+        body: Optional[bytes] = None,
     ):
         self.status_code = status_code
         self.detail = detail
         self.headers = headers
+        # serialized 'detail', of static responses (see 'responseCatalog')
+        self.body = body
 
 
 class InitExceptionHandler:
@@ -29,7 +36,14 @@ class InitExceptionHandler:
         @app.exception_handler(UnicornException)
         async def unicorn_exception_handler(_: Request, exc: UnicornException):
             try:
-                return JSONResponse(
+                if exc.body is not None:
+                    return Response(
+                        content=exc.body,
+                        status_code=exc.status_code,
+                        headers=exc.headers,
+                        media_type="application/json",
+                    )
+                return responseClass(
                     status_code=exc.status_code,
                     content=exc.detail.dict(),
                     headers=exc.headers,
@@ -0,0 +1,107 @@
+"""
+    response classes with a faster json encoder than 'json.dumps'
+    selected by 'JSON_RESPONSE' and set as default response class
+    of the app in 'Application.application':
+        - 'orjson' => 'OrjsonResponse' (needs 'orjson')
+        - 'msgspec' => 'MsgspecResponse' (needs 'msgspec')
+        - 'json' => starlette's 'JSONResponse'
+    falls back to 'json' when the encoder is not installed.
+    values json can not encode are converted like 'MongoModel.Config.json_encoders':
+    'ObjectId' => str, datetime => 'isoformat()'
+    (msgspec encodes datetimes it self, an UTC offset is written as 'Z')
+    Use: 'responseClass'
+"""
+import importlib
+import logging
+from datetime import date, datetime, time
+from types import ModuleType
+from typing import Any, Dict, Type, Union, cast
+
+from bson.objectid import ObjectId
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+from app.utils.config import settings
+
+
+def optionalImport(name: str) -> Union[ModuleType, None]:
+    """
+    the module or None if it is not installed
+    """
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+orjson: Union[ModuleType, None] = optionalImport("orjson")
+msgspec: Union[ModuleType, None] = optionalImport("msgspec")
+
+
+def jsonDefault(obj: Any) -> Any:
+    """
+    converts values the encoders do not know
+    """
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, BaseModel):
+        return obj.dict()
+    raise TypeError(f"type is not json serializable: {type(obj).__name__}")
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class OrjsonResponse(JSONResponse):
+    """
+    datetimes are passed to 'jsonDefault', so they are written as by pydantic
+    """
+
+    def render(self, content: Any) -> bytes:
+        assert orjson is not None
+        return cast(
+            bytes,
+            orjson.dumps(
+                content,
+                default=jsonDefault,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            ),
+        )
+
+
+class MsgspecResponse(JSONResponse):
+    """
+    the encoder is created once and shared
+    """
+    encoder: Any = msgspec.json.Encoder(enc_hook=jsonDefault) if msgspec is not None else None
+
+    def render(self, content: Any) -> bytes:
+        return cast(bytes, self.encoder.encode(content))
+
+
+RESPONSE_CLASSES: Dict[str, Type[JSONResponse]] = {
+    "json": JSONResponse,
+    "orjson": OrjsonResponse,
+    "msgspec": MsgspecResponse,
+}
+RESPONSE_MODULES: Dict[str, Any] = {"json": True, "orjson": orjson, "msgspec": msgspec}
+
+
+def createResponseClass(name: str = settings.JSON_RESPONSE) -> Type[JSONResponse]:
+    """
+    returns the response class by name, 'JSONResponse' if it is unknown or not installed
+    """
+    if name not in RESPONSE_CLASSES:
+        logging.log(logging.WARNING, f"unknown json response '{name}', using 'json'")
+        return JSONResponse
+    if RESPONSE_MODULES[name] is None:
+        logging.log(logging.WARNING, f"json response '{name}' is not installed, using 'json'")
+        return JSONResponse
+    return RESPONSE_CLASSES[name]
+
+
+responseClass: Type[JSONResponse] = createResponseClass()
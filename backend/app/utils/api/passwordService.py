@@ -0,0 +1,135 @@
+"""
+    async password hashing service
+    bcrypt is pure cpu work, so hashing and verifying runs in a
+    process pool ('PASSWORD_WORKERS') and not on the event loop.
+    calls are bounded by 'PASSWORD_QUEUE_SIZE' (running + waiting),
+    when full 'PasswordServiceBusy' is raised, to answer with 503
+    instead of queuing logins without limit.
+    a broken pool (a worker died, or could not be started) is
+    replaced and the call is tried once more.
+    Use: 'passwordService.hash' and 'passwordService.verify'
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Union
+
+from app.utils.api.securityHelper import get_password_hash, verify_password
+from app.utils.config import settings
+from app.utils.metricsHelper import LatencyHistogram, metricsRegistry
+
+
+class PasswordServiceBusy(Exception):
+    """
+    raised when the queue of the password service is full
+    """
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class PasswordService:
+    """
+    runs 'get_password_hash' and 'verify_password' in a process pool,
+    with a bounded queue as backpressure
+    """
+
+    def __init__(self, workers: int, queue_size: int) -> None:
+        self.workers: int = workers if workers > 0 else (os.cpu_count() or 1)
+        self.queue_size: int = queue_size
+        self.executor: Union[Executor, None] = None
+        # running + waiting calls
+        self.pending: int = 0
+        self.hash_latency: LatencyHistogram = LatencyHistogram()
+        self.verify_latency: LatencyHistogram = LatencyHistogram()
+        self.stats: Dict[str, int] = {"hashed": 0, "verified": 0, "rejected": 0, "restarts": 0}
+
+    def start(self) -> None:
+        """
+        starts the worker processes, 'spawn' so the workers
+        do not inherit threads and connections of the app
+        """
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+            logging.log(logging.DEBUG, f"password service started with {self.workers} workers")
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait)
+            self.executor = None
+
+    def restart(self, broken: Union[Executor, None]) -> None:
+        """
+        replaces the broken pool, only once for all calls which failed with it
+        """
+        if self.executor is broken:
+            self.shutdown(wait=False)
+            self.stats["restarts"] += 1
+        self.start()
+
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        self.start()
+        executor: Union[Executor, None] = self.executor
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        except BrokenProcessPool as e:
+            logging.log(logging.CRITICAL, e, exc_info=True)
+            self.restart(executor)
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    async def _run(self, func: Callable[..., Any], latency: LatencyHistogram, *args: Any) -> Any:
+        if self.pending >= self.queue_size:
+            self.stats["rejected"] += 1
+            raise PasswordServiceBusy(f"password service queue is full ({self.queue_size})")
+        self.pending += 1
+        started: float = time.perf_counter()
+        try:
+            return await self._submit(func, *args)
+        finally:
+            self.pending -= 1
+            latency.observe((time.perf_counter() - started) * 1000)
+
+    # --------------------------------------------------------------------------
+    #
+    #
+    #
+    # --------------------------------------------------------------------------
+    async def hash(self, password: str) -> Union[str, None]:
+        """
+        hashes the password, None on failure
+        """
+        result: Union[str, None] = await self._run(get_password_hash, self.hash_latency, password)
+        self.stats["hashed"] += 1
+        return result
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        verifies the password against the hash
+        """
+        result: bool = await self._run(verify_password, self.verify_latency, plain_password, hashed_password)
+        self.stats["verified"] += 1
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "queue_depth": self.pending,
+            **self.stats,
+            "hash_latency": self.hash_latency.snapshot(),
+            "verify_latency": self.verify_latency.snapshot(),
+        }
+
+
+passwordService: PasswordService = PasswordService(
+    workers=settings.PASSWORD_WORKERS, queue_size=settings.PASSWORD_QUEUE_SIZE
+)
+metricsRegistry.register("password", passwordService.snapshot)
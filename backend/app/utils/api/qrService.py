@@ -0,0 +1,182 @@
+"""
+    async QR-code rendering service
+    'qr.make(fit=True)' and the image building are pure cpu work,
+    so rendering runs in a thread pool ('QR_WORKERS') and not on
+    the event loop. the renderer is selected once from 'QR_FACTORY':
+        - 'basic' => svg of rects (qrcode 'SvgImage', 'SvgFillImage')
+        - 'fragment' => svg fragment of rects (qrcode 'SvgFragmentImage')
+        - 'path' => svg of one path (qrcode 'SvgPathImage', 'SvgPathFillImage')
+        - 'compact' => minimal svg, one path with a run per row, 1 unit per module
+        - 'png' => png as data url (qrcode 'PilImage', needs pillow)
+    Use: 'await qrService.create(data)'
+"""
+import asyncio
+import base64
+import io
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Union
+
+import qrcode
+import qrcode.image.pil
+import qrcode.image.svg
+
+from app.utils.config import settings
+from app.utils.metricsHelper import LatencyHistogram, metricsRegistry
+
+QR_FACTORIES: List[str] = ["basic", "fragment", "path", "compact", "png"]
+
+
+def svgFactory(name: str, filled: bool) -> Any:
+    if name == "basic":
+        return qrcode.image.svg.SvgFillImage if filled else qrcode.image.svg.SvgImage
+    if name == "fragment":
+        return qrcode.image.svg.SvgFragmentImage
+    # combined path, fixes white space that may occur when zooming
+    return qrcode.image.svg.SvgPathFillImage if filled else qrcode.image.svg.SvgPathImage
+
+
+def compactSvg(matrix: List[List[bool]], box_size: int, filled: bool) -> str:
+    """
+    one path, every row is drawn as runs of dark modules
+    the border is part of the matrix, 'box_size' only sets the display size
+    """
+    size: int = len(matrix)
+    runs: List[str] = []
+    for y, row in enumerate(matrix):
+        x: int = 0
+        while x < size:
+            if row[x]:
+                start: int = x
+                while x < size and row[x]:
+                    x += 1
+                runs.append(f"M{start} {y}h{x - start}v1H{start}z")
+            else:
+                x += 1
+    background: str = '<rect width="100%" height="100%" fill="#fff"/>' if filled else ""
+    pixels: int = size * box_size
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" width="{pixels}" height="{pixels}" '
+        f'shape-rendering="crispEdges">{background}<path d="{"".join(runs)}"/></svg>'
+    )
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class QrService:
+    """
+    renders QR-codes with the renderer selected on creation
+    """
+
+    def __init__(
+        self,
+        factory: Union[str, None],
+        filled: bool,
+        version: int,
+        box_size: int,
+        border: int,
+        fit: bool,
+        workers: int,
+    ) -> None:
+        if factory is not None and factory not in QR_FACTORIES:
+            logging.log(logging.WARNING, f"unknown qr factory '{factory}', using 'path'")
+            factory = None
+        self.factory: str = factory or "path"
+        self.filled: bool = filled
+        self.version: int = version
+        self.box_size: int = box_size
+        self.border: int = border
+        self.fit: bool = fit
+        self.workers: int = max(1, workers)
+        self.executor: Union[ThreadPoolExecutor, None] = None
+        self.renderer: Callable[[qrcode.QRCode], str] = self.selectRenderer()
+        self.latency: LatencyHistogram = LatencyHistogram()
+        self.stats: Dict[str, int] = {"rendered": 0, "failed": 0}
+
+    def selectRenderer(self) -> Callable[[qrcode.QRCode], str]:
+        if self.factory == "compact":
+            return lambda qr: compactSvg(qr.get_matrix(), self.box_size, self.filled)
+        if self.factory == "png":
+
+            def png(qr: qrcode.QRCode) -> str:
+                buffer: io.BytesIO = io.BytesIO()
+                qr.make_image(image_factory=qrcode.image.pil.PilImage, fill_color="black", back_color="white").save(
+                    buffer
+                )
+                return f"data:image/png;base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
+
+            return png
+        factory: Any = svgFactory(self.factory, self.filled)
+
+        def svg(qr: qrcode.QRCode) -> str:
+            value: Union[bytes, str] = qr.make_image(
+                image_factory=factory, fill_color="black", back_color="white"
+            ).to_string()
+            return value.decode("utf-8") if isinstance(value, bytes) else value
+
+        return svg
+
+    def start(self) -> None:
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="qr")
+            logging.log(logging.DEBUG, f"qr service started with {self.workers} workers, factory '{self.factory}'")
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    # --------------------------------------------------------------------------
+    #
+    #
+    #
+    # --------------------------------------------------------------------------
+    def render(self, data: str) -> str:
+        """
+        renders synchronously, runs in the thread pool when called by 'create'
+        """
+        qr: qrcode.QRCode = qrcode.QRCode(version=self.version, box_size=self.box_size, border=self.border)
+        qr.add_data(data)
+        qr.make(fit=self.fit)
+        return self.renderer(qr)
+
+    async def create(self, data: str) -> Union[str, None]:
+        """
+        renders the QR-code of 'data', None on failure
+        """
+        self.start()
+        started: float = time.perf_counter()
+        try:
+            result: str = await asyncio.get_running_loop().run_in_executor(self.executor, self.render, data)
+            self.stats["rendered"] += 1
+            return result
+        except Exception as e:
+            self.stats["failed"] += 1
+            logging.log(logging.CRITICAL, e, exc_info=True)
+        finally:
+            self.latency.observe((time.perf_counter() - started) * 1000)
+        return None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "factory": self.factory,
+            "workers": self.workers,
+            **self.stats,
+            "latency": self.latency.snapshot(),
+        }
+
+
+qrService: QrService = QrService(
+    factory=settings.QR_FACTORY,
+    filled=settings.QR_FILLED,
+    version=settings.QR_VERSION,
+    box_size=settings.QR_BOX_SIZE,
+    border=settings.QR_BORDER,
+    fit=settings.QR_FIT,
+    workers=settings.QR_WORKERS,
+)
+metricsRegistry.register("qr", qrService.snapshot)
@@ -0,0 +1,58 @@
+"""
+    in process rate limiting with token buckets
+    one bucket per key (username, client ip, ...), held in a
+    bounded LRU, so idle keys are evicted first.
+    an evicted key starts again with a full bucket
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class TokenBucketLimiter:
+    """
+    each key may do 'burst' calls at once,
+    refilled with 'rate_per_minute' calls per minute
+    """
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int, max_keys: int) -> None:
+        self.name: str = name
+        self.rate: float = rate_per_minute / 60
+        self.burst: float = float(burst)
+        self.max_keys: int = max_keys
+        # key => (tokens, last update)
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats: Dict[str, int] = {"allowed": 0, "throttled": 0, "evictions": 0}
+
+    def acquire(self, key: str) -> float:
+        """
+        takes one token of the bucket of the key
+        returns 0 if allowed, else the seconds until the next token
+        """
+        now: float = time.monotonic()
+        with self.lock:
+            tokens, updated = self.buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                self.buckets[key] = (tokens - 1, now)
+                retry_after: float = 0.0
+                self.stats["allowed"] += 1
+            else:
+                self.buckets[key] = (tokens, now)
+                retry_after = (1 - tokens) / self.rate if self.rate > 0 else 60.0
+                self.stats["throttled"] += 1
+            self.buckets.move_to_end(key)
+            while len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+                self.stats["evictions"] += 1
+        return retry_after
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"keys": len(self.buckets), "max_keys": self.max_keys, **self.stats}
@@ -0,0 +1,129 @@
+"""
+    catalog of static responses
+    responses which are always the same (errors, declines) are build
+    and serialized once on import, services return them directly and
+    'routeHandler' sends their body without validation and serialization.
+    Use: return one of the constants (e.g. 'ACCESS_FAILED_401'),
+         or create new ones with 'staticResponse' on module level
+"""
+import json
+from typing import List
+
+from app.utils.api.responseHelper import (
+    ErrorTypeEnum,
+    MsgTypeEnum,
+    ResponseHandlerObject,
+    ResponseHolderObject,
+    ResponseStaticObject,
+    responseHandler,
+)
+
+
+def staticResponse(params: List[ResponseHandlerObject], code: int) -> ResponseStaticObject:
+    """
+    builds the response with 'responseHandler' and serializes
+    it like 'JSONResponse', only call it on module level
+    """
+    result: ResponseHolderObject = responseHandler(params, code)
+    body: bytes = json.dumps(
+        result.msg.dict(), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+    return ResponseStaticObject(httpCode=result.httpCode, msg=result.msg, body=body)
+
+
+def errorResponse(errorType: ErrorTypeEnum, code: int, stateType: ErrorTypeEnum) -> ResponseStaticObject:
+    return staticResponse(
+        [
+            ResponseHandlerObject(msgType=MsgTypeEnum.ERROR, errorType=errorType),
+            ResponseHandlerObject(msgType=MsgTypeEnum.STATE, errorType=stateType),
+        ],
+        code,
+    )
+
+
+def msgResponse(msg: str, code: int) -> ResponseStaticObject:
+    return staticResponse([ResponseHandlerObject(msgType=MsgTypeEnum.ERROR, msg=msg)], code)
+
+
+# ------------------------------------------------------------------------------
+#
+# API
+#
+# ------------------------------------------------------------------------------
+API_FUNCTION_ERROR_500: ResponseStaticObject = errorResponse(
+    ErrorTypeEnum.API_FUNCTION_ERROR, 500, ErrorTypeEnum.INTERNAL_ERROR
+)
+SERVICE_BUSY_503: ResponseStaticObject = staticResponse(
+    [ResponseHandlerObject(msgType=MsgTypeEnum.ERROR, errorType=ErrorTypeEnum.SERVICE_BUSY)], 503
+)
+TOO_MANY_REQUESTS_429: ResponseStaticObject = errorResponse(
+    ErrorTypeEnum.TOO_MANY_REQUESTS, 429, ErrorTypeEnum.ACCESS_DECLINE
+)
+
+# ------------------------------------------------------------------------------
+#
+# AUTH
+#
+# ------------------------------------------------------------------------------
+ACCESS_FAILED_401: ResponseStaticObject = errorResponse(
+    ErrorTypeEnum.ACCESS_FAILED, 401, ErrorTypeEnum.ACCESS_DECLINE
+)
+TOTP_DECLINE_401: ResponseStaticObject = errorResponse(
+    ErrorTypeEnum.TOTP_DECLINE, 401, ErrorTypeEnum.ACCESS_DECLINE
+)
+TOKEN_EMPTY_401: ResponseStaticObject = errorResponse(
+    ErrorTypeEnum.TOKEN_ACCESS_DENIED_EMPTY, 401, ErrorTypeEnum.ACCESS_DECLINE
+)
+TOKEN_WRONG_401: ResponseStaticObject = errorResponse(
+    ErrorTypeEnum.TOKEN_ACCESS_DENIED_WRONG, 401, ErrorTypeEnum.ACCESS_DECLINE
+)
+ACCOUNT_NOT_ACTIVE_401: ResponseStaticObject = staticResponse(
+    [
+        ResponseHandlerObject(msgType=MsgTypeEnum.ERROR, msg="account is not active"),
+        ResponseHandlerObject(msgType=MsgTypeEnum.STATE, errorType=ErrorTypeEnum.ACCESS_DECLINE),
+    ],
+    401,
+)
+
+# ------------------------------------------------------------------------------
+#
+# ACCOUNT
+#
+# ------------------------------------------------------------------------------
+LOGIN_MISSING_400: ResponseStaticObject = msgResponse("please fill authCode, username and password", 400)
+REGISTRATION_MISSING_400: ResponseStaticObject = msgResponse(
+    "please fill name, surname, username, password and email", 400
+)
+REFRESH_MISSING_400: ResponseStaticObject = msgResponse("please fill refreshToken", 400)
+TOKEN_MISSING_ATTRIBUTES_400: ResponseStaticObject = msgResponse("missing attributes from token", 400)
+EMAIL_INVALID_400: ResponseStaticObject = msgResponse("the E-Mail address is not valid", 400)
+USERNAME_TAKEN_400: ResponseStaticObject = msgResponse("you can not use this username, choose any other :P", 400)
+USER_REMOVED_200: ResponseStaticObject = staticResponse(
+    [
+        ResponseHandlerObject(msgType=MsgTypeEnum.RESULT, msg="user removed"),
+        ResponseHandlerObject(msgType=MsgTypeEnum.STATE, errorType=ErrorTypeEnum.REMOVED),
+    ],
+    200,
+)
+USER_LOGGED_OUT_200: ResponseStaticObject = staticResponse(
+    [
+        ResponseHandlerObject(msgType=MsgTypeEnum.RESULT, msg="user logged out"),
+        ResponseHandlerObject(msgType=MsgTypeEnum.STATE, msg="LOGGED_OUT"),
+    ],
+    200,
+)
+TOKEN_CREATE_FAILED_400: ResponseStaticObject = msgResponse("failed to create token", 400)
+USER_SAVING_FAILED_400: ResponseStaticObject = staticResponse(
+    [
+        ResponseHandlerObject(msgType=MsgTypeEnum.ERROR, msg="user saving failed!"),
+        ResponseHandlerObject(msgType=MsgTypeEnum.STATE, msg="USER_FAILED"),
+    ],
+    400,
+)
+TOKEN_SAVING_FAILED_400: ResponseStaticObject = staticResponse(
+    [
+        ResponseHandlerObject(msgType=MsgTypeEnum.ERROR, msg="user saving failed!"),
+        ResponseHandlerObject(msgType=MsgTypeEnum.STATE, msg="TOKEN_FAILED"),
+    ],
+    400,
+)
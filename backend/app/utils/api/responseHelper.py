@@ -1,6 +1,6 @@
 import logging
 from enum import Enum
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel
 from pydantic.fields import Field
@@ -34,6 +34,8 @@ class ErrorTypeEnum(str, Enum):
     NOT_FOUND = "NOT_FOUND"
     REMOVED = "REMOVED"
     TOTP_DECLINE = "TOTP_DECLINE"
+    SERVICE_BUSY = "SERVICE_BUSY"
+    TOO_MANY_REQUESTS = "TOO_MANY_REQUESTS"
 
 
 class ResponseHolderObject(BaseModel):
@@ -41,6 +43,14 @@ class ResponseHolderObject(BaseModel):
     msg: ResponseSchema
 
 
+class ResponseStaticObject(ResponseHolderObject):
+    """
+    a response which is always the same, with its
+    serialized body, see 'app.utils.api.responseCatalog'
+    """
+    body: bytes
+
+
 class ResponseHandlerObject(BaseModel):
     msgType: MsgTypeEnum = Field()
     msg: Optional[Any] = Field(default=None)
@@ -84,25 +94,25 @@ def responseHandler(
 #
 #
 # ------------------------------------------------------------------------------
+# default msg per error type, which can be used multiple times
+RESPONSE_MSGS: Dict[ErrorTypeEnum, str] = {
+    ErrorTypeEnum.API_MISSING_ATTRIBUTES: "missing attributes in body or header",
+    ErrorTypeEnum.API_MISSING_PARAMS: "function on API call has not set all params",
+    ErrorTypeEnum.API_FUNCTION_ERROR: "function on API call return null",
+    ErrorTypeEnum.INTERNAL_ERROR: "INTERNAL ERROR",
+    ErrorTypeEnum.ACCESS_GRANT: "ACCESS GRANT",
+    ErrorTypeEnum.ACCESS_DECLINE: "ACCESS DECLINED",
+    ErrorTypeEnum.ACCESS_FAILED: "your login credentials are wrong, or you have no access",
+    ErrorTypeEnum.TOTP_DECLINE: "2FA verification failed",
+    ErrorTypeEnum.TOKEN_ACCESS_DENIED_WRONG: "Access denied. Invalid token.",
+    ErrorTypeEnum.TOKEN_ACCESS_DENIED_EMPTY: "Access denied. No token provided.",
+    ErrorTypeEnum.SERVICE_BUSY: "service is busy, please try again later",
+    ErrorTypeEnum.TOO_MANY_REQUESTS: "too many requests, please try again later",
+}
+
+
 def responseMsgHandler(argument: ErrorTypeEnum) -> Union[str, None]:
     """
     holds some defalt msg, which can be usedmultiple times
     """
-    try:
-        switcher = {
-            ErrorTypeEnum.API_MISSING_ATTRIBUTES: "missing attributes in body or header",
-            ErrorTypeEnum.API_MISSING_PARAMS: "function on API call has not set all params",
-            ErrorTypeEnum.API_FUNCTION_ERROR: "function on API call return null",
-            ErrorTypeEnum.INTERNAL_ERROR: "INTERNAL ERROR",
-            ErrorTypeEnum.ACCESS_GRANT: "ACCESS GRANT",
-            ErrorTypeEnum.ACCESS_DECLINE: "ACCESS DECLINED",
-            ErrorTypeEnum.ACCESS_FAILED: "your login credentials are wrong, or you have no access",
-            ErrorTypeEnum.TOTP_DECLINE: "2FA verification failed",
-            ErrorTypeEnum.TOKEN_ACCESS_DENIED_WRONG: "Access denied. Invalid token.",
-            ErrorTypeEnum.TOKEN_ACCESS_DENIED_EMPTY: "Access denied. No token provided.",
-        }
-        return switcher.get(argument, None)
-
-    except Exception as e:
-        logging.log(logging.CRITICAL, e, exc_info=True)
-    return None
+    return RESPONSE_MSGS.get(argument, None)
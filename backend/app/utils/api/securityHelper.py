@@ -1,14 +1,15 @@
 import logging
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 import pyotp
-from fastapi.param_functions import Security
-from fastapi.security import APIKeyCookie, APIKeyHeader, APIKeyQuery, OAuth2PasswordBearer
-from jose import JWTError, jwt
+from fastapi.security import OAuth2PasswordBearer
+from jwt import PyJWTError
 from passlib.context import CryptContext
 from pydantic import BaseModel
 
+from app.utils.api.tokenCodec import tokenCodec
 from app.utils.config import settings
 
 
@@ -33,6 +34,8 @@ class TokenDataObject(BaseModel):
     username: Optional[str] = None
     isAdmin: Optional[bool] = None
     exp: Optional[datetime] = None
+    # token id, to revoke a single token
+    jti: Optional[str] = None
 
 
 # ------------------------------------------------------------------------------
@@ -40,37 +43,41 @@ class TokenDataObject(BaseModel):
 # GENERAL definitions
 #
 # ------------------------------------------------------------------------------
+def create_pwd_context(
+    scheme: str = settings.PASSWORD_SCHEME,
+    bcrypt_rounds: int = settings.PASSWORD_BCRYPT_ROUNDS,
+    argon2_time_cost: int = settings.PASSWORD_ARGON2_TIME_COST,
+    argon2_memory_cost: int = settings.PASSWORD_ARGON2_MEMORY_COST,
+    argon2_parallelism: int = settings.PASSWORD_ARGON2_PARALLELISM,
+) -> CryptContext:
+    """
+    creates the context for how to hash a password, with the cost from settings
+    (see 'app.benchmarks.passwordCalibrate'), hashes with an other scheme
+    or an other cost are verified, but marked by 'needs_update'
+    """
+    schemes: List[str] = [scheme] if scheme == "bcrypt" else [scheme, "bcrypt"]
+    options: Dict[str, Any] = {
+        "bcrypt__default_rounds": bcrypt_rounds,
+        "bcrypt__min_rounds": bcrypt_rounds,
+        "bcrypt__max_rounds": bcrypt_rounds,
+    }
+    if scheme == "argon2":
+        options.update({
+            "argon2__time_cost": argon2_time_cost,
+            "argon2__memory_cost": argon2_memory_cost,
+            "argon2__parallelism": argon2_parallelism,
+        })
+    return CryptContext(schemes=schemes, deprecated="auto", **options)
+
+
 # defined context, for how to has a password
-pwd_context: CryptContext = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context: CryptContext = create_pwd_context()
 # define schema how to access token
 # NOTE: not used oauth2, api key is used, with JWT
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PREFIX}/account/token")
 
 
-async def getTokenFromRequest(
-    api_key_query: Union[str, None] = Security(
-        APIKeyQuery(name=settings.TOKEN_API_NAME, auto_error=False)
-    ),
-    api_key_header: Union[str, None] = Security(
-        APIKeyHeader(name=settings.TOKEN_API_NAME, auto_error=False)
-    ),
-    api_key_cookie: Union[str, None] = Security(
-        APIKeyCookie(name=settings.TOKEN_API_NAME, auto_error=False)
-    ),
-) -> Union[str, None]:
-    """
-    auth depends helper, to get token from request
-    """
-    if api_key_header is not None:
-        return api_key_header
-
-    elif api_key_query is not None:
-        return api_key_query
-
-    elif api_key_cookie is not None:
-        return api_key_cookie
-
-    return None
+# the token is extracted from header, query or cookie by 'app.middleware.token'
 
 
 
@@ -99,11 +106,8 @@ def create_access_token(
                 minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
             )
         to_encode.exp = expire
-        encoded_jwt = jwt.encode(
-            claims=to_encode.dict(),
-            key=settings.SECRET_KEY,
-            algorithm=settings.ALGORITHM,
-        )
+        to_encode.jti = uuid.uuid4().hex
+        encoded_jwt = tokenCodec.encode(to_encode.dict())
         return TokenObject(access_token=encoded_jwt, token_type="api_key")
 
     except Exception as e:
@@ -119,11 +123,9 @@ def validateToken(token: Union[str, None]) -> Union[TokenDataObject, None]:
     result: Union[TokenDataObject, None] = None
     try:
         if token is not None:
-            payload = jwt.decode(
-                token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-            )
+            payload = tokenCodec.decode(token)
             result = TokenDataObject(**payload)
-    except JWTError as e:
+    except PyJWTError as e:
         logging.log(logging.CRITICAL, e, exc_info=True)
     except Exception as e:
         logging.log(logging.CRITICAL, e, exc_info=True)
@@ -155,6 +157,19 @@ def get_password_hash(password: str) -> Union[str, None]:
     return None
 
 
+def password_needs_update(hashed_password: str) -> bool:
+    """
+    checks if a hash uses an other scheme or cost than configured,
+    only parses the hash, so it is cheap
+    """
+    try:
+        return bool(pwd_context.needs_update(hashed_password))
+
+    except Exception as e:
+        logging.log(logging.CRITICAL, e, exc_info=True)
+    return False
+
+
 
 
 # ------------------------------------------------------------------------------
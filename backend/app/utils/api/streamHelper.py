@@ -0,0 +1,62 @@
+"""
+    streams many items as newline delimited json (NDJSON)
+    the items are serialized while they are read, e.g. from
+    'AsyncDBConnection.find_iter', so memory stays flat
+    Use: 'return ndjsonResponse(items, exclude={"password"})' in a route
+"""
+import logging
+from typing import AsyncIterator, Dict, List, Optional, Set, Union
+
+from pydantic import BaseModel
+from starlette.responses import StreamingResponse
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+async def ndjsonLines(
+    items: AsyncIterator[BaseModel],
+    include: Optional[Set[str]] = None,
+    exclude: Optional[Set[str]] = None,
+    chunk_size: int = 100,
+) -> AsyncIterator[str]:
+    """
+    serializes each item to one json line,
+    lines are send in chunks of 'chunk_size' items
+    """
+    lines: List[str] = []
+    try:
+        async for item in items:
+            lines.append(item.json(include=include, exclude=exclude))
+            if len(lines) >= chunk_size:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if len(lines) > 0:
+            yield "\n".join(lines) + "\n"
+
+    except Exception as e:
+        # the status code is already send, the client will only see a cut stream
+        logging.log(logging.CRITICAL, e, exc_info=True)
+
+
+def ndjsonResponse(
+    items: AsyncIterator[BaseModel],
+    include: Optional[Set[str]] = None,
+    exclude: Optional[Set[str]] = None,
+    chunk_size: int = 100,
+    status_code: int = 200,
+    headers: Union[Dict[str, str], None] = None,
+) -> StreamingResponse:
+    """
+    an helper function to stream many items (e.g. from 'AsyncDBConnection.find_iter')
+    as newline delimited json, memory stays flat independent of the count of items
+    use 'include' or 'exclude' to not send secrets (e.g. password of 'UserEntity')
+    """
+    return StreamingResponse(
+        ndjsonLines(items, include=include, exclude=exclude, chunk_size=chunk_size),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/x-ndjson",
+    )
@@ -0,0 +1,95 @@
+"""
+    in process cache of verified tokens
+    repeated requests with the same token skip the signature check
+    and the parsing, entries are bounded (LRU) and evicted at the
+    'exp' of their token. the key is a digest, the token itself is not stored.
+    Use: 'validateTokenCached' instead of 'validateToken'
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple, Union
+
+from app.utils.api.securityHelper import TokenDataObject, validateToken
+from app.utils.config import settings
+from app.utils.metricsHelper import metricsRegistry
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class TokenCache:
+    """
+    LRU of verified tokens, keyed by SHA-256 of the token
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size: int = max_size
+        # digest => (exp as unix time, token data)
+        self.entries: "OrderedDict[bytes, Tuple[float, TokenDataObject]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+
+    def key(self, token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Union[TokenDataObject, None]:
+        with self.lock:
+            entry: Union[Tuple[float, TokenDataObject], None] = self.entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            if entry[0] <= time.time():
+                del self.entries[key]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1].copy()
+
+    def put(self, key: bytes, user: TokenDataObject) -> None:
+        # tokens without 'exp' are not cached, there is no time to evict them
+        if user.exp is None:
+            return
+        with self.lock:
+            self.entries[key] = (user.exp.timestamp(), user.copy())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        lookups: int = self.stats["hits"] + self.stats["misses"]
+        return {
+            "size": len(self.entries),
+            "max_size": self.max_size,
+            "hit_rate": round(self.stats["hits"] / lookups, 4) if lookups > 0 else 0.0,
+            **self.stats,
+        }
+
+
+tokenCache: TokenCache = TokenCache(max_size=settings.TOKEN_CACHE_SIZE)
+metricsRegistry.register("token_cache", tokenCache.snapshot)
+
+
+def validateTokenCached(token: Union[str, None]) -> Union[TokenDataObject, None]:
+    """
+    'validateToken' read through 'tokenCache'
+    """
+    if token is None or tokenCache.max_size <= 0:
+        return validateToken(token)
+    key: bytes = tokenCache.key(token)
+    user: Union[TokenDataObject, None] = tokenCache.get(key)
+    if user is None:
+        user = validateToken(token)
+        if user is not None:
+            tokenCache.put(key, user)
+    return user
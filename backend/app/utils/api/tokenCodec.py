@@ -0,0 +1,124 @@
+"""
+    JWT encoding and decoding, build on PyJWT
+    keys are parsed once on startup, tokens carry the 'kid' of the
+    key they are signed with, so keys can be rotated:
+        - 'TOKEN_KEY_ID' is the id of the current signing key
+        - 'TOKEN_VERIFY_KEYS' holds older keys, only used to verify,
+          until the tokens signed with them are expired
+    HMAC ('HS*') signs with 'SECRET_KEY', asymmetric algorithms
+    ('RS*', 'PS*', 'ES*', 'EdDSA') sign with the PEM private key in
+    'TOKEN_PRIVATE_KEY_FILE', their public keys are served as JWKS,
+    so other services can verify tokens them self.
+    Use: 'tokenCodec.encode' and 'tokenCodec.decode'
+"""
+import json
+import logging
+from typing import Any, Dict, List, Union
+
+import jwt
+from jwt.algorithms import Algorithm, get_default_algorithms
+
+from app.utils.config import settings
+
+HMAC_ALGORITHMS: List[str] = ["HS256", "HS384", "HS512"]
+
+
+def readKey(value: str) -> str:
+    """
+    a key is a PEM file path or the key itself
+    """
+    if value.startswith("-----BEGIN") or settings.ALGORITHM in HMAC_ALGORITHMS:
+        return value
+    with open(value, "r") as file:
+        return file.read()
+
+
+def parseVerifyKeys(value: Union[str, None]) -> Dict[str, str]:
+    """
+    parses a JSON object '{"kid": "key", ...}' ('key' is a secret for HMAC,
+    else a PEM public key or its file), JSON so keys can hold any character
+    """
+    if value is None or value.strip() == "":
+        return {}
+    items: Any = json.loads(value)
+    if not isinstance(items, dict):
+        raise ValueError("'TOKEN_VERIFY_KEYS' has to be a JSON object of kid => key")
+    return {str(kid): readKey(str(key)) for kid, key in items.items()}
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class TokenCodec:
+    """
+    holds the prepared key objects, so keys are not parsed on every call
+    """
+
+    def __init__(
+        self, algorithm: str, kid: str, signing_key: str, verify_keys: Dict[str, str]
+    ) -> None:
+        self.algorithm: str = algorithm
+        self.kid: str = kid
+        self.handler: Algorithm = get_default_algorithms()[algorithm]
+        self.is_hmac: bool = algorithm in HMAC_ALGORITHMS
+        self.signing_key: Any = self.handler.prepare_key(signing_key)
+        # kid => prepared key to verify with, the current key included
+        self.verify_keys: Dict[str, Any] = {
+            key_id: self.handler.prepare_key(key) for key_id, key in verify_keys.items()
+        }
+        self.verify_keys[kid] = self.signing_key if self.is_hmac else self.signing_key.public_key()
+        self.headers: Dict[str, Any] = {"kid": kid}
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        return jwt.encode(claims, self.signing_key, algorithm=self.algorithm, headers=self.headers)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        verifies the token with the key of its 'kid'
+        raises 'jwt.PyJWTError' if the token is invalid
+        """
+        kid: Any = jwt.get_unverified_header(token).get("kid", self.kid)
+        key: Any = self.verify_keys.get(kid)
+        if key is None:
+            raise jwt.InvalidKeyError(f"unknown key id: {kid}")
+        return jwt.decode(token, key, algorithms=[self.algorithm])
+
+    def jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        the public keys as JSON Web Key Set, empty for HMAC
+        """
+        if self.is_hmac:
+            return {"keys": []}
+        keys: List[Dict[str, Any]] = []
+        for kid, key in self.verify_keys.items():
+            jwk: Dict[str, Any] = json.loads(self.handler.to_jwk(key))
+            jwk.update({"kid": kid, "alg": self.algorithm, "use": "sig"})
+            keys.append(jwk)
+        return {"keys": keys}
+
+
+def createTokenCodec() -> TokenCodec:
+    """
+    creates the codec from settings
+    """
+    signing_key: str = (
+        settings.SECRET_KEY
+        if settings.ALGORITHM in HMAC_ALGORITHMS
+        else readKey(settings.TOKEN_PRIVATE_KEY_FILE or "")
+    )
+    codec: TokenCodec = TokenCodec(
+        algorithm=settings.ALGORITHM,
+        kid=settings.TOKEN_KEY_ID,
+        signing_key=signing_key,
+        verify_keys=parseVerifyKeys(settings.TOKEN_VERIFY_KEYS),
+    )
+    logging.log(
+        logging.DEBUG,
+        f"token codec with {settings.ALGORITHM}, signing key '{codec.kid}', verify keys {list(codec.verify_keys.keys())}",
+    )
+    return codec
+
+
+tokenCodec: TokenCodec = createTokenCodec()
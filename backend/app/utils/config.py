@@ -88,16 +88,55 @@ class Settings(BaseSettings):
     # to get a string like this run:
     # openssl rand -hex 64
     SECRET_KEY: str = config("SECRET_KEY")
+    # HS256 | HS384 | HS512 (with SECRET_KEY) | RS256 | ES256 | EdDSA | ... (with TOKEN_PRIVATE_KEY_FILE)
     ALGORITHM: str = config("ALGORITHM", default="HS512")
+    # id ('kid') of the signing key, older keys to still verify, as JSON: {"kid": "secret or public-key-file"}
+    TOKEN_KEY_ID: str = config("TOKEN_KEY_ID", default="default")
+    TOKEN_VERIFY_KEYS: Optional[str] = config("TOKEN_VERIFY_KEYS", default=None)
+    TOKEN_PRIVATE_KEY_FILE: Optional[str] = config("TOKEN_PRIVATE_KEY_FILE", default=None)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = config(
         "ACCESS_TOKEN_EXPIRE_MINUTES", cast=int, default=30
     )
+    # refresh tokens, to get a new token without login, are valid for n days
+    REFRESH_TOKEN_EXPIRE_DAYS: int = config("REFRESH_TOKEN_EXPIRE_DAYS", cast=int, default=30)
+    # verified tokens cached per worker, 0 to disable
+    TOKEN_CACHE_SIZE: int = config("TOKEN_CACHE_SIZE", cast=int, default=10000)
+    # revoked tokens of other workers are loaded every n seconds
+    TOKEN_REVOCATION_REFRESH_SECONDS: float = config("TOKEN_REVOCATION_REFRESH_SECONDS", cast=float, default=5)
+    # login attempts per minute and at once (burst), per username and per client ip,
+    # every attempt takes a token, also a successful login
+    LOGIN_THROTTLE_ACTIVE: bool = config("LOGIN_THROTTLE_ACTIVE", cast=bool, default=True)
+    LOGIN_THROTTLE_USER_PER_MINUTE: float = config("LOGIN_THROTTLE_USER_PER_MINUTE", cast=float, default=6)
+    LOGIN_THROTTLE_USER_BURST: int = config("LOGIN_THROTTLE_USER_BURST", cast=int, default=5)
+    LOGIN_THROTTLE_IP_PER_MINUTE: float = config("LOGIN_THROTTLE_IP_PER_MINUTE", cast=float, default=60)
+    LOGIN_THROTTLE_IP_BURST: int = config("LOGIN_THROTTLE_IP_BURST", cast=int, default=20)
+    # tracked keys per limiter, the least recently used are evicted
+    LOGIN_THROTTLE_MAX_KEYS: int = config("LOGIN_THROTTLE_MAX_KEYS", cast=int, default=100000)
+    # proxies (ips or networks) whose 'X-Real-IP' header is used as client ip, empty = none
+    TRUSTED_PROXIES: List[str] = [
+        proxy.strip() for proxy in config("TRUSTED_PROXIES", cast=str, default="").split(",") if proxy.strip() != ""
+    ]
+    # processes for password hashing (0 = cpu count), and max running + waiting hash calls
+    PASSWORD_WORKERS: int = config("PASSWORD_WORKERS", cast=int, default=0)
+    PASSWORD_QUEUE_SIZE: int = config("PASSWORD_QUEUE_SIZE", cast=int, default=64)
+    # max background rehashes at once, they are skipped when the queue is half full
+    PASSWORD_REHASH_MAX: int = config("PASSWORD_REHASH_MAX", cast=int, default=2)
+    # hash cost, calibrate it with: python3 -m app.benchmarks.passwordCalibrate --target-ms 250
+    # bcrypt | argon2 (needs 'argon2-cffi'), existing hashes are rehashed on login
+    PASSWORD_SCHEME: str = config("PASSWORD_SCHEME", default="bcrypt")
+    PASSWORD_BCRYPT_ROUNDS: int = config("PASSWORD_BCRYPT_ROUNDS", cast=int, default=12)
+    PASSWORD_ARGON2_TIME_COST: int = config("PASSWORD_ARGON2_TIME_COST", cast=int, default=3)
+    PASSWORD_ARGON2_MEMORY_COST: int = config("PASSWORD_ARGON2_MEMORY_COST", cast=int, default=65536)  # in KiB
+    PASSWORD_ARGON2_PARALLELISM: int = config("PASSWORD_ARGON2_PARALLELISM", cast=int, default=4)
     # --------------------------------------------------------------------------
     #
     #
     #
     # --------------------------------------------------------------------------
     ACCOUNT_REGISTER_EXPIRE_MINUTES: int = config("", cast=int, default=5)  # in minutes
+    # expired registrations are removed by the TTL index and by a sweeper job every n seconds (0 = off)
+    ACCOUNT_EXPIRE_SWEEP_SECONDS: int = config("ACCOUNT_EXPIRE_SWEEP_SECONDS", cast=int, default=60)
+    ACCOUNT_EXPIRE_SWEEP_BATCH: int = config("ACCOUNT_EXPIRE_SWEEP_BATCH", cast=int, default=500)
     TOTP_ACTIVE: bool = config("TOTP_ACTIVE", cast=bool, default=False)
     TOTP_DIGITS: int = config("TOTP_DIGITS", cast=int, default=6)
     TOTP_INTERVAL: int = config("TOTP_INTERVAL", cast=int, default=30)
@@ -105,14 +144,18 @@ class Settings(BaseSettings):
     QR_VERSION: int = config("QR_VERSION", cast=int, default=1)
     QR_BOX_SIZE: int = config("QR_BOX_SIZE", cast=int, default=10)
     QR_BORDER: int = config("QR_BORDER", cast=int, default=5)
-    QR_FACTORY: str = config("QR_FACTORY", default=None)  # basic | fragment | None
+    QR_FACTORY: str = config("QR_FACTORY", default=None)  # basic | fragment | path | compact | png | None (path)
     QR_FILLED: bool = config("QR_FILLED", cast=bool, default=False)
     QR_FIT: bool = config("QR_FIT", cast=bool, default=True)
+    # threads rendering the QR-codes
+    QR_WORKERS: int = config("QR_WORKERS", cast=int, default=2)
     # --------------------------------------------------------------------------
     #
     #
     #
     # --------------------------------------------------------------------------
+    # storage of the async connection: mongo | memory (in process, for tests and benchmarks)
+    DB_BACKEND: str = config("DB_BACKEND", default="mongo")
     # mongodb | mongodb+srv
     DB_PROTOCOL: str = config("DB_PROTOCOL", default="mongodb")
     DB_HOST: str = config("DB_HOST", default="localhost")
@@ -122,6 +165,39 @@ class Settings(BaseSettings):
     DB_URL: Optional[str] = config("DB_URL", default=None)
     DB_USER: str = config("DB_USER", default=None)
     DB_PASSWORD: str = config("DB_PASSWORD", default=None)
+    # connection pool, per client (one sync, one async client per worker)
+    DB_MAX_POOL_SIZE: int = config("DB_MAX_POOL_SIZE", cast=int, default=100)
+    DB_MIN_POOL_SIZE: int = config("DB_MIN_POOL_SIZE", cast=int, default=0)
+    DB_MAX_IDLE_TIME_MS: Optional[int] = config("DB_MAX_IDLE_TIME_MS", cast=int, default=None)
+    DB_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = config("DB_WAIT_QUEUE_TIMEOUT_MS", cast=int, default=None)
+    DB_CONNECT_TIMEOUT_MS: int = config("DB_CONNECT_TIMEOUT_MS", cast=int, default=20000)
+    # write-behind of not critical stamps (lastLogin), flushed every n ms or at n pending entries
+    DB_WRITE_BEHIND_INTERVAL_MS: int = config("DB_WRITE_BEHIND_INTERVAL_MS", cast=int, default=1000)
+    DB_WRITE_BEHIND_MAX_ENTRIES: int = config("DB_WRITE_BEHIND_MAX_ENTRIES", cast=int, default=500)
+    # read-through cache of selected entities, per worker, 0 to disable
+    DB_CACHE_SIZE: int = config("DB_CACHE_SIZE", cast=int, default=10000)
+    DB_CACHE_TTL_SECONDS: float = config("DB_CACHE_TTL_SECONDS", cast=float, default=30)
+    # users can be changed by other workers (status, password), 0 to not cache them
+    DB_CACHE_USER_TTL_SECONDS: float = config("DB_CACHE_USER_TTL_SECONDS", cast=float, default=1)
+    # keys with waiter stats of coalesced reads
+    DB_SINGLEFLIGHT_MAX_KEYS: int = config("DB_SINGLEFLIGHT_MAX_KEYS", cast=int, default=1000)
+    # documents per round trip, when iterating over many documents
+    DB_BATCH_SIZE: int = config("DB_BATCH_SIZE", cast=int, default=500)
+    # commands slower than n ms are logged with their filter shape (0 = off)
+    DB_SLOW_QUERY_MS: float = config("DB_SLOW_QUERY_MS", cast=float, default=100)
+    # false for backends without TTL index support
+    DB_TTL_INDEXES: bool = config("DB_TTL_INDEXES", cast=bool, default=True)
+    # drop and create again indexes which are different from their declaration, on startup
+    DB_INDEX_RECREATE: bool = config("DB_INDEX_RECREATE", cast=bool, default=False)
+    # --------------------------------------------------------------------------
+    #
+    #
+    #
+    # --------------------------------------------------------------------------
+    # internal metrics api, needs an admin token
+    METRICS_ACTIVE: bool = config("METRICS_ACTIVE", cast=bool, default=False)
+    # encoder of the responses: orjson | msgspec | json
+    JSON_RESPONSE: str = config("JSON_RESPONSE", default="orjson")
     # --------------------------------------------------------------------------
     #
     #
@@ -0,0 +1,87 @@
+"""
+    in process runtime metrics
+    components register a snapshot function by name in 'metricsRegistry',
+    the metrics api will return all snapshots
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+# upper bounds of the latency buckets in ms, the last bucket is open ("+Inf")
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class LatencyHistogram:
+    """
+    thread safe latency histogram with fixed buckets (in ms)
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS) -> None:
+        self.buckets: Tuple[float, ...] = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+        self.max: float = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value_ms: float) -> None:
+        index: int = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value_ms <= bound:
+                index = i
+                break
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value_ms
+            if value_ms > self.max:
+                self.max = value_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            buckets: Dict[str, int] = {
+                str(bound): count for bound, count in zip(self.buckets, self.counts)
+            }
+            buckets["+Inf"] = self.counts[-1]
+            return {
+                "count": self.count,
+                "sum_ms": round(self.sum, 3),
+                "mean_ms": round(self.sum / self.count, 3) if self.count > 0 else 0.0,
+                "max_ms": round(self.max, 3),
+                "buckets": buckets,
+            }
+
+
+# ------------------------------------------------------------------------------
+#
+#
+#
+# ------------------------------------------------------------------------------
+class MetricsRegistry:
+    """
+    holds the snapshot functions of all components which export metrics
+    """
+
+    def __init__(self) -> None:
+        self.sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, name: str, snapshot: Callable[[], Dict[str, Any]]) -> None:
+        self.sources[name] = snapshot
+
+    def snapshot(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {}
+        for name, snapshot in self.sources.items():
+            try:
+                result[name] = snapshot()
+            except Exception as e:
+                logging.log(logging.CRITICAL, e, exc_info=True)
+                result[name] = None
+        return result
+
+
+metricsRegistry: MetricsRegistry = MetricsRegistry()
@@ -0,0 +1,7 @@
+#!/usr/bin/env bash
+
+set -e
+set -x
+
+# run a benchmark from 'app/benchmarks', e.g.: bash scripts/bench.sh benchLogin --requests 2000
+python3 -m "app.benchmarks.${1}" "${@:2}"